@@ -0,0 +1,316 @@
+"""
+Database backends.
+
+The application SQL is written in SQL Server's dialect with qmark (?)
+parameters. Each backend knows how to open a connection, rewrite the few
+dialect-specific constructs the app uses (GETDATE(), CONVERT(date, x),
+TOP n, OUTPUT INSERTED.x, WITH (...) locking hints) and create the GYM
+schema from schema.py.
+"""
+import configparser
+import os
+import re
+import sqlite3
+from datetime import date, datetime, time
+from decimal import Decimal
+from functools import lru_cache
+
+import schema
+
+
+class Backend:
+    name = None
+    paramstyle = "qmark"
+    fast_executemany = False   # pyodbc bulk parameter binding
+
+    # Filled into the {placeholders} of schema.py
+    TYPES = {}
+
+    def connect(self):
+        raise NotImplementedError
+
+    def translate(self, query):
+        """Rewrite app SQL (SQL Server dialect) for this backend"""
+        return query
+
+    # ----- Schema -----
+    def table_exists(self, cursor, table):
+        raise NotImplementedError
+
+    def column_exists(self, cursor, table, column):
+        raise NotImplementedError
+
+    def connection_errors(self):
+        """Exception types meaning the database could not be reached, as opposed to refusing a statement"""
+        raise NotImplementedError
+
+    def try_app_lock(self, cursor, resource):
+        """
+        Take the named lock until the cursor's transaction ends, without
+        waiting; False if another connection holds it. Lets one terminal
+        do shared upkeep while the others skip it.
+        """
+        raise NotImplementedError
+
+    def index_exists(self, cursor, table, index):
+        raise NotImplementedError
+
+    def lock_for(self, cursor, query):
+        """Called before each statement; the server honours WITH (...) hints itself"""
+
+    def add_column_sql(self, table, column):
+        raise NotImplementedError
+
+    def create_schema(self, cursor):
+        """Create missing tables, columns and indexes and run pending migrations; safe to run on every start"""
+        for table, columns in schema.TABLES.items():
+            if not self.table_exists(cursor, table):
+                body = ",\n    ".join(c.format(**self.TYPES) for c in columns)
+                cursor.execute(f"CREATE TABLE {table} (\n    {body}\n)")
+
+        for table, column in schema.COLUMNS:
+            if not self.column_exists(cursor, table, column.split()[0]):
+                cursor.execute(self.add_column_sql(table, column.format(**self.TYPES)))
+
+        for statement in schema.BACKFILLS:
+            cursor.execute(statement)
+
+        cursor.execute("SELECT name FROM SchemaMigrations")
+        applied = {row[0] for row in cursor.fetchall()}
+        for name, statement in schema.MIGRATIONS:
+            if name not in applied:
+                cursor.execute(statement)
+                cursor.execute("INSERT INTO SchemaMigrations (name) VALUES (?)", (name,))
+
+        for index, table, columns, unique in schema.INDEXES:
+            if not self.index_exists(cursor, table, index):
+                kind = "UNIQUE INDEX" if unique else "INDEX"
+                cursor.execute(f"CREATE {kind} {index} ON {table} ({', '.join(columns)})")
+
+
+class SqlServerBackend(Backend):
+    name = "sqlserver"
+    fast_executemany = True
+
+    TYPES = {
+        "pk": "INT IDENTITY(1,1) PRIMARY KEY",
+        "int": "INT",
+        "bigint": "BIGINT",
+        "money": "DECIMAL(10, 2)",
+        "short": "NVARCHAR(50)",
+        "name": "NVARCHAR(100)",
+        "text": "NVARCHAR(MAX)",
+        "date": "DATE",
+        "time": "TIME",
+        "datetime": "DATETIME",
+        "now": "GETDATE()",
+    }
+
+    def __init__(self, server="DESKTOP-D577I1V\\SQLEXPRESS", database="GYM",
+                 username="pola", password="pola",
+                 driver="ODBC Driver 17 for SQL Server",
+                 login_timeout=5, query_timeout=15):
+        self.server = server
+        self.database = database
+        self.username = username
+        self.password = password
+        self.driver = driver
+        # Seconds before a dead link fails a statement instead of waiting out TCP,
+        # so the till can journal the sale and carry on
+        self.login_timeout = login_timeout
+        self.query_timeout = query_timeout
+
+    def connect(self):
+        import pyodbc  # only needed when talking to SQL Server
+        conn_str = (
+            f'DRIVER={{{self.driver}}};'
+            f'SERVER={self.server};'
+            f'DATABASE={self.database};'
+            f'UID={self.username};'
+            f'PWD={self.password};'
+        )
+        conn = pyodbc.connect(conn_str, timeout=self.login_timeout)
+        conn.timeout = self.query_timeout
+        return conn
+
+    def connection_errors(self):
+        import pyodbc
+        return (pyodbc.OperationalError, pyodbc.InterfaceError)   # link failures and timeouts
+
+    def try_app_lock(self, cursor, resource):
+        cursor.execute("""
+        SET NOCOUNT ON;
+        DECLARE @result INT;
+        EXEC @result = sp_getapplock @Resource = ?, @LockMode = 'Exclusive',
+                                     @LockOwner = 'Transaction', @LockTimeout = 0;
+        SELECT @result
+        """, (resource,))
+        return cursor.fetchone()[0] >= 0
+
+    def table_exists(self, cursor, table):
+        cursor.execute("SELECT OBJECT_ID(?, 'U')", (table,))
+        return cursor.fetchone()[0] is not None
+
+    def column_exists(self, cursor, table, column):
+        cursor.execute("SELECT COL_LENGTH(?, ?)", (table, column))
+        return cursor.fetchone()[0] is not None
+
+    def index_exists(self, cursor, table, index):
+        cursor.execute(
+            "SELECT COUNT(*) FROM sys.indexes WHERE name = ? AND object_id = OBJECT_ID(?)",
+            (index, table)
+        )
+        return cursor.fetchone()[0] > 0
+
+    def add_column_sql(self, table, column):
+        return f"ALTER TABLE {table} ADD {column}"
+
+
+# ----- SQLite value conversion -----
+# Explicit adapters/converters so DATE/TIME/DATETIME columns come back as
+# the same Python types pyodbc returns for SQL Server.
+sqlite3.register_adapter(Decimal, float)
+sqlite3.register_adapter(date, lambda d: d.isoformat())
+sqlite3.register_adapter(datetime, lambda d: d.isoformat(" "))
+sqlite3.register_adapter(time, lambda t: t.isoformat())
+sqlite3.register_converter("DATE", lambda b: date.fromisoformat(b.decode()[:10]))
+sqlite3.register_converter("TIME", lambda b: time.fromisoformat(b.decode()))
+sqlite3.register_converter("DATETIME", lambda b: datetime.fromisoformat(b.decode()))
+
+_TOP = re.compile(r"^(\s*SELECT\s+)TOP\s*\(?\s*(\d+)\s*\)?\s+", re.IGNORECASE)
+_OUTPUT = re.compile(r"\s+OUTPUT\s+(INSERTED\.\w+(?:\s*,\s*INSERTED\.\w+)*)\s+", re.IGNORECASE)
+_TODAY = re.compile(r"CONVERT\s*\(\s*date\s*,\s*GETDATE\(\)\s*\)", re.IGNORECASE)
+_NOW = re.compile(r"GETDATE\(\)", re.IGNORECASE)
+_DATE_OF = re.compile(r"CONVERT\s*\(\s*date\s*,\s*(\w+(?:\.\w+)?)\s*\)", re.IGNORECASE)
+_HINT = r"(?:UPDLOCK|HOLDLOCK|SERIALIZABLE|ROWLOCK)"
+_HINTS = re.compile(rf"\s+WITH\s*\(\s*{_HINT}(?:\s*,\s*{_HINT})*\s*\)", re.IGNORECASE)
+
+
+@lru_cache(maxsize=512)
+def _to_sqlite(query):
+    query = _TODAY.sub("date('now', 'localtime')", query)
+    query = _NOW.sub("datetime('now', 'localtime')", query)
+    query = _DATE_OF.sub(r"date(\1)", query)
+    query = _HINTS.sub("", query)   # see SqliteBackend.lock_for
+
+    suffix = []
+    output = _OUTPUT.search(query)
+    if output:
+        columns = re.sub(r"INSERTED\.", "", output.group(1), flags=re.IGNORECASE)
+        query = query[:output.start()] + " " + query[output.end():]
+        suffix.append(f"RETURNING {columns}")
+
+    top = _TOP.match(query)
+    if top:
+        query = top.group(1) + query[top.end():]
+        suffix.append(f"LIMIT {top.group(2)}")
+
+    if suffix:
+        query = query.rstrip().rstrip(";") + "\n" + " ".join(suffix)
+    return query
+
+
+class SqliteBackend(Backend):
+    name = "sqlite"
+
+    TYPES = {
+        "pk": "INTEGER PRIMARY KEY AUTOINCREMENT",
+        "int": "INTEGER",
+        "bigint": "INTEGER",
+        "money": "DECIMAL(10, 2)",
+        "short": "TEXT",
+        "name": "TEXT",
+        "text": "TEXT",
+        "date": "DATE",
+        "time": "TIME",
+        "datetime": "DATETIME",
+        "now": "(datetime('now', 'localtime'))",
+    }
+
+    def __init__(self, path="gym.db", busy_timeout=5.0):
+        self.path = path
+        self.busy_timeout = busy_timeout
+
+    def connect(self):
+        if self.path == ":memory:":
+            # Pooled connections must all see the same in-memory database
+            target, uri = "file:gym?mode=memory&cache=shared", True
+        else:
+            target, uri = self.path, False
+        conn = sqlite3.connect(
+            target,
+            uri=uri,
+            timeout=self.busy_timeout,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            check_same_thread=False,   # the pool hands connections to worker threads
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        return conn
+
+    def translate(self, query):
+        return _to_sqlite(query)
+
+    def connection_errors(self):
+        return (sqlite3.OperationalError,)   # unopenable or locked database file
+
+    def try_app_lock(self, cursor, resource):
+        # One local file: its single writer already keeps upkeep to one at a time
+        return True
+
+    def lock_for(self, cursor, query):
+        # sqlite3 only opens a transaction at the first write, so a locking
+        # read would run unlocked; take the database's write lock up front
+        if not cursor.connection.in_transaction and _HINTS.search(query):
+            cursor.execute("BEGIN IMMEDIATE")
+
+    def table_exists(self, cursor, table):
+        cursor.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = ?", (table,))
+        return cursor.fetchone()[0] > 0
+
+    def column_exists(self, cursor, table, column):
+        cursor.execute(f"PRAGMA table_info({table})")
+        return any(row[1].lower() == column.lower() for row in cursor.fetchall())
+
+    def index_exists(self, cursor, table, index):
+        cursor.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'index' AND name = ?", (index,))
+        return cursor.fetchone()[0] > 0
+
+    def add_column_sql(self, table, column):
+        return f"ALTER TABLE {table} ADD COLUMN {column}"
+
+
+BACKENDS = {
+    SqlServerBackend.name: SqlServerBackend,
+    SqliteBackend.name: SqliteBackend,
+}
+
+
+def backend_from_config(config_path):
+    """
+    Build the backend described by the [DATABASE] section of config.ini.
+    Without that section the app keeps talking to the original SQL Server.
+
+        [DATABASE]
+        backend = sqlite
+        path = gym.db
+    """
+    config = configparser.ConfigParser()
+    if os.path.exists(config_path):
+        config.read(config_path)
+    if not config.has_section("DATABASE"):
+        return SqlServerBackend()
+
+    options = dict(config.items("DATABASE"))
+    name = options.pop("backend", SqlServerBackend.name).lower()
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown database backend '{name}'")
+    if name == SqliteBackend.name and "path" in options and not os.path.isabs(options["path"]):
+        options["path"] = os.path.join(os.path.dirname(config_path), options["path"])
+    if "busy_timeout" in options:
+        options["busy_timeout"] = float(options["busy_timeout"])
+    for option in ("login_timeout", "query_timeout"):
+        if option in options:
+            options[option] = int(options[option])
+    return BACKENDS[name](**options)
@@ -1,36 +1,327 @@
-import pyodbc
+import os
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+from backends import backend_from_config
+
+if getattr(sys, 'frozen', False):
+    BASE_PATH = sys._MEIPASS
+else:
+    BASE_PATH = os.path.dirname(os.path.abspath(__file__))
+
+CONFIG_PATH = os.path.join(BASE_PATH, "config.ini")
+
+POOL_SIZE = 5        # max open connections shared by all pages and dialogs
+POOL_TIMEOUT = 10    # seconds to wait for a free connection before giving up
+
+_WRITES = re.compile(r"^\s*(?:INSERT\s+INTO|UPDATE|DELETE\s+FROM|DELETE)\s+(\w+)", re.IGNORECASE)
+
+
+class PoolExhausted(Exception):
+    """Raised when no pooled connection frees up within the checkout timeout"""
+
+
+class ConnectionPool:
+    """
+    Bounded pool of DB-API connections with checkout/return semantics.
+    Connections are opened lazily up to max_size; callers beyond that wait
+    for one to be returned.
+    """
+
+    def __init__(self, factory, max_size=POOL_SIZE, timeout=POOL_TIMEOUT):
+        self.factory = factory
+        self.max_size = max_size
+        self.timeout = timeout
+
+        self._idle = []
+        self._created = 0
+        self._in_use = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+        # Metrics
+        self.checkouts = 0
+        self.waits = 0
+        self.wait_time = 0.0
+        self.peak_in_use = 0
+        self.discarded = 0
+
+    def acquire(self, timeout=None):
+        """Check out a connection, opening a new one if the pool is not full"""
+        timeout = self.timeout if timeout is None else timeout
+        start = time.monotonic()
+        with self._cond:
+            waited = False
+            while not self._idle and self._created >= self.max_size:
+                if self._closed:
+                    raise PoolExhausted("Connection pool is closed")
+                remaining = timeout - (time.monotonic() - start)
+                if remaining <= 0:
+                    raise PoolExhausted(f"No database connection free after {timeout}s")
+                waited = True
+                self._cond.wait(remaining)
+
+            if waited:
+                self.waits += 1
+                self.wait_time += time.monotonic() - start
+
+            conn = self._idle.pop() if self._idle else None
+            if conn is None:
+                self._created += 1
+            self._in_use += 1
+            self.checkouts += 1
+            self.peak_in_use = max(self.peak_in_use, self._in_use)
+
+        if conn is None:
+            try:
+                conn = self.factory()
+            except Exception:
+                with self._cond:
+                    self._created -= 1
+                    self._in_use -= 1
+                    self._cond.notify()
+                raise
+        return conn
+
+    def grow(self, count=1):
+        """Allow count more open connections"""
+        with self._cond:
+            self.max_size += count
+            self._cond.notify(count)
+
+    def release(self, conn, discard=False):
+        """Return a connection to the pool; broken ones are closed and dropped"""
+        if not discard:
+            try:
+                # Never hand the next caller a half-open transaction
+                conn.rollback()
+            except Exception:
+                discard = True
+
+        with self._cond:
+            self._in_use -= 1
+            if discard or self._closed:
+                self._created -= 1
+                self.discarded += discard
+            else:
+                self._idle.append(conn)
+            self._cond.notify()
+
+        if discard or self._closed:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    @contextmanager
+    def connection(self, timeout=None):
+        """Context manager around acquire/release"""
+        conn = self.acquire(timeout)
+        try:
+            yield conn
+        finally:
+            # release() rolls back anything left uncommitted
+            self.release(conn)
+
+    def stats(self):
+        """Snapshot of pool sizing and usage counters"""
+        with self._cond:
+            return {
+                "max_size": self.max_size,
+                "open": self._created,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "peak_in_use": self.peak_in_use,
+                "checkouts": self.checkouts,
+                "waits": self.waits,
+                "wait_time": round(self.wait_time, 4),
+                "discarded": self.discarded,
+            }
+
+    def close(self):
+        """Close idle connections; checked-out ones are closed when returned"""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._created -= len(idle)
+            self._cond.notify_all()
+        for conn in idle:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+
+class BackendCursor:
+    """Cursor wrapper that rewrites each statement for the active backend"""
+
+    def __init__(self, cursor, backend):
+        self._cursor = cursor
+        self.backend = backend
+        self.written = set()   # tables this cursor wrote to
+        self.deleted = set()   # tables it deleted rows from
+
+    def _note_write(self, query):
+        match = _WRITES.match(query)
+        if match:
+            self.written.add(match.group(1))
+            if match.group(0).lstrip()[:6].upper() == "DELETE":
+                return match.group(1)
+        return None
+
+    def execute(self, query, params=()):
+        deleting = self._note_write(query)
+        self.backend.lock_for(self._cursor, query)
+        query = self.backend.translate(query)
+        if params:
+            self._cursor.execute(query, params)
+        else:
+            self._cursor.execute(query)
+        if deleting and self._cursor.rowcount != 0:
+            self.deleted.add(deleting)
+        return self
+
+    def executemany(self, query, seq_of_params):
+        deleting = self._note_write(query)
+        if self.backend.fast_executemany:
+            # pyodbc sends the whole parameter array in one round trip
+            self._cursor.fast_executemany = True
+        self._cursor.executemany(self.backend.translate(query), seq_of_params)
+        if deleting:
+            self.deleted.add(deleting)
+        return self
+
+    def log_deletions(self):
+        """Record the (lower-cased) tables deleted from in Deletions, in this transaction"""
+        if self.deleted:
+            self._cursor.executemany(
+                self.backend.translate("INSERT INTO Deletions (table_name, deleted_at) VALUES (?, GETDATE())"),
+                [(table,) for table in sorted({table.lower() for table in self.deleted})]
+            )
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
 
 class DatabaseConnection:
-    def __init__(self):
-        self.server = ''
-        self.database = 'GYM'
-        self.username = ''
-        self.password = 'pola'
-        self.connection = None
-        self.cursor = None
+    def __init__(self, pool_size=POOL_SIZE, backend=None):
+        # Backend comes from the [DATABASE] section of config.ini (SQL Server by default)
+        self.backend = backend or backend_from_config(CONFIG_PATH)
+        self.pool_size = pool_size   # connections for pages, dialogs and the GUI thread
+        self.reserved = 0            # extra connections, one per background worker (see reserve())
+        self.pool = None
+        self.write_listeners = []   # called with the tables each committed transaction wrote to
         self.connect()
 
     def connect(self):
         try:
-            conn_str = (
-                'DRIVER={ODBC Driver 17 for SQL Server};'
-                f'SERVER=DESKTOP-D577I1V\\SQLEXPRESS;'
-                f'DATABASE=GYM;'
-                f'UID=pola;'
-                f'PWD=pola;'
-            )
-            self.connection = pyodbc.connect(conn_str)
-            self.cursor = self.connection.cursor()
-            return True
+            pool = ConnectionPool(self.backend.connect, max_size=self.pool_size + self.reserved)
+            # Open the first connection now so a bad server fails at startup
+            pool.release(pool.acquire())
+            self.pool = pool
         except Exception as e:
             print(" Connection failed:", e)
+            return False
+
+        try:
+            self.create_schema()
+        except Exception as e:
+            # Missing DDL rights must not keep the app from starting
+            print(" Schema check failed:", e)
+        return True
+
+    def reserve(self, count=1):
+        """
+        Grow the pool by count connections for a background worker, so
+        threads that hold a connection on their own schedule never take one
+        the query executor and the GUI thread are sized to share
+        """
+        self.reserved += count
+        if self.pool is not None:
+            self.pool.grow(count)
+
+    def is_connected(self):
+        return self.pool is not None
+
+    def connection_errors(self):
+        """Exception types meaning the database is out of reach right now (for `except`)"""
+        return (PoolExhausted,) + self.backend.connection_errors()
+
+    # ----- Per-operation cursors -----
+    @contextmanager
+    def cursor(self):
+        """Yield a fresh cursor on a pooled connection (read-only work)"""
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                yield BackendCursor(cursor, self.backend)
+            finally:
+                cursor.close()
+
+    @contextmanager
+    def transaction(self):
+        """Yield a fresh cursor; everything executed on it commits together or rolls back"""
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            wrapped = BackendCursor(cursor, self.backend)
+            try:
+                yield wrapped
+                # Other terminals only notice deletes through this log (see ChangePoller)
+                wrapped.log_deletions()
+                conn.commit()
+            finally:
+                cursor.close()
+        if wrapped.written:
+            self._publish_writes(wrapped.written)
+
+    def add_write_listener(self, listener):
+        self.write_listeners.append(listener)
+
+    def _publish_writes(self, tables):
+        for listener in self.write_listeners:
+            try:
+                listener(tables)
+            except Exception as e:
+                # The write is committed; a failing listener must not report it as failed
+                print("Write listener failed:", e)
+
+    def create_schema(self):
+        """Create any missing GYM tables, columns and indexes"""
+        with self.transaction() as cursor:
+            self.backend.create_schema(cursor)
+
+    def fetchall(self, query, params=()):
+        with self.cursor() as cursor:
+            cursor.execute(query, params)
+            return cursor.fetchall()
+
+    def fetchone(self, query, params=()):
+        with self.cursor() as cursor:
+            cursor.execute(query, params)
+            return cursor.fetchone()
+
+    def execute(self, query, params=()):
+        """Run a single write statement in its own transaction"""
+        with self.transaction() as cursor:
+            cursor.execute(query, params)
+            return cursor.rowcount
+
+    def pool_stats(self):
+        return self.pool.stats() if self.pool else {}
 
     def close(self):
-        if self.conn:
-            self.conn.close()
+        if self.pool:
+            self.pool.close()
+            self.pool = None
             print("🔒 Connection closed.")
 
 if __name__ == '__main__':
-    db = DatabaseConnection()  
-    db.connect()               
-    db.close()                 
+    db = DatabaseConnection()
+    print(db.pool_stats())
+    db.close()
@@ -2,7 +2,8 @@ import sys
 import os
 import configparser
 import traceback
-from cryptography.fernet import Fernet
+import hmac
+from cryptography.fernet import Fernet, InvalidToken
 from PySide6.QtWidgets import QMainWindow, QMessageBox, QLineEdit
 from PySide6.QtCore import Signal
 
@@ -25,37 +26,20 @@ fernet = Fernet(secret_key)
 # ----- Add widgets folder to path -----
 sys.path.insert(0, os.path.join(BASE_PATH, "widgits"))
 import widgits.rec_rc  # Ensure your resources file is here
+from logic import credentials
 
 # ----- Login Window -----
 class LoginWindow(QMainWindow):
     login_success = Signal(bool)
 
-    def __init__(self, db, stack, admin_page, cashier_page, helpdesk_page,
-                 admin_ui, cashier_ui, helpdesk_ui,
-                 ADMIN_NAV, CASHIER_NAV, HELPDESK_NAV,
-                 NORMAL_STYLE, ACTIVE_STYLE):
+    def __init__(self, db):
         super().__init__()
         self.db = db
-        self.stack = stack
-
-        # Pages & UIs
-        self.admin_page = admin_page
-        self.cashier_page = cashier_page
-        self.helpdesk_page = helpdesk_page
-        self.admin_ui = admin_ui
-        self.cashier_ui = cashier_ui
-        self.helpdesk_ui = helpdesk_ui
-
-        # Navigation & styles
-        self.ADMIN_NAV = ADMIN_NAV
-        self.CASHIER_NAV = CASHIER_NAV
-        self.HELPDESK_NAV = HELPDESK_NAV
-        self.NORMAL_STYLE = NORMAL_STYLE
-        self.ACTIVE_STYLE = ACTIVE_STYLE
-
-        # Logged-in user info
+
+        # Logged-in user info; the role decides which windows main.py builds
         self.logged_system_user_id = None
         self.logged_employee_id = None
+        self.logged_role = None
 
         # Load login UI
         from widgits.ui_Login import Ui_MainWindow
@@ -67,41 +51,33 @@ class LoginWindow(QMainWindow):
 
         # Optional pre-fill
 
-        # Use the global fernet
+        # Use the global fernet (only needed for passwords not yet upgraded)
         self.fernet = fernet
 
-    # ----- Password decryption -----
+    # ----- Password checks -----
     def decrypt_password(self, encrypted_password: str) -> str:
         decrypted = self.fernet.decrypt(encrypted_password.encode())
         return decrypted.decode()
 
-    # ----- Navigation helpers -----
-    def reset_admin_nav(self):
-        for btn in self.ADMIN_NAV:
-            btn.setStyleSheet(self.NORMAL_STYLE)
-
-    def reset_cashier_nav(self):
-        for btn in self.CASHIER_NAV:
-            btn.setStyleSheet(self.NORMAL_STYLE)
-
-    def reset_helpdesk_nav(self):
-        for btn in self.HELPDESK_NAV:
-            btn.setStyleSheet(self.NORMAL_STYLE)
-
-    def set_active_admin(self, btn=None):
-        self.reset_admin_nav()
-        if btn:
-            btn.setStyleSheet(self.ACTIVE_STYLE)
-
-    def set_active_cashier(self, btn=None):
-        self.reset_cashier_nav()
-        if btn:
-            btn.setStyleSheet(self.ACTIVE_STYLE)
+    def check_password(self, password, stored):
+        """Verify against a scrypt verifier, or a legacy Fernet-encrypted password"""
+        if credentials.is_verifier(stored):
+            return credentials.verify_password(password, stored)
+        try:
+            decrypted = self.decrypt_password(stored)
+        except InvalidToken:
+            return False
+        return hmac.compare_digest(password.encode(), decrypted.encode())
 
-    def set_active_helpdesk(self, btn=None):
-        self.reset_helpdesk_nav()
-        if btn:
-            btn.setStyleSheet(self.ACTIVE_STYLE)
+    def upgrade_password(self, system_user_id, password):
+        """Replace a legacy or outdated verifier with one using the current parameters"""
+        try:
+            self.db.execute(
+                "UPDATE SystemUsers SET hashed_password = ? WHERE system_user_id = ?",
+                (credentials.hash_password(password), system_user_id)
+            )
+        except Exception as e:
+            print("Failed to upgrade stored password:", e)
 
     # ----- Handle login -----
     def handle_login(self):
@@ -109,26 +85,33 @@ class LoginWindow(QMainWindow):
         password_input = self.ui.lineEdit_2.text().strip()
 
         try:
-            self.db.cursor.execute(
-                "SELECT system_user_id, employee_id, username, hashed_password, role FROM SystemUsers"
+            # Single indexed lookup, then one credential check
+            user = self.db.fetchone(
+                "SELECT system_user_id, employee_id, hashed_password, role FROM SystemUsers "
+                "WHERE username_key = ?",
+                (credentials.username_key(username_input),)
             )
-            users = self.db.cursor.fetchall()
 
-            for user in users:
-                system_user_id, employee_id, db_username, db_encrypted_password, role = user
-                decrypted_password = self.decrypt_password(db_encrypted_password)
+            if user is None:
+                # Same work as a wrong password, so unknown usernames aren't revealed by timing
+                credentials.verify_password(password_input, credentials.DUMMY_VERIFIER)
+            else:
+                system_user_id, employee_id, stored_password, role = user
+
+                if self.check_password(password_input, stored_password):
+                    if credentials.needs_rehash(stored_password):
+                        self.upgrade_password(system_user_id, password_input)
 
-                if username_input == db_username and password_input == decrypted_password:
                     self.logged_system_user_id = system_user_id
                     self.logged_employee_id = employee_id
+                    self.logged_role = role.lower()
 
                     # Log login
                     try:
-                        self.db.cursor.execute(
+                        self.db.execute(
                             "INSERT INTO SystemUserLogins (system_user_id) VALUES (?)",
                             (system_user_id,)
                         )
-                        self.db.connection.commit()
                     except Exception as e:
                         print("Failed to log user login:", e)
 
@@ -136,22 +119,6 @@ class LoginWindow(QMainWindow):
                     self.ui.lineEdit.clear()
                     self.ui.lineEdit_2.clear()
 
-                    # Role-based navigation
-                    if role.lower() == "admin":
-                        self.stack.setCurrentWidget(self.admin_page)
-                        self.admin_ui.stackedWidget.setCurrentWidget(self.admin_ui.sales)
-                        self.set_active_admin(self.admin_ui.pushButton_2)
-                    elif role.lower() == "cashier":
-                        self.stack.setCurrentWidget(self.cashier_page)
-                        self.cashier_ui.stackedWidget.setCurrentWidget(self.cashier_ui.cashierWork)
-                        self.set_active_cashier(self.cashier_ui.pushButton_7)
-                        self.cashier_ui.pushButton_4.hide()
-                    elif role.lower() == "helpdesk":
-                        self.stack.setCurrentWidget(self.helpdesk_page)
-                        self.helpdesk_ui.stackedWidget.setCurrentWidget(self.helpdesk_ui.users)
-                        self.set_active_helpdesk(self.helpdesk_ui.pushButton_3)
-                        self.helpdesk_ui.pushButton_4.hide()
-
                     self.login_success.emit(True)
                     return
 
@@ -171,3 +138,6 @@ class LoginWindow(QMainWindow):
 
     def get_logged_employee_id(self):
         return self.logged_employee_id
+
+    def get_logged_role(self):
+        return self.logged_role
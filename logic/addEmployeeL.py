@@ -54,12 +54,11 @@ class AddEmployeeDialog(QDialog):
             INSERT INTO Employees (name, phone, salary)
             VALUES (?, ?, ?)
             """
-            self.db.cursor.execute(query, (
+            self.db.execute(query, (
                 data['name'],
                 data['phone'],
                 data['salary']
             ))
-            self.db.connection.commit()
 
             QMessageBox.information(self, "Success", "Employee added successfully!")
             self.accept()  # Close the dialog
@@ -1,6 +1,8 @@
 from PySide6.QtWidgets import QDialog, QMessageBox
 from widgits.ui_addExpenses import Ui_Dialog
 from PySide6.QtCore import QDate
+from datetime import date
+from logic.bookkeeping import add_expense
 
 class AddExpensesDialog(QDialog):
     def __init__(self, parent=None, db=None):
@@ -48,15 +50,8 @@ class AddExpensesDialog(QDialog):
             return
 
         try:
-            query = """
-            INSERT INTO Expenses (description, amount, expense_date)
-            VALUES (?, ?, CONVERT(date, GETDATE()))
-            """
-            self.db.cursor.execute(query, (
-                data['description'],
-                data['amount']
-            ))
-            self.db.connection.commit()
+            with self.db.transaction() as cursor:
+                add_expense(cursor, data['description'], data['amount'], date.today())
 
             QMessageBox.information(self, "Success", "Expense added successfully!")
             self.accept()  # Close the dialog
@@ -1,5 +1,6 @@
 from PySide6.QtWidgets import QDialog, QMessageBox
 from widgits.ui_addGood import Ui_Dialog
+from logic.stockLedger import RESTOCK, add_movements
 
 class AddGoodDialog(QDialog):
     def __init__(self, parent=None, db=None):
@@ -16,8 +17,7 @@ class AddGoodDialog(QDialog):
     def load_suppliers(self):
         try:
             query = "SELECT supplier_id FROM Suppliers"
-            self.db.cursor.execute(query)
-            suppliers = self.db.cursor.fetchall()
+            suppliers = self.db.fetchall(query)
             if not suppliers:
                 QMessageBox.warning(self, "Warning", "No suppliers found. Please add suppliers first.")
                 self.reject()
@@ -66,8 +66,7 @@ class AddGoodDialog(QDialog):
     def verify_supplier_exists(self, supplier_id):
         try:
             query = "SELECT COUNT(*) FROM Suppliers WHERE supplier_id = ?"
-            self.db.cursor.execute(query, (supplier_id,))
-            return self.db.cursor.fetchone()[0] > 0
+            return self.db.fetchone(query, (supplier_id,))[0] > 0
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to verify supplier: {str(e)}")
             return False
@@ -83,18 +82,21 @@ class AddGoodDialog(QDialog):
             return
 
         try:
-            query = """
-            INSERT INTO Supplies (supplier_id, item_name, quantity, price)
-            VALUES (?, ?, ?, ?)
-            """
-            self.db.cursor.execute(query, (
-                data['supplier_id'],
-                data['name'],
-                data['quantity'],
-                data['price']
-            ))
-            self.db.connection.commit()
-            
+            # The item starts at an empty snapshot; its opening stock is a restock in the ledger
+            with self.db.transaction() as cursor:
+                cursor.execute("""
+                INSERT INTO Supplies (supplier_id, item_name, quantity, price, modified_at)
+                OUTPUT INSERTED.supply_id
+                VALUES (?, ?, 0, ?, GETDATE())
+                """, (
+                    data['supplier_id'],
+                    data['name'],
+                    data['price']
+                ))
+                supply_id = cursor.fetchone()[0]
+                if data['quantity']:
+                    add_movements(cursor, [(supply_id, data['quantity'], RESTOCK, None)])
+
             QMessageBox.information(self, "Success", "Good added successfully!")
             self.accept()
             
@@ -59,14 +59,13 @@ class AddReportDialog(QDialog):
             today_date = date.today()
             current_time = datetime.now().time()
 
-            self.db.cursor.execute(insert_query, (
+            self.db.execute(insert_query, (
                 self.employee_id,
                 data["title"],
                 data["content"],
                 today_date,
                 current_time
             ))
-            self.db.connection.commit()
 
             QMessageBox.information(self, "Success", "Report added successfully!")
             self.accept()
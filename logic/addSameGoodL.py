@@ -1,6 +1,8 @@
 from PySide6.QtWidgets import QDialog, QMessageBox
 from widgits.ui_addSameGood import Ui_Dialog  # Your .ui file for the dialog
 from datetime import datetime
+from logic.bookkeeping import add_expense
+from logic.stockLedger import RESTOCK, add_movements
 
 class AddSameGoodDialog(QDialog):
     def __init__(self, parent=None, db=None):
@@ -44,20 +46,14 @@ class AddSameGoodDialog(QDialog):
             return
 
         try:
-            # 1. Update the quantity in Supplies
-            update_query = "UPDATE Supplies SET quantity = quantity + ? WHERE supply_id = ?"
-            self.db.cursor.execute(update_query, (data["amount_to_add"], data["good_id"]))
-
-            # 2. Add an expense record
-            expense_query = """
-                INSERT INTO Expenses (description, amount, expense_date)
-                VALUES (?, ?, ?)
-            """
-            desc = f"Added {data['amount_to_add']} units to Good ID {data['good_id']}"
-            self.db.cursor.execute(expense_query, (desc, data["total_cost"], datetime.now()))
-
-            # Commit the changes
-            self.db.connection.commit()
+            # Both changes commit together
+            with self.db.transaction() as cursor:
+                # 1. Record the restock in the stock ledger
+                add_movements(cursor, [(data["good_id"], data["amount_to_add"], RESTOCK, None)])
+
+                # 2. Add an expense record
+                desc = f"Added {data['amount_to_add']} units to Good ID {data['good_id']}"
+                add_expense(cursor, desc, data["total_cost"], datetime.now())
 
             QMessageBox.information(self, "Success", "Stock updated and expense recorded!")
             self.accept()
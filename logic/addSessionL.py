@@ -27,8 +27,7 @@ class AddSessionDialog(QDialog):
         trainer_id = int(trainer_id_text)
 
         # Check trainer exists
-        self.db.cursor.execute("SELECT COUNT(*) FROM Trainers WHERE trainer_id = ?", (trainer_id,))
-        if self.db.cursor.fetchone()[0] == 0:
+        if self.db.fetchone("SELECT COUNT(*) FROM Trainers WHERE trainer_id = ?", (trainer_id,))[0] == 0:
             QMessageBox.warning(self, "Validation Error", "Trainer does not exist")
             self.ui.lineEdit.setFocus()
             return None
@@ -97,7 +96,7 @@ class AddSessionDialog(QDialog):
             INSERT INTO WorkoutSessions (trainer_id, title, session_date, start_time, end_time, entry_fee)
             VALUES (?, ?, ?, ?, ?, ?)
             """
-            self.db.cursor.execute(query, (
+            self.db.execute(query, (
                 data["trainer_id"],
                 data["title"],
                 data["session_date"],
@@ -105,7 +104,6 @@ class AddSessionDialog(QDialog):
                 data["end_time"],
                 data["entry_fee"]
             ))
-            self.db.connection.commit()
             QMessageBox.information(self, "Success", "Workout session added successfully!")
             self.accept()
         except Exception as e:
@@ -54,15 +54,13 @@ class AddSupplierDialog(QDialog):
 
         try:
             check_query = "SELECT COUNT(*) FROM Suppliers WHERE name = ?"
-            self.db.cursor.execute(check_query, (name,))
-            if self.db.cursor.fetchone()[0] > 0:
+            if self.db.fetchone(check_query, (name,))[0] > 0:
                 QMessageBox.warning(self, "Error", "A supplier with this name already exists!")
                 self.ui.lineEdit_2.setFocus()
                 return
 
             query = "INSERT INTO Suppliers (name, email, phone) VALUES (?, ?, ?)"
-            self.db.cursor.execute(query, (name, email, phone))
-            self.db.connection.commit()
+            self.db.execute(query, (name, email, phone))
             
             QMessageBox.information(self, "Success", "Supplier added successfully!")
             self.accept()
@@ -1,7 +1,6 @@
 from PySide6.QtWidgets import QDialog, QMessageBox, QLineEdit
 from widgits.ui_addSystemUser import Ui_Dialog
-from cryptography.fernet import Fernet
-import configparser
+from logic import credentials
 
 class AddSystemUserDialog(QDialog):
     def __init__(self, parent=None, db=None):
@@ -17,21 +16,14 @@ class AddSystemUserDialog(QDialog):
         self.ui.pushButton_5.clicked.connect(self.add_system_user)  # Done
         self.ui.pushButton_4.clicked.connect(self.reject)           # Cancel
 
-        # Load secret key from config
-        config = configparser.ConfigParser()
-        config.read("config.ini")
-        secret_key = config.get("APP", "SECRET_KEY").encode()
-        self.fernet = Fernet(secret_key)
-
         # Initialize role comboBox
         self.ui.comboBox.clear()
         self.ui.comboBox.addItems(["cashier", "admin", "helpdesk"])
         self.ui.comboBox.setCurrentText("cashier")  # default to cashier
 
-    def encrypt_password(self, password: str) -> str:
-        """Encrypt the password using the app secret key"""
-        encrypted = self.fernet.encrypt(password.encode())
-        return encrypted.decode()
+    def hash_password(self, password: str) -> str:
+        """One-way scrypt verifier; the password itself is never stored"""
+        return credentials.hash_password(password)
 
     def validate_input(self):
         """Validate input fields before inserting into database"""
@@ -49,10 +41,10 @@ class AddSystemUserDialog(QDialog):
 
         # Check if employee exists
         try:
-            self.db.cursor.execute(
+            row = self.db.fetchone(
                 "SELECT COUNT(*) FROM Employees WHERE employee_id = ?", (employee_id,)
             )
-            if self.db.cursor.fetchone()[0] == 0:
+            if row[0] == 0:
                 QMessageBox.warning(
                     self, "Validation Error", f"No employee found with ID {employee_id}"
                 )
@@ -72,13 +64,13 @@ class AddSystemUserDialog(QDialog):
             self.ui.lineEdit_3.setFocus()
             return None
 
-        # Encrypt the password using the secret key
-        encrypted_password = self.encrypt_password(password)
+        # Hash the password with the configured scrypt parameters
+        hashed_password = self.hash_password(password)
 
         return {
             'employee_id': employee_id,
             'username': username,
-            'hashed_password': encrypted_password
+            'hashed_password': hashed_password
         }
 
     def add_system_user(self):
@@ -92,22 +84,22 @@ class AddSystemUserDialog(QDialog):
             role = self.ui.comboBox.currentText().strip().lower()
 
             query = """
-            INSERT INTO SystemUsers (employee_id, role, username, hashed_password, created_at)
-            VALUES (?, ?, ?, ?, GETDATE())
+            INSERT INTO SystemUsers (employee_id, role, username, username_key, hashed_password, created_at)
+            VALUES (?, ?, ?, ?, ?, GETDATE())
             """
-            self.db.cursor.execute(query, (
+            self.db.execute(query, (
                 data['employee_id'],
                 role,
                 data['username'],
+                credentials.username_key(data['username']),
                 data['hashed_password']
             ))
-            self.db.connection.commit()
 
             QMessageBox.information(self, "Success", f"System user added successfully as {role}!")
             self.accept()  # Close the dialog
 
         except Exception as e:
-            if "UNIQUE" in str(e):
+            if "unique" in str(e).lower():
                 QMessageBox.warning(self, "Error", "Username already exists")
             else:
                 QMessageBox.critical(self, "Error", f"Failed to add system user: {str(e)}")
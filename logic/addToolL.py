@@ -1,6 +1,7 @@
 from PySide6.QtWidgets import QDialog, QMessageBox
 from widgits.ui_addTool import Ui_Dialog
 from PySide6.QtCore import QDate
+from logic.bookkeeping import add_expense
 
 class AddToolDialog(QDialog):
     def __init__(self, parent=None, db=None):
@@ -49,8 +50,7 @@ class AddToolDialog(QDialog):
         """Check if a tool with the same name already exists"""
         try:
             query = "SELECT COUNT(*) FROM Tools WHERE name = ?"
-            self.db.cursor.execute(query, (name,))
-            return self.db.cursor.fetchone()[0] == 0
+            return self.db.fetchone(query, (name,))[0] == 0
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to verify tool name: {str(e)}")
             return False
@@ -67,32 +67,23 @@ class AddToolDialog(QDialog):
             return
 
         try:
-            # Insert tool into Tools table
-            tool_query = """
-            INSERT INTO Tools (name, tag_name, purchase_date, cost)
-            VALUES (?, ?, ?, ?)
-            """
-            self.db.cursor.execute(tool_query, (
-                data['name'],
-                data['tag_name'],
-                data['purchase_date'],
-                data['cost']
-            ))
+            # Both inserts commit together
+            with self.db.transaction() as cursor:
+                # Insert tool into Tools table
+                tool_query = """
+                INSERT INTO Tools (name, tag_name, purchase_date, cost)
+                VALUES (?, ?, ?, ?)
+                """
+                cursor.execute(tool_query, (
+                    data['name'],
+                    data['tag_name'],
+                    data['purchase_date'],
+                    data['cost']
+                ))
 
-            # Insert expense into Expenses table
-            expense_query = """
-            INSERT INTO Expenses (description, amount, expense_date)
-            VALUES (?, ?, ?)
-            """
-            description = f"Tool purchased: {data['name']}"
-            self.db.cursor.execute(expense_query, (
-                description,
-                data['cost'],
-                data['purchase_date']
-            ))
-
-            # Commit both inserts
-            self.db.connection.commit()
+                # Insert expense into Expenses table
+                description = f"Tool purchased: {data['name']}"
+                add_expense(cursor, description, data['cost'], data['purchase_date'])
 
             QMessageBox.information(self, "Success", "Tool added and expense recorded successfully!")
             self.accept()
@@ -58,13 +58,12 @@ class AddTrainerDialog(QDialog):
             INSERT INTO Trainers (name, gender, phone, specialization)
             VALUES (?, ?, ?, ?)
             """
-            self.db.cursor.execute(query, (
+            self.db.execute(query, (
                 data['name'],
                 data['gender'],
                 data['phone'],
                 data['specialization']
             ))
-            self.db.connection.commit()
 
             QMessageBox.information(self, "Success", "Trainer added successfully!")
             self.accept()  # Close the dialog
@@ -1,6 +1,9 @@
 from PySide6.QtWidgets import QDialog, QMessageBox
 from widgits.ui_addUser import Ui_Dialog
 from datetime import timedelta, date, datetime
+from logic.memberships import add_membership
+from logic.bookkeeping import add_income
+from schema import IncomeSource
 
 class AddUserDialog(QDialog):
     def __init__(self, parent=None, db=None):
@@ -24,8 +27,7 @@ class AddUserDialog(QDialog):
         """Load membership types from DB into combo box"""
         try:
             query = "SELECT membership_id, type, duration_days, price FROM Memberships ORDER BY membership_id"
-            self.db.cursor.execute(query)
-            self.memberships = self.db.cursor.fetchall()
+            self.memberships = self.db.fetchall(query)
 
             self.ui.comboBox.clear()
             for m in self.memberships:
@@ -110,36 +112,25 @@ class AddUserDialog(QDialog):
             return
 
         try:
-            # Step 1: Insert user
-            insert_user = """
-            INSERT INTO Users (name, date_of_birth, gender, registration_date)
-            VALUES (?, ?, ?, GETDATE())
-            """
-            self.db.cursor.execute(insert_user, (data['name'], data['dob'], data['gender']))
-            self.db.connection.commit()
-
-            # Step 2: Get the new user_id
-            self.db.cursor.execute("SELECT TOP 1 user_id FROM Users ORDER BY user_id DESC")
-            user_id = self.db.cursor.fetchone()[0]
-
-            # Step 3: Insert into UserMemberships
-            start_date = date.today()
-            end_date = start_date + timedelta(days=data['duration_days'])
-            insert_membership = """
-            INSERT INTO UserMemberships (user_id, membership_id, start_date, end_date)
-            VALUES (?, ?, ?, ?)
-            """
-            self.db.cursor.execute(insert_membership, (user_id, data['membership_id'], start_date, end_date))
-            self.db.connection.commit()
-
-            # Step 4: Insert into Income after membership is added
-            insert_income = """
-            INSERT INTO Income (source, amount, income_date)
-            VALUES (?, ?, ?)
-            """
-            source_label = "membership"
-            self.db.cursor.execute(insert_income, (source_label, data['price'], datetime.now()))
-            self.db.connection.commit()
+            with self.db.transaction() as cursor:
+                # Step 1: Insert user
+                insert_user = """
+                INSERT INTO Users (name, date_of_birth, gender, registration_date)
+                OUTPUT INSERTED.user_id
+                VALUES (?, ?, ?, GETDATE())
+                """
+                cursor.execute(insert_user, (data['name'], data['dob'], data['gender']))
+
+                # Step 2: Get the new user_id (returned by the insert itself)
+                user_id = cursor.fetchone()[0]
+
+                # Step 3: Insert into UserMemberships
+                start_date = date.today()
+                end_date = start_date + timedelta(days=data['duration_days'])
+                add_membership(cursor, user_id, data['membership_id'], start_date, end_date)
+
+                # Step 4: Insert into Income after membership is added
+                add_income(cursor, IncomeSource.MEMBERSHIP, data['price'], datetime.now())
 
             # Success message
             QMessageBox.information(
@@ -0,0 +1,77 @@
+from collections import defaultdict
+from datetime import date, datetime
+from decimal import Decimal
+
+from schema import IncomeSource
+
+# DailyRollups.source_code for the day's Expenses total; no IncomeSource uses it
+EXPENSES = 0
+
+
+def _day(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def _roll_up(cursor, totals):
+    """Add {(day, source_code): (amount, entries)} to DailyRollups"""
+    # UPDLOCK + SERIALIZABLE holds the key range even when the row is missing,
+    # so two writers can't both find nothing and insert the same day. Rows
+    # are taken in key order so writers covering several days can't deadlock.
+    for (day, source), (amount, entries) in sorted(totals.items()):
+        cursor.execute("""
+        UPDATE DailyRollups WITH (UPDLOCK, SERIALIZABLE)
+        SET amount = amount + ?, entries = entries + ?
+        WHERE day = ? AND source_code = ?
+        """, (amount, entries, day, source))
+        if cursor.rowcount == 0:
+            cursor.execute(
+                "INSERT INTO DailyRollups (day, source_code, amount, entries) VALUES (?, ?, ?, ?)",
+                (day, source, amount, entries)
+            )
+
+
+def add_incomes(cursor, rows):
+    """
+    Insert Income rows [(source, amount, income_date)] inside the caller's
+    transaction (one batched insert) and add them to the daily rollups.
+    source is an IncomeSource (or anything IncomeSource.coerce() accepts).
+    """
+    rows = [(IncomeSource.coerce(source), amount, income_date) for source, amount, income_date in rows]
+    cursor.executemany(
+        "INSERT INTO Income (source, source_code, amount, income_date) VALUES (?, ?, ?, ?)",
+        [(source.label, source.value, amount, income_date) for source, amount, income_date in rows]
+    )
+    totals = defaultdict(lambda: (Decimal(0), 0))
+    for source, amount, income_date in rows:
+        key = (_day(income_date), source.value)
+        total, entries = totals[key]
+        totals[key] = (total + Decimal(str(amount)), entries + 1)
+    _roll_up(cursor, totals)
+
+
+def add_income(cursor, source, amount, income_date):
+    add_incomes(cursor, [(source, amount, income_date)])
+
+
+def add_expense(cursor, description, amount, expense_date):
+    """Insert an Expenses row inside the caller's transaction and add it to the daily rollups"""
+    cursor.execute(
+        "INSERT INTO Expenses (description, amount, expense_date) VALUES (?, ?, ?)",
+        (description, amount, expense_date)
+    )
+    _roll_up(cursor, {(_day(expense_date), EXPENSES): (Decimal(str(amount)), 1)})
+
+
+def summarize(db, start_date, end_date):
+    """{source_code: total} for the days from start_date to end_date, expenses under EXPENSES"""
+    rows = db.fetchall("""
+    SELECT source_code, SUM(amount)
+    FROM DailyRollups
+    WHERE day >= ? AND day <= ?
+    GROUP BY source_code
+    """, (start_date, end_date))
+    return {source: total or 0 for source, total in rows}
@@ -1,6 +1,9 @@
 from PySide6.QtWidgets import QDialog, QMessageBox
 from widgits.ui_buyMembership import Ui_Dialog
 from datetime import timedelta, date, datetime
+from logic.memberships import add_membership
+from logic.bookkeeping import add_income
+from schema import IncomeSource
 
 class BuyMembershipDialog(QDialog):
     def __init__(self, parent=None, db=None):
@@ -24,8 +27,7 @@ class BuyMembershipDialog(QDialog):
         """Load membership types from DB into combo box"""
         try:
             query = "SELECT membership_id, type, duration_days, price FROM Memberships ORDER BY membership_id"
-            self.db.cursor.execute(query)
-            self.memberships = self.db.cursor.fetchall()
+            self.memberships = self.db.fetchall(query)
 
             self.ui.comboBox.clear()
             for m in self.memberships:
@@ -77,8 +79,7 @@ class BuyMembershipDialog(QDialog):
         user_id = int(user_id_text)
 
         # Check if user exists
-        self.db.cursor.execute("SELECT COUNT(*) FROM Users WHERE user_id = ?", (user_id,))
-        if self.db.cursor.fetchone()[0] == 0:
+        if self.db.fetchone("SELECT COUNT(*) FROM Users WHERE user_id = ?", (user_id,))[0] == 0:
             QMessageBox.warning(self, "Validation Error", f"No user found with ID {user_id}")
             self.ui.lineEdit.setFocus()
             return None
@@ -107,26 +108,12 @@ class BuyMembershipDialog(QDialog):
             start_date = date.today()
             end_date = start_date + timedelta(days=data['duration_days'])
 
-            # Insert membership
-            insert_membership = """
-            INSERT INTO UserMemberships (user_id, membership_id, start_date, end_date)
-            VALUES (?, ?, ?, ?)
-            """
-            self.db.cursor.execute(insert_membership, (
-                data['user_id'],
-                data['membership_id'],
-                start_date,
-                end_date
-            ))
-            self.db.connection.commit()
-
-            # Insert income record
-            insert_income = """
-            INSERT INTO Income (source, amount, income_date)
-            VALUES (?, ?, ?)
-            """
-            self.db.cursor.execute(insert_income, ("membership", data['price'], datetime.now()))
-            self.db.connection.commit()
+            with self.db.transaction() as cursor:
+                # Insert membership (and move the user's current membership to it)
+                add_membership(cursor, data['user_id'], data['membership_id'], start_date, end_date)
+
+                # Insert income record
+                add_income(cursor, IncomeSource.MEMBERSHIP, data['price'], datetime.now())
 
             QMessageBox.information(
                 self,
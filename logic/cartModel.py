@@ -0,0 +1,136 @@
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, Signal
+from PySide6.QtGui import QBrush, QColor
+
+
+def line_total(line):
+    return line["price"] * line["quantity"] * (1 - float(line["discount"]) / 100)
+
+
+class CartModel(QAbstractTableModel):
+    """
+    Sale point cart. Lines are keyed by supply_id and the cart total is kept
+    as a running sum, so adding or editing a line only touches that line's
+    row instead of rebuilding the table and re-summing every line.
+    """
+    HEADERS = ["Name", "Quantity", "Price per Unit", "Discount", "Total"]
+    QUANTITY_COLUMN = 1
+
+    totalChanged = Signal(float)
+    quantityRejected = Signal(str, str)   # title, message
+
+    def __init__(self, stock_of, parent=None):
+        super().__init__(parent)
+        self.stock_of = stock_of   # supply_id -> current stock, checked when a quantity is edited
+        self._lines = []           # display order
+        self._row_of = {}          # supply_id -> row in _lines
+        self.total = 0.0
+
+    # ----- Cart operations -----
+    def add(self, supply_id, name, price, quantity, discount=0.0):
+        """Add a line, or add to the quantity of the line already holding this item"""
+        row = self._row_of.get(supply_id)
+        if row is not None:
+            line = self._lines[row]
+            self._update(row, quantity=line["quantity"] + quantity, discount=discount)
+            return
+
+        line = {"id": supply_id, "name": name, "price": price, "quantity": quantity, "discount": discount}
+        row = len(self._lines)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._lines.append(line)
+        self._row_of[supply_id] = row
+        self.endInsertRows()
+        self._add_to_total(line_total(line))
+
+    def clear(self):
+        self.beginResetModel()
+        self._lines = []
+        self._row_of = {}
+        self.endResetModel()
+        self.total = 0.0
+        self.totalChanged.emit(self.total)
+
+    def lines(self):
+        return list(self._lines)
+
+    def quantity_of(self, supply_id):
+        row = self._row_of.get(supply_id)
+        return self._lines[row]["quantity"] if row is not None else 0
+
+    def __len__(self):
+        return len(self._lines)
+
+    def _update(self, row, **changes):
+        line = self._lines[row]
+        before = line_total(line)
+        line.update(changes)
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.HEADERS) - 1))
+        self._add_to_total(line_total(line) - before)
+
+    def _add_to_total(self, delta):
+        self.total += delta
+        self.totalChanged.emit(self.total)
+
+    # ----- Model interface -----
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._lines)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        line = self._lines[index.row()]
+        col = index.column()
+
+        if role == Qt.DisplayRole:
+            if col == 0:
+                return line["name"]
+            if col == 1:
+                return str(line["quantity"])
+            if col == 2:
+                return f"${line['price']:.2f}"
+            if col == 3:
+                discount = float(line["discount"])
+                return f"{discount:.2f}%" if discount > 0 else "-"
+            return f"${line_total(line):.2f}"
+        if role == Qt.EditRole and col == self.QUANTITY_COLUMN:
+            return line["quantity"]
+        if role == Qt.TextAlignmentRole:
+            return Qt.AlignCenter
+        if role == Qt.ForegroundRole:
+            return QBrush(QColor(0, 0, 0))
+        return None
+
+    def flags(self, index):
+        flags = Qt.ItemIsSelectable | Qt.ItemIsEnabled
+        if index.column() == self.QUANTITY_COLUMN:  # Quantity editable in cart
+            flags |= Qt.ItemIsEditable
+        return flags
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.EditRole or index.column() != self.QUANTITY_COLUMN:
+            return False
+        line = self._lines[index.row()]
+        try:
+            new_qty = int(value)
+            if new_qty < 1:
+                raise ValueError
+        except (TypeError, ValueError):
+            self.quantityRejected.emit("Invalid Quantity", "Quantity must be a positive integer")
+            return False
+
+        stock = self.stock_of(line["id"])
+        if new_qty > stock:
+            self.quantityRejected.emit("Stock Error", f"Not enough stock. Max available: {stock}")
+            return False
+
+        if new_qty != line["quantity"]:
+            self._update(index.row(), quantity=new_qty)
+        return True
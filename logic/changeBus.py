@@ -0,0 +1,57 @@
+from PySide6.QtCore import QObject, QTimer, Signal, Qt
+
+
+def _names(tables):
+    return frozenset(table.lower() for table in tables)
+
+
+class ChangeBus(QObject):
+    """
+    In-process notice board for table changes. DatabaseConnection publishes
+    the tables each committed transaction wrote to (from whatever thread
+    committed it); subscribers name the tables they show and get called
+    back on the GUI thread.
+
+    A burst of changes (a batch of synced sales, a dialog writing three
+    tables) is coalesced: each subscriber is called once, COALESCE_MS after
+    the first change that concerned it.
+    """
+    COALESCE_MS = 150
+
+    tablesChanged = Signal(object)   # frozenset of lower-case table names
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._subscriptions = []   # (tables, timer)
+        # Queued even on the GUI thread, so a writer finishes before anyone reloads
+        self.tablesChanged.connect(self._dispatch, Qt.QueuedConnection)
+
+    def publish(self, tables):
+        """Announce that tables were written; safe to call from any thread"""
+        self.tablesChanged.emit(_names(tables))
+
+    def subscribe(self, tables, callback, delay=None):
+        """Call callback (once per burst) whenever any of tables changes"""
+        timer = QTimer(self)
+        timer.setSingleShot(True)
+        timer.setInterval(self.COALESCE_MS if delay is None else delay)
+        timer.timeout.connect(callback)
+        subscription = (_names(tables), timer)
+        self._subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        if subscription in self._subscriptions:
+            self._subscriptions.remove(subscription)
+            subscription[1].stop()
+            subscription[1].deleteLater()
+
+    def watched(self):
+        """Every table some subscriber listens for (safe to call from any thread)"""
+        return frozenset().union(*(tables for tables, _ in list(self._subscriptions)))
+
+    def _dispatch(self, tables):
+        for watched, timer in self._subscriptions:
+            # Not restarted while pending, so a steady stream still reloads every COALESCE_MS
+            if watched & tables and not timer.isActive():
+                timer.start()
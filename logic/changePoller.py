@@ -0,0 +1,126 @@
+import threading
+import traceback
+
+import schema
+
+POLL_INTERVAL = 5   # seconds between watermark reads
+
+
+# Tables without an identity key or modified_at, watched through the keyed
+# table every write to them goes with
+WRITTEN_WITH = {
+    "CurrentMemberships": "UserMemberships",   # kept by add_membership()
+}
+
+
+def _pk(table):
+    first = schema.TABLES[table][0].split()
+    return first[0] if first[1] == "{pk}" else None
+
+
+def _watermark_columns():
+    """
+    table name (lower case) -> (table, scalar subqueries whose values change
+    when its rows do). Each is an index seek (highest key, newest modified_at,
+    latest logged delete), so polling costs the same however big a table grows.
+    """
+    touched = {table for table, column in schema.COLUMNS if column.split()[0] == "modified_at"}
+    columns = {}
+    for table in schema.TABLES:
+        keyed = table if _pk(table) else WRITTEN_WITH.get(table)
+        expressions = []
+        if keyed:
+            expressions.append(f"(SELECT MAX({_pk(keyed)}) FROM {keyed})")
+        if table in touched:
+            expressions.append(f"(SELECT MAX(modified_at) FROM {table})")
+        expressions.append(f"(SELECT MAX(deletion_id) FROM Deletions WHERE table_name = '{table.lower()}')")
+        columns[table.lower()] = (table, expressions)
+    return columns
+
+
+WATERMARKS = _watermark_columns()
+
+
+class ChangePoller(threading.Thread):
+    """
+    Notices writes made by other terminals. Every POLL_INTERVAL it reads a
+    few cheap aggregates per watched table (highest key, newest modified_at
+    where the table has one, latest delete in the Deletions log) in a single
+    round trip, and hands
+    the tables whose values moved to listeners - the same ones
+    DatabaseConnection calls for local writes, so the query cache drops
+    them and the page on screen catches up incrementally.
+
+    Inserts and deletes are seen on every table (DatabaseConnection logs
+    deletes); in-place updates only on tables that stamp modified_at
+    (Supplies). UserWorkoutSessions has no key, so its inserts stamp
+    modified_at for the poller. Stock levels change by
+    StockMovements inserts, so they are seen through that table.
+
+    Tables this terminal wrote itself are already announced by the write
+    listeners; local_write() makes the next read take their new values as
+    the baseline instead of announcing them a second time.
+    """
+
+    def __init__(self, db, watched, listeners, interval=POLL_INTERVAL):
+        super().__init__(name="change-poller", daemon=True)
+        self.db = db
+        self.watched = watched        # callable returning the lower-case table names to poll
+        self.listeners = listeners
+        db.reserve()   # polls on its own connection
+        self.interval = interval
+        self._marks = {}              # table -> last values read
+        self._local = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.is_set():
+            try:
+                self.poll_once()
+            except Exception:
+                traceback.print_exc()
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+    def local_write(self, tables):
+        """Write listener: tables this terminal committed to"""
+        with self._lock:
+            self._local.update(table.lower() for table in tables)
+        self._wake.set()
+
+    def poll_once(self):
+        """Read the watermarks once; returns the tables announced as changed"""
+        tables = sorted(name for name in self.watched() if name in WATERMARKS)
+        if not tables:
+            return set()
+        with self._lock:
+            local, self._local = self._local, set()
+
+        expressions, spans = [], []
+        for name in tables:
+            _, columns = WATERMARKS[name]
+            spans.append((name, len(expressions), len(expressions) + len(columns)))
+            expressions.extend(columns)
+        row = self.db.fetchone(f"SELECT {', '.join(expressions)}")
+
+        changed = set()
+        for name, start, end in spans:
+            marks = tuple(row[start:end])
+            previous = self._marks.get(name)
+            self._marks[name] = marks
+            if previous is not None and previous != marks and name not in local:
+                changed.add(WATERMARKS[name][0])
+
+        if changed:
+            for listener in self.listeners:
+                try:
+                    listener(changed)
+                except Exception as e:
+                    print("Change listener failed:", e)
+        return changed
+
+    def stop(self):
+        self._stopped.set()
+        self._wake.set()
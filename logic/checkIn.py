@@ -0,0 +1,147 @@
+import threading
+import traceback
+from datetime import date, datetime
+
+from logic.queryExecutor import QueryExecutor
+
+FLUSH_INTERVAL = 2   # seconds between entry log writes
+FLUSH_BATCH = 200    # check-ins written per transaction
+
+
+class MemberStatusCache:
+    """
+    Every member's current membership (name, type, end date) held in memory
+    so the door can answer a check-in without a query.
+
+    Rows come from CurrentMemberships, whose user_membership_id moves to the
+    newest purchase whenever a membership is bought. The highest id seen is
+    the watermark: a refresh only reads rows above it. fetch_changes() runs
+    on a worker thread; apply() and lookups run on the GUI thread.
+    """
+    QUERY_KEY = "member_status"
+    TABLES = ("CurrentMemberships", "UserMemberships")
+
+    QUERY = """
+    SELECT cm.user_id, u.name, m.type, cm.end_date, cm.user_membership_id
+    FROM CurrentMemberships cm
+    JOIN Users u ON u.user_id = cm.user_id
+    JOIN Memberships m ON m.membership_id = cm.membership_id
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.executor = QueryExecutor.for_db(db)
+        self.members = {}      # user_id -> (name, membership type, end_date)
+        self.watermark = None  # highest user_membership_id seen
+
+    # ----- Loading -----
+    def refresh(self):
+        """Pull membership changes since the last load in the background"""
+        self.executor.submit_call(
+            self.QUERY_KEY, self.fetch_changes, on_result=self.apply,
+            on_error=lambda e: print("Member status refresh failed:", e)
+        )
+
+    def fetch_changes(self):
+        if self.watermark is None:
+            return self.db.fetchall(self.QUERY)
+        return self.db.fetchall(self.QUERY + " WHERE cm.user_membership_id > ?", (self.watermark,))
+
+    def fetch_member(self, user_id):
+        """Read one member straight from the database (a primary key lookup)"""
+        row = self.db.fetchone(self.QUERY + " WHERE cm.user_id = ?", (user_id,))
+        if row is not None:
+            # Cached without moving the watermark: this one row says nothing
+            # about the rows below it that a refresh has yet to read
+            user_id, name, membership, end_date, _ = row
+            self.members[user_id] = (name, membership, end_date)
+        return self.members.get(user_id)
+
+    def apply(self, rows):
+        for user_id, name, membership, end_date, user_membership_id in rows:
+            self.members[user_id] = (name, membership, end_date)
+            if self.watermark is None or user_membership_id > self.watermark:
+                self.watermark = user_membership_id
+        if self.watermark is None:
+            self.watermark = 0   # loaded, just empty
+
+    # ----- Lookups -----
+    def status(self, user_id, today=None):
+        """(name, membership type, end_date, active) for a member, or None if they hold no membership"""
+        today = today or date.today()
+        member = self.members.get(user_id)
+        if member is None or member[2] < today:
+            # Not loaded yet, or renewed on another terminal since the last refresh
+            member = self.fetch_member(user_id)
+        if member is None:
+            return None
+        return (*member, member[2] >= today)
+
+
+class CheckInWriter(threading.Thread):
+    """
+    Writes the entry log in the background. record() only queues the
+    check-in; the thread inserts what has queued up every FLUSH_INTERVAL
+    (sooner once FLUSH_BATCH are waiting) with one batched insert per
+    transaction, so a rush at the door costs a few commits, not one each.
+
+    Queued check-ins that could not be written are retried on the next
+    flush; those still queued when the process dies are lost.
+    """
+
+    def __init__(self, db, interval=FLUSH_INTERVAL, batch_size=FLUSH_BATCH):
+        super().__init__(name="check-in-writer", daemon=True)
+        self.db = db
+        self.interval = interval
+        self.batch_size = batch_size
+        db.reserve()   # flushes on its own connection
+        self._queue = []   # (user_id, checkin_time, granted)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+
+    def record(self, user_id, granted):
+        with self._lock:
+            self._queue.append((user_id, datetime.now(), 1 if granted else 0))
+            full = len(self._queue) >= self.batch_size
+        if full:
+            self._wake.set()
+
+    def run(self):
+        while not self._stopped.is_set():
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            self._flush_all()
+        self._flush_all()
+
+    def _flush_all(self):
+        try:
+            while self.flush_once() == self.batch_size:
+                pass
+        except Exception:
+            traceback.print_exc()
+
+    def flush_once(self):
+        """Write one batch of queued check-ins; returns how many were written"""
+        with self._lock:
+            batch = self._queue[:self.batch_size]
+        if not batch:
+            return 0
+        try:
+            with self.db.transaction() as cursor:
+                cursor.executemany(
+                    "INSERT INTO CheckIns (user_id, checkin_time, granted) VALUES (?, ?, ?)", batch
+                )
+        except Exception as e:
+            # Database unreachable; the batch stays queued for the next flush
+            print("Check-in log write failed:", e)
+            return 0
+        with self._lock:
+            del self._queue[:len(batch)]
+        return len(batch)
+
+    def stop(self, timeout=5):
+        """Write what is still queued and end the thread"""
+        self._stopped.set()
+        self._wake.set()
+        self.join(timeout)
@@ -0,0 +1,57 @@
+from PySide6.QtWidgets import QDialog
+from widgits.ui_checkIn import Ui_Dialog
+
+GRANTED_STYLE = "color: white; background-color: #5AB62C; border-radius: 20px; font-size: 16px;"
+DENIED_STYLE = "color: white; background-color: #FC4A4A; border-radius: 20px; font-size: 16px;"
+
+
+class CheckInDialog(QDialog):
+    """
+    Door check-in: stays open so members can be checked in one after the
+    other. Membership status comes from the shared MemberStatusCache and
+    every attempt on a known member goes to the entry log writer.
+    """
+
+    def __init__(self, parent=None, members=None, writer=None):
+        super().__init__(parent)
+        self.ui = Ui_Dialog()
+        self.ui.setupUi(self)
+        self.members = members
+        self.writer = writer
+
+        # Catch up with memberships bought since the cache was last refreshed
+        self.members.refresh()
+
+        # Connect buttons
+        self.ui.pushButton_5.clicked.connect(self.check_in)  # Check in (default button, so Enter or a scanner works)
+        self.ui.pushButton_4.clicked.connect(self.accept)    # Close
+
+    def check_in(self):
+        user_id_text = self.ui.lineEdit.text().strip()
+        self.ui.lineEdit.clear()
+        self.ui.lineEdit.setFocus()
+        if not user_id_text.isdigit():
+            self.show_result(False, "Please enter a valid User ID")
+            return
+        user_id = int(user_id_text)
+
+        try:
+            status = self.members.status(user_id)
+        except Exception as e:
+            self.show_result(False, f"Failed to check membership: {e}")
+            return
+
+        if status is None:
+            self.show_result(False, f"No membership found for user {user_id}")
+            return
+
+        name, membership, end_date, active = status
+        self.writer.record(user_id, active)
+        if active:
+            self.show_result(True, f"Welcome, {name}!\n{membership} membership till {end_date.strftime('%d:%m:%Y')}")
+        else:
+            self.show_result(False, f"{name}'s membership expired on {end_date.strftime('%d:%m:%Y')}")
+
+    def show_result(self, granted, message):
+        self.ui.label_3.setStyleSheet(GRANTED_STYLE if granted else DENIED_STYLE)
+        self.ui.label_3.setText(message)
@@ -0,0 +1,118 @@
+import uuid
+from datetime import datetime
+
+from logic.cartModel import line_total
+from logic.bookkeeping import add_incomes
+from logic.stockLedger import SALE, ADJUSTMENT, add_movements, stock_levels
+from schema import IncomeSource
+
+
+class InsufficientStock(Exception):
+    """A cart line asked for more than is in stock; nothing was sold"""
+
+    def __init__(self, shortages):
+        # shortages: [(supply_id, name, requested, available)]
+        self.shortages = shortages
+        lines = ", ".join(f"'{name}' (wanted {requested}, {available} left)"
+                          for _, name, requested, available in shortages)
+        super().__init__(f"Not enough stock for {lines}")
+
+
+def insert_income(cursor, results, income_date, source=IncomeSource.SUPPLIES):
+    """One batched insert for all lines (a single round trip with fast_executemany)"""
+    add_incomes(cursor, [(source, result["amount"], income_date) for result in results])
+
+
+def record_sale(cursor, sale_key, lines, sold_at, system_user_id=None):
+    """
+    Write the Sales header, one SaleLines row per line and the stock
+    movements taking the lines out of stock; returns the sale_id
+    """
+    # A journaled sale can sync after its cashier was deleted; it is then
+    # kept without a cashier rather than failing on the foreign key
+    cursor.execute("""
+    INSERT INTO Sales (sale_key, sale_date, total, system_user_id)
+    OUTPUT INSERTED.sale_id
+    VALUES (?, ?, ?, (SELECT system_user_id FROM SystemUsers WHERE system_user_id = ?))
+    """, (sale_key, sold_at, round(sum(line["amount"] for line in lines), 2), system_user_id))
+    sale_id = cursor.fetchone()[0]
+    cursor.executemany("""
+    INSERT INTO SaleLines (sale_id, supply_id, sale_date, quantity, unit_price, discount, amount)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    """, [
+        (sale_id, line["id"], sold_at, line["quantity"], line["price"], line["discount"], line["amount"])
+        for line in lines
+    ])
+    add_movements(cursor, [(line["id"], -line["quantity"], SALE, sale_id) for line in lines])
+    return sale_id
+
+
+def checkout(db, lines, source=IncomeSource.SUPPLIES, system_user_id=None, sale_key=None):
+    """
+    Sell cart lines in one transaction: every line's stock is checked in
+    one locking read, then the sale, its lines, their stock movements and
+    the Income rows go in as batches. If any line is short nothing is
+    written. The items stay locked until commit, so two terminals can't
+    both sell the last unit.
+
+    Returns one result per line: the line plus the amount charged and the
+    stock left afterwards. sale_key is the idempotency key; pass the one the
+    sale would be journaled under, so a sale that did commit is not applied
+    a second time when it is also journaled.
+    """
+    if not lines:
+        return []
+
+    with db.transaction() as cursor:
+        # Refusing to oversell means the check and the movement must not
+        # interleave with another sale of the same item, so those sales wait
+        # on the item's Supplies row; sales of other items never do. The
+        # daily rollup row every sale shares is updated last, so it is held
+        # only from that statement to the commit.
+        stock = stock_levels(cursor, [line["id"] for line in lines], lock=True)
+        short = [line for line in lines if stock.get(line["id"], 0) < line["quantity"]]
+        if short:
+            raise InsufficientStock([
+                (line["id"], line["name"], line["quantity"], stock.get(line["id"], 0))
+                for line in short
+            ])
+
+        results = [
+            dict(line, amount=round(line_total(line), 2), stock_left=stock[line["id"]] - line["quantity"])
+            for line in lines
+        ]
+        sold_at = datetime.now()
+        record_sale(cursor, sale_key or uuid.uuid4().hex, results, sold_at, system_user_id)
+        insert_income(cursor, results, sold_at, source)
+    return results
+
+
+def apply_journaled_sale(cursor, sale_key, lines, sold_at, source=IncomeSource.SUPPLIES, system_user_id=None):
+    """
+    Replay a sale recorded offline, inside the caller's transaction.
+
+    The sale already happened at the till, so it is never refused: a line
+    the central stock can no longer cover is sold in full and the shortfall
+    written back as an adjustment, leaving the item at zero. Those lines
+    are returned as conflicts [(supply_id, name, requested, available)].
+    Returns None if this sale_key was applied before.
+    """
+    cursor.execute("SELECT COUNT(*) FROM Sales WHERE sale_key = ?", (sale_key,))
+    if cursor.fetchone()[0]:
+        return None
+
+    # Locked like checkout(), so the conflicts reported match what was sold over
+    stock = stock_levels(cursor, [line["id"] for line in lines], lock=True)
+    conflicts = [
+        (line["id"], line["name"], line["quantity"], stock.get(line["id"], 0))
+        for line in lines if stock.get(line["id"], 0) < line["quantity"]
+    ]
+
+    # The unique sale_key makes a replay of the same sale fail instead of doubling it
+    sale_id = record_sale(cursor, sale_key, lines, sold_at, system_user_id)
+    add_movements(cursor, [
+        (supply_id, requested - max(available, 0), ADJUSTMENT, sale_id)
+        for supply_id, _, requested, available in conflicts
+    ])
+    insert_income(cursor, lines, sold_at, source)
+    return conflicts
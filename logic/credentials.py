@@ -0,0 +1,84 @@
+import base64
+import configparser
+import hashlib
+import hmac
+import os
+import sys
+
+# ----- Base path & config -----
+if getattr(sys, 'frozen', False):
+    BASE_PATH = sys._MEIPASS
+else:
+    BASE_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+config_path = os.path.join(BASE_PATH, "config.ini")
+
+# scrypt cost parameters; override in the [SECURITY] section of config.ini:
+#
+#     [SECURITY]
+#     scrypt_n = 16384
+#     scrypt_r = 8
+#     scrypt_p = 1
+#
+# Raising them only affects new and upgraded passwords; stored verifiers keep
+# the parameters they were made with and are re-hashed on the next login.
+config = configparser.ConfigParser()
+config.read(config_path)
+SCRYPT_N = config.getint("SECURITY", "scrypt_n", fallback=2 ** 14)
+SCRYPT_R = config.getint("SECURITY", "scrypt_r", fallback=8)
+SCRYPT_P = config.getint("SECURITY", "scrypt_p", fallback=1)
+
+SALT_BYTES = 16
+HASH_BYTES = 32
+PREFIX = "scrypt"
+
+
+def username_key(username):
+    """Case-normalised username used for the indexed login lookup"""
+    return username.strip().lower()
+
+
+def _b64(data):
+    return base64.b64encode(data).decode()
+
+
+def _scrypt(password, salt, n, r, p):
+    return hashlib.scrypt(
+        password.encode(), salt=salt, n=n, r=r, p=p,
+        maxmem=256 * n * r * p, dklen=HASH_BYTES
+    )
+
+
+def hash_password(password):
+    """One-way verifier: scrypt$n$r$p$salt$hash"""
+    salt = os.urandom(SALT_BYTES)
+    digest = _scrypt(password, salt, SCRYPT_N, SCRYPT_R, SCRYPT_P)
+    return f"{PREFIX}${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}${_b64(salt)}${_b64(digest)}"
+
+
+def is_verifier(stored):
+    """False for passwords still stored with the old reversible Fernet encryption"""
+    return stored.startswith(PREFIX + "$")
+
+
+def verify_password(password, stored):
+    """Constant-time check of a password against a scrypt verifier"""
+    try:
+        _, n, r, p, salt, digest = stored.split("$")
+        expected = base64.b64decode(digest)
+        actual = _scrypt(password, base64.b64decode(salt), int(n), int(r), int(p))
+    except ValueError:
+        return False
+    return hmac.compare_digest(actual, expected)
+
+
+def needs_rehash(stored):
+    """True if the verifier is legacy or was made with other cost parameters"""
+    if not is_verifier(stored):
+        return True
+    return stored.split("$")[1:4] != [str(SCRYPT_N), str(SCRYPT_R), str(SCRYPT_P)]
+
+
+# Verified against when the username is unknown, so a miss costs the same
+# as a wrong password and does not reveal which usernames exist
+DUMMY_VERIFIER = hash_password(os.urandom(16).hex())
@@ -0,0 +1,122 @@
+import numpy as np
+
+from logic.bookkeeping import EXPENSES
+from schema import IncomeSource
+
+BUCKETS = ("Day", "Week", "Month")
+
+# Headers for the rolled-up income sources (by DailyRollups.source_code), in column order
+SOURCE_HEADERS = {
+    IncomeSource.MEMBERSHIP: "Memberships",
+    IncomeSource.SUPPLIES: "Supplies",
+    IncomeSource.SESSION: "Sessions",
+    IncomeSource.TOOL_RESERVATION: "Tools",
+    IncomeSource.OTHER: "Other",
+}
+
+
+class Ledger:
+    """
+    Daily totals for a date range held as parallel NumPy arrays (one entry
+    per day and source), read once from DailyRollups and SalaryPayments.
+    bucket() then regroups them by day, week or month without going back
+    to the database or looping over rows in Python.
+    """
+
+    def __init__(self, start_date, end_date, days, sources, amounts, salary_days, salaries):
+        self.start_date = start_date
+        self.end_date = end_date
+        self.days = days           # datetime64[D]
+        self.sources = sources     # int, IncomeSource code or EXPENSES
+        self.amounts = amounts     # float64
+        self.salary_days = salary_days
+        self.salaries = salaries
+
+    @classmethod
+    def fetch(cls, db, start_date, end_date):
+        with db.cursor() as cursor:
+            cursor.execute(
+                "SELECT day, source_code, amount FROM DailyRollups WHERE day >= ? AND day <= ?",
+                (start_date, end_date)
+            )
+            rows = cursor.fetchall()
+            cursor.execute("""
+            SELECT payment_date, SUM(amount) FROM SalaryPayments
+            WHERE payment_date >= ? AND payment_date <= ?
+            GROUP BY payment_date
+            """, (start_date, end_date))
+            salary_rows = cursor.fetchall()
+
+        days, sources, amounts = zip(*rows) if rows else ((), (), ())
+        salary_days, salaries = zip(*salary_rows) if salary_rows else ((), ())
+        return cls(
+            start_date, end_date,
+            np.array(days, dtype="datetime64[D]"), np.array(sources, dtype=int),
+            np.array(amounts, dtype=float),
+            np.array(salary_days, dtype="datetime64[D]"), np.array(salaries, dtype=float),
+        )
+
+    def bucket(self, size):
+        """
+        Totals per "Day", "Week" or "Month": (period starts, column headers,
+        matrix of period x column). Columns are one per income source, then
+        Income, Expenses, Salaries (already part of Expenses) and Profit.
+        Periods without any entry are kept as rows of zeros so the range
+        reads continuously.
+        """
+        periods = _periods(self.start_date, self.end_date, size)
+
+        present, source_index = np.unique(self.sources, return_inverse=True)
+        order = list(SOURCE_HEADERS)
+        income_sources = sorted(
+            (s for s in present.tolist() if s != EXPENSES),
+            key=lambda s: (order.index(s) if s in order else len(order), s)
+        )
+        columns = income_sources + [EXPENSES]
+
+        totals = np.zeros((len(periods), len(columns) + 1))
+        if self.days.size:
+            rows = np.searchsorted(periods, _bucket_starts(self.days, size))
+            # Column of each distinct source, then of each entry through its source index
+            cols = np.array([columns.index(s) for s in present.tolist()], dtype=np.intp)[source_index]
+            np.add.at(totals, (rows, cols), self.amounts)
+        if self.salary_days.size:
+            rows = np.searchsorted(periods, _bucket_starts(self.salary_days, size))
+            np.add.at(totals[:, -1], rows, self.salaries)
+
+        income = totals[:, :len(income_sources)].sum(axis=1)
+        expenses = totals[:, len(income_sources)]
+        matrix = np.column_stack([
+            totals[:, :len(income_sources)], income, expenses, totals[:, -1], income - expenses
+        ])
+        headers = [SOURCE_HEADERS.get(s, f"Source {s}") for s in income_sources] + [
+            "Income", "Expenses", "Salaries", "Profit"
+        ]
+        return periods, headers, matrix
+
+
+def _bucket_starts(days, size):
+    """First day of the day/week (Monday)/month bucket each day falls in"""
+    if size == "Month":
+        return days.astype("datetime64[M]").astype("datetime64[D]")
+    if size == "Week":
+        # Day 0 of datetime64 (1970-01-01) was a Thursday, so (day + 3) % 7 counts days since Monday
+        return days - (days.astype(np.int64) + 3) % 7
+    return days
+
+
+def _periods(start_date, end_date, size):
+    """Start of every bucket from the one holding start_date to the one holding end_date"""
+    first, last = _bucket_starts(np.array([start_date, end_date], dtype="datetime64[D]"), size)
+    if size == "Month":
+        return np.arange(first.astype("datetime64[M]"), last.astype("datetime64[M]") + 1).astype("datetime64[D]")
+    return np.arange(first, last + 1, 7 if size == "Week" else 1)
+
+
+def period_label(start, size):
+    day = start.astype(object)
+    if size == "Month":
+        return day.strftime("%b %Y")
+    if size == "Week":
+        return f"Week of {day:%Y-%m-%d}"
+    return f"{day:%Y-%m-%d}"
@@ -0,0 +1,80 @@
+from PySide6.QtWidgets import QDialog, QMessageBox, QTableView, QHeaderView
+from PySide6.QtCore import QDate
+from widgits.ui_dashboard import Ui_Dialog
+from widgits.table_models import RowTableModel, Column, money
+from logic.queryExecutor import QueryExecutor
+from logic.dashboard import BUCKETS, Ledger, period_label
+
+
+class FinanceDashboardDialog(QDialog):
+    """
+    Income by source, expenses, salaries and profit over any date range,
+    grouped by day, week or month. The range is read once (in the
+    background); switching the grouping only regroups what was read.
+    """
+    QUERY_KEY = "dashboard"
+
+    def __init__(self, parent=None, db=None):
+        super().__init__(parent)
+        self.ui = Ui_Dialog()
+        self.ui.setupUi(self)
+        self.db = db
+        self.executor = QueryExecutor.for_db(db)
+        self.ledger = None
+
+        # Default range: the last twelve months, by month
+        today = QDate.currentDate()
+        self.ui.dateEdit.setDate(today.addYears(-1).addDays(1))
+        self.ui.dateEdit_2.setDate(today)
+        self.ui.comboBox.addItems(BUCKETS)
+        self.ui.comboBox.setCurrentText("Month")
+
+        self.table = self.ui.tableView
+        self.table.setSelectionBehavior(QTableView.SelectRows)
+        self.table.setAlternatingRowColors(True)
+
+        # Connect buttons
+        self.ui.pushButton_5.clicked.connect(self.load_range)  # Show
+        self.ui.pushButton_4.clicked.connect(self.reject)      # Close
+        self.ui.comboBox.currentIndexChanged.connect(self.show_ledger)
+
+        self.load_range()
+
+    def load_range(self):
+        start_date = self.ui.dateEdit.date().toPython()
+        end_date = self.ui.dateEdit_2.date().toPython()
+        if start_date > end_date:
+            QMessageBox.warning(self, "Validation Error", "The start date must not be after the end date")
+            return
+
+        self.executor.submit_call(
+            self.QUERY_KEY, lambda: Ledger.fetch(self.db, start_date, end_date),
+            on_result=self.set_ledger,
+            on_error=lambda e: QMessageBox.critical(self, "Error", f"Failed to load the dashboard: {e}"),
+            busy_widget=self.table
+        )
+
+    def set_ledger(self, ledger):
+        self.ledger = ledger
+        self.show_ledger()
+
+    def show_ledger(self):
+        if self.ledger is None:
+            return
+        size = self.ui.comboBox.currentText()
+        periods, headers, matrix = self.ledger.bucket(size)
+
+        columns = [Column("Period", 0)] + [Column(header, i + 1, money) for i, header in enumerate(headers)]
+        rows = [(period_label(period, size), *values) for period, values in zip(periods, matrix.tolist())]
+        model = RowTableModel(columns, parent=self.table)
+        model.set_rows(rows)
+        self.table.setModel(model)
+        header = self.table.horizontalHeader()
+        for i in range(model.columnCount()):
+            header.setSectionResizeMode(i, QHeaderView.Stretch)
+
+        totals = dict(zip(headers, matrix.sum(axis=0).tolist()))
+        self.ui.label_4.setText(
+            f"Income: ${totals['Income']:.2f}   Expenses: ${totals['Expenses']:.2f}   "
+            f"Salaries: ${totals['Salaries']:.2f}   Profit: ${totals['Profit']:.2f}"
+        )
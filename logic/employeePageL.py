@@ -1,14 +1,22 @@
-from PySide6.QtWidgets import QWidget, QTableWidget, QTableWidgetItem, QPushButton, QMessageBox, QHeaderView
-from PySide6.QtCore import Qt, QDate
+from PySide6.QtWidgets import QWidget, QTableView, QMessageBox, QHeaderView
+from PySide6.QtCore import QDate
+from logic.queryExecutor import QueryExecutor
+from logic.bookkeeping import add_expense
+from widgits.delegates import ButtonDelegate
+from widgits.table_models import RowTableModel, Column, money
 
 class EmployeesPage:
+    QUERY_KEY = "employees"
+    TABLES = ("Employees", "SystemUsers")
+
     def __init__(self, ui, db, current_system_user_id):
         self.ui = ui
         self.db = db
+        self.executor = QueryExecutor.for_db(db)
         self.current_system_user_id = current_system_user_id
 
         self.ui.lineEdit_2.setPlaceholderText("Search by Employee ID")
-        self.table = self.ui.employee.findChild(QTableWidget, "tableWidget_4")
+        self.table = self.ui.employee.findChild(QTableView, "tableWidget_4")
 
         self.setup_table()
         self.load_employees()
@@ -16,81 +24,61 @@ class EmployeesPage:
         self.ui.pushButton_15.clicked.connect(self.search_employee_by_id)
 
     def setup_table(self):
-        headers = ["ID", "Name", "Phone", "Salary", "Role", "Username", "Action", "Pay Employee"]
-        self.table.setColumnCount(len(headers))
-        self.table.setHorizontalHeaderLabels(headers)
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.table.setSelectionMode(QTableWidget.SingleSelection)
+        self.model = RowTableModel([
+            Column("ID", 0),
+            Column("Name", 1),
+            Column("Phone", 2),
+            Column("Salary", 3, money),
+            Column("Role", 4),
+            Column("Username", 5),
+            # Delete only for employees with a system user
+            Column("Action", 6, lambda system_user_id: "Delete" if system_user_id else ""),
+            Column("Pay Employee", (), lambda: "Pay"),
+        ], parent=self.table)
+        self.table.setModel(self.model)
+        self.table.setSelectionBehavior(QTableView.SelectRows)
+        self.table.setSelectionMode(QTableView.SingleSelection)
         self.table.setAlternatingRowColors(True)
 
         header = self.table.horizontalHeader()
-        for i in range(len(headers)):
+        for i in range(self.model.columnCount()):
             header.setSectionResizeMode(i, QHeaderView.Stretch)
 
+        # Buttons are painted by delegates instead of one QPushButton per row
+        self.delete_delegate = ButtonDelegate(self.table)
+        self.delete_delegate.clicked.connect(
+            lambda row: self.delete_system_user(self.model.row(row)[6])
+        )
+        self.table.setItemDelegateForColumn(6, self.delete_delegate)
+
+        self.pay_delegate = ButtonDelegate(self.table)
+        self.pay_delegate.clicked.connect(
+            lambda row: self.pay_employee(*self.model.row(row)[:2])
+        )
+        self.table.setItemDelegateForColumn(7, self.pay_delegate)
+
     def load_employees(self):
-        try:
-            query = """
-                SELECT e.employee_id, e.name, e.phone, e.salary, su.role, su.username, su.system_user_id
-                FROM Employees e
-                LEFT JOIN SystemUsers su ON e.employee_id = su.employee_id
-                ORDER BY e.employee_id DESC
-            """
-            self.db.cursor.execute(query)
-            employees = self.db.cursor.fetchall()
-            self.populate_table(employees)
-        except Exception as e:
-            QMessageBox.critical(None, "Error", f"Failed to load employees: {str(e)}")
+        query = """
+            SELECT e.employee_id, e.name, e.phone, e.salary, su.role, su.username, su.system_user_id
+            FROM Employees e
+            LEFT JOIN SystemUsers su ON e.employee_id = su.employee_id
+            ORDER BY e.employee_id DESC
+        """
+        self.executor.submit(
+            self.QUERY_KEY, query,
+            on_result=self.populate_table,
+            on_error=lambda e: QMessageBox.critical(None, "Error", f"Failed to load employees: {e}"),
+            busy_widget=self.table
+        )
 
     def populate_table(self, employees):
-        self.table.setRowCount(0)
-        for row_num, emp in enumerate(employees):
-            self.table.insertRow(row_num)
-            emp_id, name, phone, salary, role, username, system_user_id = emp
-
-            # Basic info columns
-            for col_num, value in enumerate([emp_id, name, phone, salary]):
-                if col_num == 3 and value is not None:
-                    value = f"${value:.2f}"
-                item = QTableWidgetItem(str(value) if value is not None else "")
-                item.setTextAlignment(Qt.AlignCenter)
-                item.setFlags(item.flags() & ~Qt.ItemIsEditable)
-                self.table.setItem(row_num, col_num, item)
-
-            # Role
-            role_item = QTableWidgetItem(role if role else "")
-            role_item.setTextAlignment(Qt.AlignCenter)
-            role_item.setFlags(role_item.flags() & ~Qt.ItemIsEditable)
-            self.table.setItem(row_num, 4, role_item)
-
-            # Username
-            username_item = QTableWidgetItem(username if username else "")
-            username_item.setTextAlignment(Qt.AlignCenter)
-            username_item.setFlags(username_item.flags() & ~Qt.ItemIsEditable)
-            self.table.setItem(row_num, 5, username_item)
-
-            # Delete button
-            if system_user_id:
-                btn_delete = QPushButton("Delete")
-                btn_delete.clicked.connect(
-                    lambda checked, su_id=system_user_id: self.delete_system_user(su_id)
-                )
-                self.table.setCellWidget(row_num, 6, btn_delete)
-            else:
-                self.table.setItem(row_num, 6, QTableWidgetItem(""))
-
-            # Pay button
-            btn_pay = QPushButton("Pay")
-            btn_pay.clicked.connect(
-                lambda checked, e_id=emp_id, e_name=name, btn=btn_pay: self.pay_employee(e_id, e_name, btn)
-            )
-            self.table.setCellWidget(row_num, 7, btn_pay)
+        self.model.set_rows(employees)
 
-    def pay_employee(self, employee_id, employee_name, btn_pay):
+    def pay_employee(self, employee_id, employee_name):
         try:
-            self.db.cursor.execute(
+            result = self.db.fetchone(
                 "SELECT salary FROM Employees WHERE employee_id = ?", (employee_id,)
             )
-            result = self.db.cursor.fetchone()
             if not result:
                 QMessageBox.warning(None, "Error", f"No salary found for {employee_name}.")
                 return
@@ -100,18 +88,15 @@ class EmployeesPage:
                 QMessageBox.warning(None, "Error", f"Invalid salary amount for {employee_name}.")
                 return
 
-            self.db.cursor.execute(
-                "INSERT INTO SalaryPayments (employee_id, amount, payment_date) VALUES (?, ?, ?)",
-                (employee_id, salary_amount, QDate.currentDate().toString("yyyy-MM-dd"))
-            )
-            self.db.cursor.execute(
-                "INSERT INTO Expenses (description, amount, expense_date) VALUES (?, ?, ?)",
-                (f"Salary Payment: {employee_name}", salary_amount, QDate.currentDate().toString("yyyy-MM-dd"))
-            )
-            self.db.connection.commit()
+            with self.db.transaction() as cursor:
+                cursor.execute(
+                    "INSERT INTO SalaryPayments (employee_id, amount, payment_date) VALUES (?, ?, ?)",
+                    (employee_id, salary_amount, QDate.currentDate().toString("yyyy-MM-dd"))
+                )
+                add_expense(cursor, f"Salary Payment: {employee_name}", salary_amount,
+                            QDate.currentDate().toString("yyyy-MM-dd"))
             QMessageBox.information(None, "Success", f"Paid {employee_name} ${salary_amount:.2f} successfully!")
         except Exception as e:
-            self.db.connection.rollback()
             QMessageBox.critical(None, "Error", f"Failed to pay employee: {str(e)}")
 
     def delete_system_user(self, system_user_id):
@@ -129,21 +114,23 @@ class EmployeesPage:
             return
 
         try:
-            # Delete dependent records in other tables if necessary
-            # Example: SystemUserLogins
-            self.db.cursor.execute(
-                "DELETE FROM SystemUserLogins WHERE system_user_id = ?", (system_user_id,)
-            )
+            with self.db.transaction() as cursor:
+                # Delete dependent records in other tables if necessary
+                # Example: SystemUserLogins
+                cursor.execute(
+                    "DELETE FROM SystemUserLogins WHERE system_user_id = ?", (system_user_id,)
+                )
+                # Their sales stay in the books, just no longer credited to anyone
+                cursor.execute(
+                    "UPDATE Sales SET system_user_id = NULL WHERE system_user_id = ?", (system_user_id,)
+                )
 
-            # Delete the system user only
-            self.db.cursor.execute(
-                "DELETE FROM SystemUsers WHERE system_user_id = ?", (system_user_id,)
-            )
-            self.db.connection.commit()
+                # Delete the system user only
+                cursor.execute(
+                    "DELETE FROM SystemUsers WHERE system_user_id = ?", (system_user_id,)
+                )
             QMessageBox.information(None, "Deleted", "System user deleted successfully.")
-            self.load_employees()
         except Exception as e:
-            self.db.connection.rollback()
             QMessageBox.critical(None, "Error", f"Failed to delete system user: {str(e)}")
 
     def refresh(self):
@@ -158,19 +145,22 @@ class EmployeesPage:
             QMessageBox.warning(None, "Invalid Input", "Please enter a valid numeric Employee ID.")
             return
 
-        try:
-            query = """
-                SELECT e.employee_id, e.name, e.phone, e.salary, su.role, su.username, su.system_user_id
-                FROM Employees e
-                LEFT JOIN SystemUsers su ON e.employee_id = su.employee_id
-                WHERE e.employee_id = ?
-            """
-            self.db.cursor.execute(query, (int(employee_id),))
-            employees = self.db.cursor.fetchall()
-            if employees:
-                self.populate_table(employees)
-            else:
-                QMessageBox.information(None, "Not Found", f"No employee found with ID {employee_id}.")
-                self.table.setRowCount(0)
-        except Exception as e:
-            QMessageBox.critical(None, "Error", f"Failed to search employee: {str(e)}")
+        query = """
+            SELECT e.employee_id, e.name, e.phone, e.salary, su.role, su.username, su.system_user_id
+            FROM Employees e
+            LEFT JOIN SystemUsers su ON e.employee_id = su.employee_id
+            WHERE e.employee_id = ?
+        """
+        self.executor.submit(
+            self.QUERY_KEY, query, (int(employee_id),),
+            on_result=lambda employees: self.show_search_results(employees, employee_id),
+            on_error=lambda e: QMessageBox.critical(None, "Error", f"Failed to search employee: {e}"),
+            busy_widget=self.table
+        )
+
+    def show_search_results(self, employees, employee_id):
+        if employees:
+            self.populate_table(employees)
+        else:
+            QMessageBox.information(None, "Not Found", f"No employee found with ID {employee_id}.")
+            self.model.clear()
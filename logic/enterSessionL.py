@@ -2,6 +2,8 @@ from PySide6.QtWidgets import QDialog, QMessageBox
 from PySide6.QtCore import QDate, Qt
 from widgits.ui_enterSession import Ui_Dialog  # Replace with your actual UI
 from datetime import datetime
+from logic.bookkeeping import add_income
+from schema import IncomeSource
 
 class JoinSessionDialog(QDialog):
     def __init__(self, parent=None, db=None):
@@ -28,8 +30,7 @@ class JoinSessionDialog(QDialog):
                 FROM WorkoutSessions
                 ORDER BY session_date, start_time
             """
-            self.db.cursor.execute(query)
-            sessions = self.db.cursor.fetchall()
+            sessions = self.db.fetchall(query)
 
             self.sessions = {}  # Dictionary to store session info
             self.ui.comboBox.clear()
@@ -78,8 +79,7 @@ class JoinSessionDialog(QDialog):
         user_id = int(user_id_text)
 
         # Check if user exists
-        self.db.cursor.execute("SELECT COUNT(*) FROM Users WHERE user_id = ?", (user_id,))
-        if self.db.cursor.fetchone()[0] == 0:
+        if self.db.fetchone("SELECT COUNT(*) FROM Users WHERE user_id = ?", (user_id,))[0] == 0:
             QMessageBox.warning(self, "Validation Error", "User does not exist")
             self.ui.lineEdit.setFocus()
             return None
@@ -102,21 +102,16 @@ class JoinSessionDialog(QDialog):
             session_info = self.sessions.get(data["session_id"])
             fee = session_info["fee"] if session_info else 0.0
 
-            # Insert into UserWorkoutSessions
-            query = """
-                INSERT INTO UserWorkoutSessions (user_id, session_id)
-                VALUES (?, ?)
-            """
-            self.db.cursor.execute(query, (data["user_id"], data["session_id"]))
-            self.db.connection.commit()
+            with self.db.transaction() as cursor:
+                # Insert into UserWorkoutSessions
+                query = """
+                    INSERT INTO UserWorkoutSessions (user_id, session_id, modified_at)
+                    VALUES (?, ?, GETDATE())
+                """
+                cursor.execute(query, (data["user_id"], data["session_id"]))
 
-            # Insert into Income
-            insert_income = """
-                INSERT INTO Income (source, amount, income_date)
-                VALUES (?, ?, ?)
-            """
-            self.db.cursor.execute(insert_income, ("joinedSession", fee, datetime.now()))
-            self.db.connection.commit()
+                # Insert into Income
+                add_income(cursor, IncomeSource.SESSION, fee, datetime.now())
 
             QMessageBox.information(self, "Success", "User successfully joined the session!")
             self.accept()
@@ -1,16 +1,23 @@
-from PySide6.QtWidgets import QWidget, QTableWidget, QTableWidgetItem, QMessageBox, QHeaderView
-from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QWidget, QTableView, QMessageBox, QHeaderView
+from logic.queryExecutor import QueryExecutor
+from logic.ledgerDelta import LedgerDelta
+from widgits.table_models import RowTableModel, Column, money
 
 class ExpensesPage:
+    QUERY_KEY = "expenses"
+    TABLES = ("Expenses",)
+    COLUMNS = "expense_id, description, amount, expense_date"
+
     def __init__(self, ui, db):
         self.ui = ui
         self.db = db
+        self.executor = QueryExecutor.for_db(db)
 
         # Set placeholder for search input
         self.ui.lineEdit_2.setPlaceholderText("Search by Expense ID")
 
         # Find the table in the expenses page
-        self.table = self.ui.expenses.findChild(QTableWidget, "tableWidget_3")
+        self.table = self.ui.expenses.findChild(QTableView, "tableWidget_3")
         self.setup_table()
         self.load_expenses()
 
@@ -18,48 +25,67 @@ class ExpensesPage:
         self.ui.pushButton_13.clicked.connect(self.search_expense_by_id)  # Adjust to your search button
 
     def setup_table(self):
-        headers = ["ID", "Description", "Amount", "Date"]
-        self.table.setColumnCount(len(headers))
-        self.table.setHorizontalHeaderLabels(headers)
+        self.model = RowTableModel([
+            Column("ID", 0),
+            Column("Description", 1),
+            Column("Amount", 2, money),
+            Column("Date", 3),
+        ], parent=self.table)
+        self.table.setModel(self.model)
+        self.delta = LedgerDelta(self.db, self.model, "Expenses", "expense_id", self.COLUMNS, "Expenses",
+                                 cache=self.executor.cache)
 
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.table.setSelectionMode(QTableWidget.SingleSelection)
+        self.table.setSelectionBehavior(QTableView.SelectRows)
+        self.table.setSelectionMode(QTableView.SingleSelection)
         self.table.setAlternatingRowColors(True)
 
         header = self.table.horizontalHeader()
-        for i in range(len(headers)):
+        for i in range(self.model.columnCount()):
             header.setSectionResizeMode(i, QHeaderView.Stretch)
 
     def load_expenses(self):
-        """Load all expenses from the database"""
-        try:
-            query = """
-            SELECT expense_id, description, amount, expense_date
-            FROM Expenses
-            ORDER BY expense_id DESC
-            """
-            self.db.cursor.execute(query)
-            expenses = self.db.cursor.fetchall()
-            self.populate_table(expenses)
-        except Exception as e:
-            QMessageBox.critical(None, "Error", f"Failed to load expenses: {str(e)}")
+        """Load all expenses from the database in the background"""
+        self.delta.start_load()
+        query = f"""
+        SELECT {self.COLUMNS}
+        FROM Expenses
+        ORDER BY expense_id DESC
+        """
+        self.executor.submit(
+            self.QUERY_KEY, query,
+            on_result=self.show_all,
+            on_error=lambda e: QMessageBox.critical(None, "Error", f"Failed to load expenses: {e}"),
+            busy_widget=self.table
+        )
 
     def populate_table(self, expenses):
         """Fill the table with the given data"""
-        self.table.setRowCount(0)
-        for row_num, expense in enumerate(expenses):
-            self.table.insertRow(row_num)
-            for col_num, value in enumerate(expense):
-                if col_num == 2 and value is not None:  # Amount formatting
-                    value = f"${value:.2f}"
-                item = QTableWidgetItem(str(value) if value is not None else "")
-                item.setTextAlignment(Qt.AlignCenter)
-                item.setFlags(item.flags() & ~Qt.ItemIsEditable)  # Read-only
-                self.table.setItem(row_num, col_num, item)
+        self.model.set_rows(expenses)
+
+    def show_all(self, expenses):
+        self.populate_table(expenses)
+        self.delta.loaded()
 
     def refresh(self):
-        """Reload all expenses"""
-        self.load_expenses()
+        """Fetch only expenses added since the last load; reload if any were deleted"""
+        if self.delta.is_current():
+            return   # nothing written to the table since the last look
+        fetch = self.delta.fetch_call()
+        if fetch is None:
+            self.load_expenses()
+            return
+        self.executor.submit_call(
+            self.QUERY_KEY, fetch,
+            on_result=self.apply_delta,
+            on_error=lambda e: QMessageBox.critical(None, "Error", f"Failed to load expenses: {e}")
+        )
+
+    def apply_delta(self, expenses):
+        if expenses is None:
+            self.load_expenses()
+        else:
+            self.model.prepend_rows(expenses)
+            self.delta.loaded()
 
     def search_expense_by_id(self):
         """Search expense by expense_id from lineEdit_2"""
@@ -73,19 +99,22 @@ class ExpensesPage:
             QMessageBox.warning(None, "Invalid Input", "Please enter a valid numeric Expense ID.")
             return
 
-        try:
-            query = """
-            SELECT expense_id, description, amount, expense_date
-            FROM Expenses
-            WHERE expense_id = ?
-            """
-            self.db.cursor.execute(query, (int(expense_id),))
-            expenses = self.db.cursor.fetchall()
-
-            if expenses:
-                self.populate_table(expenses)
-            else:
-                QMessageBox.information(None, "Not Found", f"No expense found with ID {expense_id}.")
-                self.table.setRowCount(0)
-        except Exception as e:
-            QMessageBox.critical(None, "Error", f"Failed to search expense: {str(e)}")
+        query = f"""
+        SELECT {self.COLUMNS}
+        FROM Expenses
+        WHERE expense_id = ?
+        """
+        self.executor.submit(
+            self.QUERY_KEY, query, (int(expense_id),),
+            on_result=lambda expenses: self.show_search_results(expenses, expense_id),
+            on_error=lambda e: QMessageBox.critical(None, "Error", f"Failed to search expense: {e}"),
+            busy_widget=self.table
+        )
+
+    def show_search_results(self, expenses, expense_id):
+        self.delta.stop()   # the next refresh reloads the full listing
+        if expenses:
+            self.populate_table(expenses)
+        else:
+            QMessageBox.information(None, "Not Found", f"No expense found with ID {expense_id}.")
+            self.model.clear()
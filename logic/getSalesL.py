@@ -1,6 +1,8 @@
 from PySide6.QtWidgets import QDialog, QMessageBox
-from PySide6.QtCore import QDate, QTime, QDateTime
+from datetime import date, timedelta
 from widgits.ui_salesReport import Ui_Dialog
+from logic.bookkeeping import summarize, EXPENSES
+from schema import IncomeSource
 
 class SalesSummaryDialog(QDialog):
     def __init__(self, parent=None, db=None):
@@ -17,51 +19,27 @@ class SalesSummaryDialog(QDialog):
 
     def update_last_30_days_summary(self):
         try:
-            # Rolling last 30 days
-            today = QDate.currentDate()
-            start_date = today.addDays(-30)
-            end_date = today
+            # Rolling last 30 days, read from the daily rollups in one grouped query
+            end_date = date.today()
+            start_date = end_date - timedelta(days=30)
+            totals = summarize(self.db, start_date, end_date)
 
-            start_datetime = QDateTime(start_date, QTime(0, 0, 0))
-            end_datetime = QDateTime(end_date, QTime(23, 59, 59))
-            start_str = start_datetime.toString("yyyy-MM-dd HH:mm:ss")
-            end_str = end_datetime.toString("yyyy-MM-dd HH:mm:ss")
-
-            # Define income sources and corresponding labels
+            # Income sources and their labels
             sources = {
-                'membership': self.ui.label_7,
-                'supplies': self.ui.label_8,
-                'joinedSession': self.ui.label_9,
-                'ToolRS': self.ui.label_10
+                IncomeSource.MEMBERSHIP: self.ui.label_7,
+                IncomeSource.SUPPLIES: self.ui.label_8,
+                IncomeSource.SESSION: self.ui.label_9,
+                IncomeSource.TOOL_RESERVATION: self.ui.label_10
             }
-
-            # Fetch totals for each income source
             for source, label in sources.items():
-                query = """
-                    SELECT SUM(amount)
-                    FROM Income
-                    WHERE source = ? AND income_date >= ? AND income_date <= ?
-                """
-                self.db.cursor.execute(query, (source, start_str, end_str))
-                total = self.db.cursor.fetchone()[0] or 0
-                label.setText(f"${float(total):.2f}")
+                label.setText(f"${float(totals.get(source, 0)):.2f}")
 
-            # Fetch total expenses
-            query_exp = """
-                SELECT SUM(amount)
-                FROM Expenses
-                WHERE expense_date >= ? AND expense_date <= ?
-            """
-            self.db.cursor.execute(query_exp, (start_str, end_str))
-            expenses_total = self.db.cursor.fetchone()[0] or 0
-            self.ui.label_11.setText(f"${float(expenses_total):.2f}")
+            expenses_total = float(totals.get(EXPENSES, 0))
+            self.ui.label_11.setText(f"${expenses_total:.2f}")
 
-            # Calculate total profit: sum of all incomes - expenses
-            income_total = sum(
-                float(label.text().replace('$', ''))
-                for label in [self.ui.label_7, self.ui.label_8, self.ui.label_9, self.ui.label_10]
-            )
-            total_profit = income_total - float(expenses_total)
+            # Calculate total profit: sum of all incomes (including OTHER) - expenses
+            income_total = sum(float(total) for source, total in totals.items() if source != EXPENSES)
+            total_profit = income_total - expenses_total
             self.ui.label_13.setText(f"${total_profit:.2f}")
 
         except Exception as e:
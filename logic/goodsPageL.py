@@ -1,62 +1,67 @@
-from PySide6.QtWidgets import QWidget, QTableWidget, QTableWidgetItem, QMessageBox, QHeaderView
-from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QWidget, QTableView, QMessageBox, QHeaderView
+from logic.queryExecutor import QueryExecutor
+from widgits.table_models import RowTableModel, Column, money
+from logic.stockLedger import STOCK
 
 class GoodsPage:
+    QUERY_KEY = "goods"
+    TABLES = ("Supplies", "Suppliers", "StockMovements")
+
     def __init__(self, ui, db):
         self.ui = ui
         self.db = db
+        self.executor = QueryExecutor.for_db(db)
 
         # Set placeholder for search input
         self.ui.lineEdit_2.setPlaceholderText("Search by Goods ID")
 
         # Find the table in the goods page
-        self.table = self.ui.goods.findChild(QTableWidget, "tableWidget_2")
+        self.table = self.ui.goods.findChild(QTableView, "tableWidget_2")
         self.setup_table()
         self.load_goods()
 
         # Connect search button
         self.ui.pushButton_9.clicked.connect(self.search_goods_by_id)
 
+        # Double-clicking a good shows its stock movements
+        self.table.doubleClicked.connect(self.show_stock_history)
+
     def setup_table(self):
-        headers = ["ID", "Supplier Name", "Item Name", "Quantity", "Price"]
-        self.table.setColumnCount(len(headers))
-        self.table.setHorizontalHeaderLabels(headers)
+        self.model = RowTableModel([
+            Column("ID", 0),
+            Column("Supplier Name", 1),
+            Column("Item Name", 2),
+            Column("Quantity", 3),
+            Column("Price", 4, money),
+        ], parent=self.table)
+        self.table.setModel(self.model)
 
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.table.setSelectionMode(QTableWidget.SingleSelection)
+        self.table.setSelectionBehavior(QTableView.SelectRows)
+        self.table.setSelectionMode(QTableView.SingleSelection)
         self.table.setAlternatingRowColors(True)
 
         header = self.table.horizontalHeader()
-        for i in range(len(headers)):
+        for i in range(self.model.columnCount()):
             header.setSectionResizeMode(i, QHeaderView.Stretch)
 
     def load_goods(self):
-        """Load all goods from the database"""
-        try:
-            query = """
-            SELECT s.supply_id, sup.name as supplier_name, s.item_name, s.quantity, s.price 
-            FROM Supplies s
-            JOIN Suppliers sup ON s.supplier_id = sup.supplier_id
-            ORDER BY s.supply_id DESC
-            """
-            self.db.cursor.execute(query)
-            goods = self.db.cursor.fetchall()
-            self.populate_table(goods)
-        except Exception as e:
-            QMessageBox.critical(None, "Error", f"Failed to load goods: {str(e)}")
+        """Load all goods from the database in the background"""
+        query = f"""
+        SELECT s.supply_id, sup.name as supplier_name, s.item_name, {STOCK} AS quantity, s.price
+        FROM Supplies s
+        JOIN Suppliers sup ON s.supplier_id = sup.supplier_id
+        ORDER BY s.supply_id DESC
+        """
+        self.executor.submit(
+            self.QUERY_KEY, query,
+            on_result=self.populate_table,
+            on_error=lambda e: QMessageBox.critical(None, "Error", f"Failed to load goods: {e}"),
+            busy_widget=self.table
+        )
 
     def populate_table(self, goods):
         """Fill the table with the given data"""
-        self.table.setRowCount(0)
-        for row_num, good in enumerate(goods):
-            self.table.insertRow(row_num)
-            for col_num, value in enumerate(good):
-                if col_num == 4 and value is not None:  # Price formatting
-                    value = f"${value:.2f}"
-                item = QTableWidgetItem(str(value) if value is not None else "")
-                item.setTextAlignment(Qt.AlignCenter)
-                item.setFlags(item.flags() & ~Qt.ItemIsEditable)  # Read-only
-                self.table.setItem(row_num, col_num, item)
+        self.model.set_rows(goods)
 
     def refresh(self):
         """Reload all goods"""
@@ -74,20 +79,28 @@ class GoodsPage:
             QMessageBox.warning(None, "Invalid Input", "Please enter a valid numeric Goods ID.")
             return
 
-        try:
-            query = """
-            SELECT s.supply_id, sup.name as supplier_name, s.item_name, s.quantity, s.price 
-            FROM Supplies s
-            JOIN Suppliers sup ON s.supplier_id = sup.supplier_id
-            WHERE s.supply_id = ?
-            """
-            self.db.cursor.execute(query, (int(supply_id),))
-            goods = self.db.cursor.fetchall()
-
-            if goods:
-                self.populate_table(goods)
-            else:
-                QMessageBox.information(None, "Not Found", f"No goods found with ID {supply_id}.")
-                self.table.setRowCount(0)
-        except Exception as e:
-            QMessageBox.critical(None, "Error", f"Failed to search goods: {str(e)}")
+        query = f"""
+        SELECT s.supply_id, sup.name as supplier_name, s.item_name, {STOCK} AS quantity, s.price
+        FROM Supplies s
+        JOIN Suppliers sup ON s.supplier_id = sup.supplier_id
+        WHERE s.supply_id = ?
+        """
+        self.executor.submit(
+            self.QUERY_KEY, query, (int(supply_id),),
+            on_result=lambda goods: self.show_search_results(goods, supply_id),
+            on_error=lambda e: QMessageBox.critical(None, "Error", f"Failed to search goods: {e}"),
+            busy_widget=self.table
+        )
+
+    def show_search_results(self, goods, supply_id):
+        if goods:
+            self.populate_table(goods)
+        else:
+            QMessageBox.information(None, "Not Found", f"No goods found with ID {supply_id}.")
+            self.model.clear()
+
+    def show_stock_history(self, index):
+        from logic.stockHistoryL import StockHistoryDialog
+        supply_id, _, item_name = self.model.row(index.row())[:3]
+        dialog = StockHistoryDialog(None, self.db, supply_id, item_name)
+        dialog.exec()
@@ -0,0 +1,34 @@
+from datetime import datetime, time, timedelta
+
+from logic.stockLedger import STOCK
+
+TOP_N = 20   # items listed as top sellers and as slow movers
+
+# Every item with what it sold in the range. The inner aggregate is a seek
+# on IX_SaleLines_DateSupply, which holds every column it reads.
+QUERY = f"""
+SELECT s.supply_id, s.item_name, {STOCK}, COALESCE(t.units, 0), COALESCE(t.revenue, 0)
+FROM Supplies s
+LEFT JOIN (
+    SELECT supply_id, SUM(quantity) AS units, SUM(amount) AS revenue
+    FROM SaleLines
+    WHERE sale_date >= ? AND sale_date < ?
+    GROUP BY supply_id
+) t ON t.supply_id = s.supply_id
+"""
+
+
+def item_sales(db, start_date, end_date, top_n=TOP_N):
+    """
+    (top sellers, slow movers) for sales from start_date to end_date, both
+    days included. Rows are (supply_id, item_name, in stock, units sold,
+    revenue). Top sellers are the items that sold most units; slow movers
+    are items still in stock that sold the fewest, largest stock first.
+    """
+    rows = db.fetchall(QUERY, (
+        datetime.combine(start_date, time.min),
+        datetime.combine(end_date + timedelta(days=1), time.min),
+    ))
+    top = sorted((row for row in rows if row[3] > 0), key=lambda row: (-row[3], -row[4]))[:top_n]
+    slow = sorted((row for row in rows if row[2] > 0), key=lambda row: (row[3], -row[2]))[:top_n]
+    return top, slow
@@ -0,0 +1,69 @@
+from PySide6.QtWidgets import QDialog, QMessageBox, QTableView, QHeaderView
+from PySide6.QtCore import QDate
+from widgits.ui_itemSales import Ui_Dialog
+from widgits.table_models import RowTableModel, Column, money
+from logic.queryExecutor import QueryExecutor
+from logic.itemSales import item_sales
+
+
+class ItemSalesDialog(QDialog):
+    """Top sellers and slow movers at the sale point over a date range"""
+    QUERY_KEY = "item_sales"
+
+    COLUMNS = [
+        Column("ID", 0),
+        Column("Item", 1),
+        Column("In Stock", 2),
+        Column("Units Sold", 3),
+        Column("Revenue", 4, money),
+    ]
+
+    def __init__(self, parent=None, db=None):
+        super().__init__(parent)
+        self.ui = Ui_Dialog()
+        self.ui.setupUi(self)
+        self.db = db
+        self.executor = QueryExecutor.for_db(db)
+
+        # Default range: the last seven days
+        today = QDate.currentDate()
+        self.ui.dateEdit.setDate(today.addDays(-6))
+        self.ui.dateEdit_2.setDate(today)
+
+        self.top_model = self.setup_table(self.ui.tableView)
+        self.slow_model = self.setup_table(self.ui.tableView_2)
+
+        # Connect buttons
+        self.ui.pushButton_5.clicked.connect(self.load_report)  # Show
+        self.ui.pushButton_4.clicked.connect(self.reject)       # Close
+
+        self.load_report()
+
+    def setup_table(self, table):
+        model = RowTableModel(self.COLUMNS, parent=table)
+        table.setModel(model)
+        table.setSelectionBehavior(QTableView.SelectRows)
+        table.setAlternatingRowColors(True)
+        header = table.horizontalHeader()
+        for i in range(model.columnCount()):
+            header.setSectionResizeMode(i, QHeaderView.Stretch)
+        return model
+
+    def load_report(self):
+        start_date = self.ui.dateEdit.date().toPython()
+        end_date = self.ui.dateEdit_2.date().toPython()
+        if start_date > end_date:
+            QMessageBox.warning(self, "Validation Error", "The start date must not be after the end date")
+            return
+
+        self.executor.submit_call(
+            self.QUERY_KEY, lambda: item_sales(self.db, start_date, end_date),
+            on_result=self.show_report,
+            on_error=lambda e: QMessageBox.critical(self, "Error", f"Failed to load item sales: {e}"),
+            busy_widget=self.ui.tableView
+        )
+
+    def show_report(self, report):
+        top, slow = report
+        self.top_model.set_rows(top)
+        self.slow_model.set_rows(slow)
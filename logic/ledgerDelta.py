@@ -0,0 +1,81 @@
+from logic.queryCache import tables_read
+
+
+class LedgerDelta:
+    """
+    Incremental refresh for a page listing an append-mostly table newest
+    first (Income, Expenses, Reports). The rows already in the page's model
+    are the high-water mark: a refresh fetches only rows with a larger key
+    and puts them on top, instead of reading the whole table again.
+
+    Deletes are caught by counting the table's rows between the lowest and
+    highest key shown; if that no longer matches the model, fetch() returns
+    None and the page does a full reload. In-place updates are not detected,
+    which these tables never get from the app.
+
+    With a QueryCache, a refresh is skipped altogether while nothing has
+    been written locally to the tables read and the TTL has not run out.
+    """
+
+    def __init__(self, db, model, table, key, columns, source, key_expr=None, cache=None):
+        self.db = db
+        self.model = model
+        self.table = table
+        self.key = key                    # key column in table
+        self.key_expr = key_expr or key   # the same column as named in source
+        self.columns = columns
+        self.source = source
+        self.cache = cache
+        self.tracking = False   # the model holds the full listing (not a search result)
+        self._loading = None    # cache snapshot taken when the current load started
+        self._current = None    # snapshot the model is up to date with
+
+    # ----- Load bookkeeping (GUI thread) -----
+    def start_load(self):
+        """Call before querying rows that will bring the model up to date"""
+        if self.cache is not None:
+            self._loading = self.cache.snapshot(tables_read(f"FROM {self.source}"))
+
+    def loaded(self):
+        """The model now holds the full listing as of the last start_load()"""
+        self.tracking = True
+        self._current = self._loading
+
+    def stop(self):
+        """The model shows something else (a search result); the next refresh reloads"""
+        self.tracking = False
+        self._current = None
+
+    def is_current(self):
+        """True if nothing can have changed since the model was last brought up to date"""
+        return (self.tracking and self._current is not None
+                and self.cache is not None and self.cache.is_fresh(self._current))
+
+    # ----- Refresh -----
+    def fetch_call(self):
+        """
+        Background work for a refresh, or None when the page has to reload in
+        full. Reads the mark on the GUI thread, so the work never touches the model.
+        """
+        count = len(self.model)
+        if not self.tracking or not count:
+            return None
+        self.start_load()
+        high = self.model.row(0)[0]
+        low = self.model.row(count - 1)[0]
+        return lambda: self.fetch(low, high, count)
+
+    def fetch(self, low, high, count):
+        """New rows newest first, or None if rows under the mark were deleted"""
+        with self.db.cursor() as cursor:
+            cursor.execute(
+                f"SELECT COUNT(*) FROM {self.table} WHERE {self.key} BETWEEN ? AND ?", (low, high)
+            )
+            if cursor.fetchone()[0] != count:
+                return None
+            cursor.execute(
+                f"SELECT {self.columns} FROM {self.source} "
+                f"WHERE {self.key_expr} > ? ORDER BY {self.key_expr} DESC",
+                (high,)
+            )
+            return cursor.fetchall()
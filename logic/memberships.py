@@ -0,0 +1,26 @@
+def add_membership(cursor, user_id, membership_id, start_date, end_date):
+    """
+    Record a membership purchase inside the caller's transaction and keep
+    CurrentMemberships (one row per user: the membership ending last)
+    pointing at it unless the user already holds one that ends later.
+    """
+    cursor.execute("""
+    INSERT INTO UserMemberships (user_id, membership_id, start_date, end_date)
+    OUTPUT INSERTED.user_membership_id
+    VALUES (?, ?, ?, ?)
+    """, (user_id, membership_id, start_date, end_date))
+    user_membership_id = cursor.fetchone()[0]
+
+    cursor.execute("""
+    UPDATE CurrentMemberships
+    SET user_membership_id = ?, membership_id = ?, end_date = ?
+    WHERE user_id = ? AND end_date <= ?
+    """, (user_membership_id, membership_id, end_date, user_id, end_date))
+    if cursor.rowcount == 0:
+        # No row yet (a new member), or the current one ends later and stays
+        cursor.execute("""
+        INSERT INTO CurrentMemberships (user_id, user_membership_id, membership_id, end_date)
+        SELECT ?, ?, ?, ?
+        WHERE NOT EXISTS (SELECT 1 FROM CurrentMemberships WHERE user_id = ?)
+        """, (user_id, user_membership_id, membership_id, end_date, user_id))
+    return user_membership_id
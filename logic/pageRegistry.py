@@ -0,0 +1,59 @@
+class PageRegistry:
+    """
+    Builds page objects the first time they are shown instead of at startup.
+    Each page is registered under its QUERY_KEY with a factory; the factory
+    (and with it the page's first load) only runs when the page is needed.
+
+    With a ChangeBus, each built page is subscribed to the tables it lists
+    in TABLES. A change reloads the page if it is the one on screen; any
+    other page picks the change up when it is next shown.
+    """
+
+    def __init__(self, bus=None):
+        self.bus = bus
+        self.current = None   # name of the page last shown
+        self._factories = {}
+        self._pages = {}
+        self._subscriptions = {}
+
+    def register(self, name, factory):
+        self._factories[name] = factory
+
+    def get(self, name):
+        """Return the page, building it on first use"""
+        if name not in self._pages:
+            page = self._factories[name]()
+            self._pages[name] = page
+            if self.bus is not None and getattr(page, "TABLES", None):
+                self._subscriptions[name] = self.bus.subscribe(page.TABLES, lambda: self._changed(name))
+        return self._pages[name]
+
+    def is_built(self, name):
+        return name in self._pages
+
+    def show(self, name):
+        """Build the page (which runs its first load) or reload it if already built"""
+        self.current = name
+        if name in self._pages:
+            self._pages[name].refresh()
+            return self._pages[name]
+        return self.get(name)
+
+    def refresh(self, name):
+        """Reload a page only if it exists; an unbuilt page loads fresh when first shown"""
+        if name in self._pages:
+            self._pages[name].refresh()
+
+    def _changed(self, name):
+        if name == self.current:
+            self.refresh(name)
+
+    def discard(self, *names):
+        """Forget built pages so they are rebuilt next time they are shown"""
+        for name in names or list(self._pages):
+            self._pages.pop(name, None)
+            subscription = self._subscriptions.pop(name, None)
+            if subscription is not None:
+                self.bus.unsubscribe(subscription)
+            if name == self.current:
+                self.current = None
@@ -0,0 +1,90 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+
+CACHE_TTL = 30       # seconds a cached result is trusted without a local write to its tables
+CACHE_SIZE = 64      # results kept; the least recently used is dropped first
+
+_READS = re.compile(r"\b(?:FROM|JOIN)\s+(\w+)", re.IGNORECASE)
+
+
+def tables_read(query):
+    return frozenset(_READS.findall(query))
+
+
+def _names(tables):
+    return sorted({table.lower() for table in tables})
+
+
+class QueryCache:
+    """
+    Page query results keyed by (page key, query, params).
+
+    Each table has a version that DatabaseConnection bumps, through
+    invalidate(), whenever a committed transaction wrote to it. A result
+    remembers the versions of the tables it read and is served only while
+    they are unchanged and it is younger than the TTL; the TTL is what
+    picks up writes made by other terminals.
+
+    Writes are published from whichever thread committed them (the sales
+    sync worker included), so every method takes the lock.
+    """
+
+    def __init__(self, ttl=CACHE_TTL, max_size=CACHE_SIZE):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries = OrderedDict()   # key -> (rows, snapshot)
+        self._versions = {}             # table -> write count
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+
+    # ----- Snapshots -----
+    def snapshot(self, tables):
+        """The state of tables now; is_fresh() says later whether it still holds"""
+        with self._lock:
+            return tuple((t, self._versions.get(t, 0)) for t in _names(tables)), time.monotonic()
+
+    def is_fresh(self, snapshot):
+        versions, taken_at = snapshot
+        if time.monotonic() - taken_at > self.ttl:
+            return False
+        with self._lock:
+            return all(self._versions.get(t, 0) == v for t, v in versions)
+
+    # ----- Results -----
+    def get(self, key, query, params=()):
+        """A cached result still valid for this page and filter, or None"""
+        entry_key = (key, query, tuple(params))
+        with self._lock:
+            entry = self._entries.get(entry_key)
+            if entry is not None:
+                self._entries.move_to_end(entry_key)
+        if entry is not None and self.is_fresh(entry[1]):
+            self.hits += 1
+            return entry[0]
+        self.misses += 1
+        return None
+
+    def put(self, key, query, params, rows, snapshot):
+        """Store rows read under snapshot (taken before the query ran)"""
+        entry_key = (key, query, tuple(params))
+        with self._lock:
+            self._entries[entry_key] = (rows, snapshot)
+            self._entries.move_to_end(entry_key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    # ----- Invalidation -----
+    def invalidate(self, tables):
+        """Mark tables as written; results that read them are no longer served"""
+        with self._lock:
+            for table in _names(tables):
+                self._versions[table] = self._versions.get(table, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,185 @@
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal, Qt
+
+from logic.queryCache import QueryCache, tables_read
+
+
+class _QuerySignals(QObject):
+    """Lives on the GUI thread; worker emits are queued back to it"""
+    finished = Signal(int, object)  # ticket, result
+    failed = Signal(int, str)       # ticket, error message
+
+
+class _QueryTask(QRunnable):
+    def __init__(self, ticket, work, signals):
+        super().__init__()
+        self.ticket = ticket
+        self.work = work
+        self.signals = signals
+        self.cancelled = False
+
+    def run(self):
+        if self.cancelled:  # superseded before a worker picked it up
+            return
+        try:
+            result = self.work()
+        except Exception as e:
+            self.signals.failed.emit(self.ticket, str(e))
+            return
+        self.signals.finished.emit(self.ticket, result)
+
+
+class QueryExecutor(QObject):
+    """
+    Runs page queries on a QThreadPool so the GUI thread never waits on the
+    database. Requests are keyed (usually one key per page): submitting a new
+    request for a key, or cancelling it, makes any older result for that key
+    stale and it is dropped instead of delivered.
+
+    Work whose busy widget is destroyed (its window torn down on logout)
+    is dropped too, pinned or not, so no callback reaches deleted widgets.
+
+    submit() results are cached per key, query and parameters (see
+    QueryCache); a repeat of a query whose tables nobody has written to is
+    answered at once without touching the database.
+    """
+    loading = Signal(str, bool)  # key, busy
+
+    _instances = {}
+
+    def __init__(self, db, parent=None):
+        super().__init__(parent)
+        self.db = db
+        self.thread_pool = QThreadPool(self)
+        # Leave one pooled connection free for work done on the GUI thread; background
+        # workers reserve connections of their own on top of pool_size
+        self.thread_pool.setMaxThreadCount(max(1, db.pool_size - 1))
+
+        self._signals = _QuerySignals(self)
+        self._signals.finished.connect(self._on_finished, Qt.QueuedConnection)
+        self._signals.failed.connect(self._on_failed, Qt.QueuedConnection)
+
+        self.cache = QueryCache()
+        db.add_write_listener(self.cache.invalidate)
+
+        self._pending = {}   # key -> (ticket, task, on_result, on_error, busy_widget)
+        self._tickets = {}   # ticket -> key
+        self._pinned = set()  # keys cancel_all() must not drop
+        self._watched = set()  # ids of busy widgets whose destruction drops their work
+        self._next_ticket = 0
+
+    @classmethod
+    def for_db(cls, db):
+        """Shared executor for a database connection"""
+        if db not in cls._instances:
+            cls._instances[db] = cls(db)
+        return cls._instances[db]
+
+    # ----- Submitting -----
+    def submit(self, key, query, params=(), on_result=None, on_error=None, busy_widget=None):
+        """Run a SELECT in the background (or answer it from the cache) and hand its rows to on_result"""
+        rows = self.cache.get(key, query, params)
+        if rows is not None:
+            self.cancel(key)   # an older request must not overwrite this answer
+            if on_result:
+                on_result(rows)
+            return None
+
+        # Taken before the query runs, so a write committed meanwhile makes the result stale
+        snapshot = self.cache.snapshot(tables_read(query))
+
+        def cache_and_deliver(rows):
+            self.cache.put(key, query, params, rows, snapshot)
+            if on_result:
+                on_result(rows)
+
+        return self.submit_call(
+            key, lambda: self.db.fetchall(query, params), cache_and_deliver, on_error, busy_widget
+        )
+
+    def submit_call(self, key, work, on_result=None, on_error=None, busy_widget=None, pinned=False):
+        """
+        Run any callable in the background, superseding older work for the
+        same key. Pinned work (a write the caller must hear back about) is
+        left alone by cancel_all().
+        """
+        self.cancel(key)
+        if pinned:
+            self._pinned.add(key)
+
+        self._next_ticket += 1
+        ticket = self._next_ticket
+        task = _QueryTask(ticket, work, self._signals)
+        self._pending[key] = (ticket, task, on_result, on_error, busy_widget)
+        self._tickets[ticket] = key
+
+        self._watch(busy_widget)
+        self._set_busy(key, busy_widget, True)
+        self.thread_pool.start(task)
+        return ticket
+
+    # ----- Cancelling -----
+    def cancel(self, key):
+        """Drop the pending request for key; its result will be ignored"""
+        entry = self._pending.pop(key, None)
+        if entry is None:
+            return
+        ticket, task, _, _, busy_widget = entry
+        task.cancelled = True
+        self._tickets.pop(ticket, None)
+        self._pinned.discard(key)
+        self._set_busy(key, busy_widget, False)
+
+    def cancel_all(self, keep=None):
+        """Cancel every pending request except the one for `keep` and pinned ones"""
+        for key in list(self._pending):
+            if key != keep and key not in self._pinned:
+                self.cancel(key)
+
+    def _watch(self, widget):
+        if widget is None or id(widget) in self._watched:
+            return
+        self._watched.add(id(widget))
+        widget.destroyed.connect(lambda _=None, widget_id=id(widget): self._widget_destroyed(widget_id))
+
+    def _widget_destroyed(self, widget_id):
+        """Drop work shown busy on a widget that no longer exists, without touching it"""
+        self._watched.discard(widget_id)
+        for key, (ticket, task, _, _, busy_widget) in list(self._pending.items()):
+            if id(busy_widget) == widget_id:
+                task.cancelled = True
+                del self._pending[key]
+                self._tickets.pop(ticket, None)
+                self._pinned.discard(key)
+                self.loading.emit(key, False)
+
+    def is_pending(self, key):
+        return key in self._pending
+
+    # ----- Delivery (GUI thread) -----
+    def _take(self, ticket):
+        key = self._tickets.pop(ticket, None)
+        if key is None:
+            return None  # stale: cancelled or superseded
+        entry = self._pending.pop(key)
+        self._pinned.discard(key)
+        self._set_busy(key, entry[4], False)
+        return entry
+
+    def _on_finished(self, ticket, result):
+        entry = self._take(ticket)
+        if entry and entry[2]:
+            entry[2](result)
+
+    def _on_failed(self, ticket, message):
+        entry = self._take(ticket)
+        if entry and entry[3]:
+            entry[3](message)
+
+    def _set_busy(self, key, widget, busy):
+        if widget is not None:
+            widget.setDisabled(busy)
+            if busy:
+                widget.setCursor(Qt.BusyCursor)
+            else:
+                widget.unsetCursor()
+        self.loading.emit(key, busy)
@@ -1,17 +1,26 @@
-from PySide6.QtWidgets import QTableWidgetItem, QPushButton, QHeaderView, QMessageBox, QTableWidget
-from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QHeaderView, QMessageBox, QTableView
+from logic.queryExecutor import QueryExecutor
+from logic.ledgerDelta import LedgerDelta
+from widgits.delegates import ButtonDelegate
+from widgits.table_models import RowTableModel, Column
 from logic.showReportL import ReportViewerDialog  # Make sure this is your dialog
 
 class ReportsPage:
+    QUERY_KEY = "reports"
+    TABLES = ("Reports", "Employees")
+    COLUMNS = "r.report_id, e.name, e.employee_id, r.title, r.content, r.report_date, r.report_time"
+    SOURCE = "Reports r JOIN Employees e ON r.employee_id = e.employee_id"
+
     def __init__(self, ui, db):
         self.ui = ui
         self.db = db
+        self.executor = QueryExecutor.for_db(db)
 
         # Placeholder for search input (adjust lineEdit name)
         self.ui.lineEdit_2.setPlaceholderText("Search by Report ID")
 
         # Find the table
-        self.table = self.ui.reports.findChild(QTableWidget, "tableWidget_2")
+        self.table = self.ui.reports.findChild(QTableView, "tableWidget_2")
         self.setup_table()
         self.load_reports()
 
@@ -20,72 +29,78 @@ class ReportsPage:
 
     def setup_table(self):
         """Setup table headers and behavior"""
-        headers = ["Report ID", "Employee Name & ID", "Title", "Content", "Date & Time", "Action"]
-        self.table.setColumnCount(len(headers))
-        self.table.setHorizontalHeaderLabels(headers)
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.table.setSelectionMode(QTableWidget.SingleSelection)
+        self.model = RowTableModel([
+            Column("Report ID", 0),
+            Column("Employee Name & ID", (1, 2), lambda name, employee_id: f"{name} (ID: {employee_id})"),
+            Column("Title", 3),
+            Column("Content", 4),
+            Column("Date & Time", (5, 6), lambda report_date, report_time: f"{report_date} {report_time}"),
+            Column("Action", (), lambda: "Show"),
+        ], parent=self.table)
+        self.table.setModel(self.model)
+        self.delta = LedgerDelta(self.db, self.model, "Reports", "report_id", self.COLUMNS, self.SOURCE,
+                                 key_expr="r.report_id", cache=self.executor.cache)
+        self.table.setSelectionBehavior(QTableView.SelectRows)
+        self.table.setSelectionMode(QTableView.SingleSelection)
         self.table.setAlternatingRowColors(True)
 
         header = self.table.horizontalHeader()
-        for i in range(len(headers)):
+        for i in range(self.model.columnCount()):
             header.setSectionResizeMode(i, QHeaderView.Stretch)
 
+        # Show buttons are painted by a delegate instead of one QPushButton per row
+        self.show_delegate = ButtonDelegate(self.table)
+        self.show_delegate.clicked.connect(lambda row: self.show_report(self.model.row(row)[0]))
+        self.table.setItemDelegateForColumn(5, self.show_delegate)
+
     def load_reports(self):
-        """Load all reports from the database"""
-        try:
-            query = """
-            SELECT r.report_id, e.name, e.employee_id, r.title, r.content, r.report_date, r.report_time
-            FROM Reports r
-            JOIN Employees e ON r.employee_id = e.employee_id
-            ORDER BY r.report_id DESC
-            """
-            self.db.cursor.execute(query)
-            reports = self.db.cursor.fetchall()
-            self.populate_table(reports)
-        except Exception as e:
-            QMessageBox.critical(None, "Error", f"Failed to load reports: {str(e)}")
+        """Load all reports from the database in the background"""
+        self.delta.start_load()
+        query = f"""
+        SELECT {self.COLUMNS}
+        FROM {self.SOURCE}
+        ORDER BY r.report_id DESC
+        """
+        self.executor.submit(
+            self.QUERY_KEY, query,
+            on_result=self.show_all,
+            on_error=lambda e: QMessageBox.critical(None, "Error", f"Failed to load reports: {e}"),
+            busy_widget=self.table
+        )
 
     def populate_table(self, reports):
         """Fill the table with report data"""
-        self.table.setRowCount(0)
-        for row_num, report in enumerate(reports):
-            self.table.insertRow(row_num)
-            report_id, employee_name, employee_id, title, content, report_date, report_time = report
-
-            # Fill table items
-            for col_num, value in enumerate([
-                report_id,
-                f"{employee_name} (ID: {employee_id})",
-                title,
-                content,
-                f"{report_date} {report_time}"
-            ]):
-                item = QTableWidgetItem(str(value))
-                item.setTextAlignment(Qt.AlignCenter)
-                item.setFlags(item.flags() & ~Qt.ItemIsEditable)
-                self.table.setItem(row_num, col_num, item)
-
-            # Action column: Show button
-            btn_show = QPushButton("Show")
-            btn_show.clicked.connect(self.make_show_handler(report_id))
-            self.table.setCellWidget(row_num, 5, btn_show)
-
-    def make_show_handler(self, report_id):
-        """Return a function that opens the report dialog with the correct report_id"""
-        def handler():
-            self.show_report(report_id)
-        return handler
+        self.model.set_rows(reports)
+
+    def show_all(self, reports):
+        self.populate_table(reports)
+        self.delta.loaded()
 
     def show_report(self, report_id):
-        """Open the report viewer dialog and refresh table if deleted"""
+        """Open the report viewer dialog; a deletion reaches the table through the change bus"""
         dialog = ReportViewerDialog(self.ui.reports, self.db, report_id)
-        dialog.report_deleted.connect(self.refresh)  # Refresh table on deletion
         dialog.exec()
 
     def refresh(self):
-        """Reload table"""
-        self.load_reports()
+        """Fetch only reports added since the last load; reload if any were deleted"""
+        if self.delta.is_current():
+            return   # nothing written to the table since the last look
+        fetch = self.delta.fetch_call()
+        if fetch is None:
+            self.load_reports()
+            return
+        self.executor.submit_call(
+            self.QUERY_KEY, fetch,
+            on_result=self.apply_delta,
+            on_error=lambda e: QMessageBox.critical(None, "Error", f"Failed to load reports: {e}")
+        )
+
+    def apply_delta(self, reports):
+        if reports is None:
+            self.load_reports()
+        else:
+            self.model.prepend_rows(reports)
+            self.delta.loaded()
 
     def search_report_by_id(self):
         """Search report by report_id from lineEdit_2"""
@@ -99,20 +114,22 @@ class ReportsPage:
             QMessageBox.warning(None, "Invalid Input", "Please enter a valid numeric Report ID.")
             return
 
-        try:
-            query = """
-            SELECT r.report_id, e.name, e.employee_id, r.title, r.content, r.report_date, r.report_time
-            FROM Reports r
-            JOIN Employees e ON r.employee_id = e.employee_id
-            WHERE r.report_id = ?
-            """
-            self.db.cursor.execute(query, (int(report_id),))
-            reports = self.db.cursor.fetchall()
-
-            if reports:
-                self.populate_table(reports)
-            else:
-                QMessageBox.information(None, "Not Found", f"No report found with ID {report_id}.")
-                self.table.setRowCount(0)
-        except Exception as e:
-            QMessageBox.critical(None, "Error", f"Failed to search report: {str(e)}")
+        query = f"""
+        SELECT {self.COLUMNS}
+        FROM {self.SOURCE}
+        WHERE r.report_id = ?
+        """
+        self.executor.submit(
+            self.QUERY_KEY, query, (int(report_id),),
+            on_result=lambda reports: self.show_search_results(reports, report_id),
+            on_error=lambda e: QMessageBox.critical(None, "Error", f"Failed to search report: {e}"),
+            busy_widget=self.table
+        )
+
+    def show_search_results(self, reports, report_id):
+        self.delta.stop()   # the next refresh reloads the full listing
+        if reports:
+            self.populate_table(reports)
+        else:
+            QMessageBox.information(None, "Not Found", f"No report found with ID {report_id}.")
+            self.model.clear()
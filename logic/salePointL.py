@@ -1,14 +1,32 @@
-from PySide6.QtWidgets import QTableWidgetItem, QHeaderView, QPushButton, QMessageBox, QAbstractItemView
-from PySide6.QtGui import QBrush, QColor
-from PySide6.QtCore import Qt
-from datetime import datetime
-from functools import partial
+import logging
+import uuid
+
+from PySide6.QtWidgets import QHeaderView, QMessageBox, QAbstractItemView
+from PySide6.QtGui import QColor
+from PySide6.QtCore import QTimer
+from logic.queryExecutor import QueryExecutor
+from logic.supplyCatalog import SupplyCatalog
+from logic.cartModel import CartModel
+from logic.cartModel import line_total
+from logic.checkout import checkout, InsufficientStock
+from widgits.delegates import ButtonDelegate
+from widgits.table_models import RowTableModel, Column
+
+logger = logging.getLogger(__name__)
+
 
 class SalePointPage:
-    def __init__(self, ui, db):
+    QUERY_KEY = "sale_point"
+    TABLES = ("Supplies", "StockMovements")
+    SEARCH_DEBOUNCE_MS = 40   # wait for a pause in typing before filtering
+
+    def __init__(self, ui, db, journal, current_system_user_id=None):
         self.ui = ui
         self.db = db
-        self.cart = []
+        self.journal = journal   # sales the central database could not take are recorded here and synced later
+        self.current_system_user_id = current_system_user_id   # cashier the sales are recorded under
+        self.executor = QueryExecutor.for_db(db)
+        self.catalog = SupplyCatalog(db)
 
         # Tables
         self.items_table = self.ui.cashierWork.findChild(type(self.ui.tableWidget_4), "tableWidget_4")
@@ -34,6 +52,14 @@ class SalePointPage:
         # Load items
         self.load_items()
 
+        # Live search: each keystroke restarts the timer, so only the last one filters
+        self.search_timer = QTimer(self.items_table)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(self.SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.search_items)
+        self.search_input.textChanged.connect(self.search_timer.start)
+        self.search_input.returnPressed.connect(self.search_items)
+
         # Connect buttons
         self.search_button.clicked.connect(self.search_items)
         self.sell_button.clicked.connect(self.sell_cart)
@@ -42,108 +68,89 @@ class SalePointPage:
         # Connect amount tendered input change
         self.amount_tendered_input.textChanged.connect(self.update_change_balance)
 
-        # To prevent recursive itemChanged calls
-        self._updating_cart = False
-
     # ---------------- Table Setup ----------------
     def setup_items_table(self):
-        headers = ["ID", "Name", "Price per Unit", "Stock", "Quantity", "Add to Cart"]
-        self.items_table.setColumnCount(len(headers))
-        self.items_table.setHorizontalHeaderLabels(headers)
-        for i in range(len(headers)):
+        self.items_model = RowTableModel([
+            Column("ID", 0),
+            Column("Name", 1),
+            Column("Price per Unit", 2, lambda price: str(float(price))),
+            Column("Stock", 3),
+            Column("Quantity", (), editable=True, default="1"),
+            Column("Add to Cart", (), lambda: "Add"),
+        ], foreground=QColor(0, 0, 0), parent=self.items_table)
+        self.items_table.setModel(self.items_model)
+        for i in range(self.items_model.columnCount()):
             self.items_table.horizontalHeader().setSectionResizeMode(i, QHeaderView.Stretch)
         self.items_table.setEditTriggers(QAbstractItemView.DoubleClicked)
 
+        # Add buttons are painted by a delegate instead of one QPushButton per row
+        self.add_delegate = ButtonDelegate(self.items_table)
+        self.add_delegate.clicked.connect(
+            lambda row: self.add_to_cart_from_table(self.items_model.row(row)[0], row)
+        )
+        self.items_table.setItemDelegateForColumn(5, self.add_delegate)
+
     def setup_cart_table(self):
-        headers = ["Name", "Quantity", "Price per Unit", "Discount", "Total"]
-        self.cart_table.setColumnCount(len(headers))
-        self.cart_table.setHorizontalHeaderLabels(headers)
-        for i in range(len(headers)):
+        self.cart = CartModel(self.current_stock, self.cart_table)
+        self.cart.totalChanged.connect(self.update_total_balance)
+        self.cart.quantityRejected.connect(lambda title, msg: QMessageBox.warning(None, title, msg))
+        self.cart_table.setModel(self.cart)
+        self.cart_table.setEditTriggers(QAbstractItemView.DoubleClicked | QAbstractItemView.EditKeyPressed)
+        for i in range(len(CartModel.HEADERS)):
             self.cart_table.horizontalHeader().setSectionResizeMode(i, QHeaderView.Stretch)
 
     # ---------------- Load Items ----------------
+    def refresh(self):
+        """Pull Supplies and stock changes since the last load, keeping the current search filter"""
+        self.load_items()
+
     def load_items(self):
-        try:
-            query = "SELECT supply_id, item_name, price, quantity FROM Supplies ORDER BY item_name"
-            self.db.cursor.execute(query)
-            items = self.db.cursor.fetchall()
-            self.populate_items_table(items)
-        except Exception as e:
-            QMessageBox.critical(None, "Error", f"Failed to load items: {str(e)}")
+        # First call reads all Supplies; later calls only items changed since the watermarks
+        self.executor.submit_call(
+            self.QUERY_KEY, self.catalog.fetch_changes,
+            on_result=self.on_catalog_changes,
+            on_error=lambda e: QMessageBox.critical(None, "Error", f"Failed to load items: {e}"),
+            busy_widget=self.items_table if not self.catalog.items else None
+        )
+
+    def on_catalog_changes(self, changes):
+        if self.catalog.apply(changes) or changes[0]:
+            self.search_items()
 
     def populate_items_table(self, items):
-        self.items_table.setRowCount(0)
-        for row_num, item in enumerate(items):
-            supply_id, name, price, stock = item
-            self.items_table.insertRow(row_num)
-
-            # Fill all cells
-            values = [supply_id, name, float(price), stock, 1]
-            for col_num, value in enumerate(values):
-                cell = QTableWidgetItem(str(value))
-                cell.setForeground(QBrush(QColor(0, 0, 0)))
-                cell.setTextAlignment(Qt.AlignCenter)
-                if col_num == 4:
-                    cell.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled | Qt.ItemIsEditable)
-                else:
-                    cell.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled)
-                self.items_table.setItem(row_num, col_num, cell)
-
-            # Add-to-cart button
-            add_btn = QPushButton("Add")
-            add_btn.clicked.connect(partial(self.add_to_cart_from_table, supply_id, row_num))
-            self.items_table.setCellWidget(row_num, 5, add_btn)
+        # Quantities typed into the table start over at 1 with each new result
+        self.items_model.set_rows(items)
 
     # ---------------- Search Items ----------------
     def search_items(self):
+        # Served from the local catalog; matches names with words starting with each search word
+        self.search_timer.stop()   # a search now supersedes any debounced one
         search_term = self.search_input.text().strip()
-        try:
-            if search_term:
-                query = "SELECT supply_id, item_name, price, quantity FROM Supplies WHERE item_name LIKE ?"
-                self.db.cursor.execute(query, (f"%{search_term}%",))
-            else:
-                query = "SELECT supply_id, item_name, price, quantity FROM Supplies ORDER BY item_name"
-                self.db.cursor.execute(query)
-            items = self.db.cursor.fetchall()
-            self.populate_items_table(items)
-        except Exception as e:
-            QMessageBox.critical(None, "Error", f"Failed to search items: {str(e)}")
+        self.populate_items_table(self.catalog.search(search_term))
 
     # ---------------- Cart ----------------
     def add_to_cart(self, supply_id, quantity=1, discount=0.0):
-        self.db.cursor.execute("SELECT item_name, price, quantity FROM Supplies WHERE supply_id = ?", (supply_id,))
-        result = self.db.cursor.fetchone()
+        # Item and stock come from the local catalog so the till keeps working offline
+        result = self.catalog.get(supply_id)
         if not result:
             QMessageBox.warning(None, "Error", "Item not found")
             return
-        name, price, stock = result
+        _, name, price, stock = result
         price = float(price)
         if stock < quantity:
             QMessageBox.warning(None, "Stock Error", f"Not enough stock for '{name}'")
             return
 
-        # Update cart if item exists
-        for item in self.cart:
-            if item["id"] == supply_id:
-                item["quantity"] += quantity
-                item["discount"] = discount
-                self.refresh_cart_table()
-                return
+        # Merges into the existing line if the item is already in the cart
+        self.cart.add(supply_id, name, price, quantity, discount)
 
-        # Add new entry
-        self.cart.append({
-            "id": supply_id,
-            "name": name,
-            "price": price,
-            "quantity": quantity,
-            "discount": discount
-        })
-        self.refresh_cart_table()
+    def current_stock(self, supply_id):
+        return self.catalog.get(supply_id)[3]
 
     def add_to_cart_from_table(self, supply_id, row):
         # Read Quantity from tableWidget_4 (editable)
         try:
-            quantity = int(self.items_table.item(row, 4).text())
+            quantity = int(self.items_model.value(row, 4))
             if quantity < 1:
                 raise ValueError
         except ValueError:
@@ -163,12 +170,11 @@ class SalePointPage:
                 return
 
         # Add to cart with stock check
-        self.db.cursor.execute("SELECT item_name, quantity FROM Supplies WHERE supply_id = ?", (supply_id,))
-        result = self.db.cursor.fetchone()
+        result = self.catalog.get(supply_id)
         if not result:
             QMessageBox.warning(None, "Error", "Item not found")
             return
-        name, stock = result
+        _, name, _, stock = result
         if stock < quantity:
             QMessageBox.warning(None, "Stock Error", f"Not enough stock for '{name}'")
             return
@@ -178,72 +184,10 @@ class SalePointPage:
 
         # Confirmation message
         QMessageBox.information(None, "Added to Cart", f"Added '{name}' x{quantity} with discount {discount:.2f}%")
-        self.update_total_balance()
-
-    def refresh_cart_table(self):
-        self._updating_cart = True
-        if self.cart_table.signalsBlocked() == False:
-          try:
-           self.cart_table.itemChanged.disconnect(self.on_quantity_changed)
-          except Exception:
-            pass
-        self.cart_table.setRowCount(0)
-
-        for row_num, item in enumerate(self.cart):
-            self.cart_table.insertRow(row_num)
-            discount = float(item["discount"])
-            total_price = item["price"] * item["quantity"] * (1 - discount / 100)
-
-            values = [
-                item["name"],
-                item["quantity"],
-                f"${item['price']:.2f}",
-                f"{discount:.2f}%" if discount > 0 else "-",
-                f"${total_price:.2f}"
-            ]
-
-            for col_num, value in enumerate(values):
-                cell = QTableWidgetItem(str(value))
-                cell.setForeground(QBrush(QColor(0, 0, 0)))
-                cell.setTextAlignment(Qt.AlignCenter)
-                if col_num == 1:  # Quantity editable in cart
-                    cell.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled | Qt.ItemIsEditable)
-                else:
-                    cell.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled)
-                self.cart_table.setItem(row_num, col_num, cell)
-
-        self.cart_table.itemChanged.connect(self.on_quantity_changed)
-        self._updating_cart = False
-        self.update_total_balance()
-
-    def on_quantity_changed(self, item):
-        if self._updating_cart:
-            return
-        row = item.row()
-        col = item.column()
-        if col == 1:
-            try:
-                new_qty = int(item.text())
-                if new_qty < 1:
-                    raise ValueError
-            except ValueError:
-                QMessageBox.warning(None, "Invalid Quantity", "Quantity must be a positive integer")
-                item.setText(str(self.cart[row]["quantity"]))
-                return
-            # Stock check
-            self.db.cursor.execute("SELECT quantity FROM Supplies WHERE supply_id = ?", (self.cart[row]["id"],))
-            stock = self.db.cursor.fetchone()[0]
-            if new_qty > stock:
-                QMessageBox.warning(None, "Stock Error", f"Not enough stock. Max available: {stock}")
-                item.setText(str(self.cart[row]["quantity"]))
-                return
-
-            self.cart[row]["quantity"] = new_qty
-            self.refresh_cart_table()
 
     # ---------------- Total / Balance ----------------
     def update_total_balance(self):
-        total = sum(item["price"] * item["quantity"] * (1 - float(item["discount"]) / 100) for item in self.cart)
+        total = self.cart.total   # kept up to date by the cart model
         self.total_label.setText(f"Total: ${total:.2f}")
 
         # Update change/balance
@@ -254,7 +198,7 @@ class SalePointPage:
             tendered = float(self.amount_tendered_input.text())
         except:
             tendered = 0.0
-        total = sum(item["price"] * item["quantity"] * (1 - float(item["discount"]) / 100) for item in self.cart)
+        total = self.cart.total
         change = tendered - total
         self.change_label.setText(f"Change: ${max(change,0):.2f}")
         self.balance_due_input.setText(f"{max(total - tendered,0):.2f}")
@@ -264,27 +208,66 @@ class SalePointPage:
         if not self.cart:
             QMessageBox.warning(None, "Empty Cart", "Cart is empty")
             return
+        lines = [dict(line, amount=round(line_total(line), 2)) for line in self.cart.lines()]
+
+        # Check stock locally first; the central database has the final say when it can be reached
+        short = [line["name"] for line in lines if line["quantity"] > self.current_stock(line["id"])]
+        if short:
+            QMessageBox.warning(None, "Stock Error", f"Not enough stock for {', '.join(short)}")
+            return
+
+        # Pinned: navigating away must not drop the answer to a sale that went through
+        sale_key = uuid.uuid4().hex
+        self.executor.submit_call(
+            f"sale:{sale_key}", lambda: self.complete_sale(sale_key, lines),
+            on_result=self.on_sale_done,
+            on_error=lambda e: QMessageBox.critical(None, "Error", f"Failed to complete sale: {e}"),
+            busy_widget=self.sell_button, pinned=True
+        )
+
+    def complete_sale(self, sale_key, lines):
+        """
+        Worker thread. Sell through the central database, which refuses a
+        sale the stock cannot cover; if it cannot be reached, record the
+        sale in the local journal for the sync worker to forward. Any other
+        error is raised to on_error and the cart is kept.
+        Returns (outcome, detail) for on_sale_done().
+        """
         try:
-            for item in self.cart:
-                self.db.cursor.execute(
-                    "UPDATE Supplies SET quantity = quantity - ? WHERE supply_id = ?",
-                    (item["quantity"], item["id"])
-                )
-                total_price = item["price"] * item["quantity"] * (1 - float(item["discount"]) / 100)
-                self.db.cursor.execute(
-                    "INSERT INTO Income (source, amount, income_date) VALUES (?, ?, ?)",
-                    ("supplies", total_price, datetime.now())
-                )
-            self.db.connection.commit()
+            return "sold", checkout(self.db, lines, system_user_id=self.current_system_user_id, sale_key=sale_key)
+        except InsufficientStock as e:
+            return "short", e.shortages
+        except self.db.connection_errors() as e:
+            # Same sale_key, so a sale that did commit is not applied twice when the journal syncs
+            logger.warning("Database unreachable, journaling sale %s: %s", sale_key, e)
+            self.journal.record(lines, system_user_id=self.current_system_user_id, sale_key=sale_key)
+            return "journaled", lines
+
+    def on_sale_done(self, outcome):
+        outcome, detail = outcome
+        if outcome == "short":
+            # The catalog was behind; take the central counts and leave the cart for the cashier to fix
+            for supply_id, _, _, available in detail:
+                self.catalog.set_stock(supply_id, available)
+            self.search_items()
+            lines = ", ".join(f"'{name}' ({available} left)" for _, name, _, available in detail)
+            QMessageBox.warning(None, "Stock Error", f"Not enough stock for {lines}")
+            return
+
+        # Patch only the sold items' stock instead of reloading the catalog
+        for line in detail:
+            stock = line["stock_left"] if outcome == "sold" else self.current_stock(line["id"]) - line["quantity"]
+            self.catalog.set_stock(line["id"], stock)
+
+        if outcome == "sold":
             QMessageBox.information(None, "Success", "Sale completed")
-            self.clear_cart()
-            self.load_items()
-        except Exception as e:
-            QMessageBox.critical(None, "Error", f"Failed to complete sale: {str(e)}")
+        else:
+            QMessageBox.information(None, "Success", "Sale completed; it will be sent to the server when it is reachable")
+        self.clear_cart()
+        self.search_items()
 
     def clear_cart(self):
-        self.cart = []
-        self.refresh_cart_table()
+        self.cart.clear()
         self.amount_tendered_input.setText("")
         self.balance_due_input.setText("")
         self.total_label.setText("Total: $0.00")
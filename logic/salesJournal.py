@@ -0,0 +1,262 @@
+import json
+import os
+import sqlite3
+import sys
+import threading
+import traceback
+import uuid
+from datetime import datetime
+
+from logic.checkout import apply_journaled_sale
+from schema import IncomeSource
+
+# The journal must outlive the process, so a frozen build keeps it next to
+# the executable rather than in the temporary unpack folder
+if getattr(sys, 'frozen', False):
+    JOURNAL_DIR = os.path.dirname(sys.executable)
+else:
+    JOURNAL_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+JOURNAL_PATH = os.path.join(JOURNAL_DIR, "sales_journal.db")
+
+SYNC_INTERVAL = 5   # seconds between sync attempts while sales are pending
+SYNC_BATCH = 50     # sales replayed per central transaction
+MAX_ATTEMPTS = 5    # rejections by the central database before a sale is marked failed
+
+
+class SalesJournal:
+    """
+    Append-only local log of completed sales (SQLite in WAL mode). A sale is
+    durable once record() returns, whether or not the central database is
+    reachable; SalesSyncWorker forwards it later.
+
+    This covers outages while the terminal runs. Logging in and loading the
+    catalog still need the central database, so a terminal cannot start
+    offline.
+    """
+
+    def __init__(self, path=JOURNAL_PATH):
+        self.path = path
+        self.recorded = threading.Event()   # set on every new sale to wake the sync worker
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=FULL")   # a recorded sale survives power loss
+        self._conn.execute("""
+        CREATE TABLE IF NOT EXISTS journal (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            sale_key TEXT NOT NULL UNIQUE,
+            sold_at TEXT NOT NULL,
+            source TEXT NOT NULL,
+            lines TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending',   -- pending, synced, conflict, failed, reviewed
+            attempts INTEGER NOT NULL DEFAULT 0,
+            last_error TEXT,
+            synced_at TEXT,
+            system_user_id INTEGER
+        )
+        """)
+        # Journals created before sales carried their cashier
+        if "system_user_id" not in [row[1] for row in self._conn.execute("PRAGMA table_info(journal)")]:
+            self._conn.execute("ALTER TABLE journal ADD COLUMN system_user_id INTEGER")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_journal_status ON journal (status, seq)")
+
+    def record(self, lines, source=IncomeSource.SUPPLIES, system_user_id=None, sale_key=None):
+        """Durably append a completed sale; returns its idempotency key"""
+        sale_key = sale_key or uuid.uuid4().hex
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO journal (sale_key, sold_at, source, lines, system_user_id) VALUES (?, ?, ?, ?, ?)",
+                (sale_key, datetime.now().isoformat(" "), IncomeSource.coerce(source).label,
+                 json.dumps(lines), system_user_id)
+            )
+        self.recorded.set()
+        return sale_key
+
+    def pending(self, limit=SYNC_BATCH):
+        """Oldest unsynced sales: [(sale_key, sold_at, source, lines, system_user_id)]"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT sale_key, sold_at, source, lines, system_user_id FROM journal "
+                "WHERE status = 'pending' ORDER BY seq LIMIT ?",
+                (limit,)
+            ).fetchall()
+        return [(key, datetime.fromisoformat(sold_at), source, json.loads(lines), system_user_id)
+                for key, sold_at, source, lines, system_user_id in rows]
+
+    def pending_count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM journal WHERE status = 'pending'").fetchone()[0]
+
+    def mark_synced(self, results):
+        """results: [(sale_key, conflicts)]; sales with conflicts are kept for review"""
+        now = datetime.now().isoformat(" ")
+        with self._lock:
+            self._conn.execute("BEGIN")
+            for sale_key, conflicts in results:
+                if conflicts:
+                    self._conn.execute(
+                        "UPDATE journal SET status = 'conflict', last_error = ?, synced_at = ? WHERE sale_key = ?",
+                        (json.dumps(conflicts), now, sale_key)
+                    )
+                else:
+                    self._conn.execute(
+                        "UPDATE journal SET status = 'synced', synced_at = ? WHERE sale_key = ?",
+                        (now, sale_key)
+                    )
+            self._conn.execute("COMMIT")
+
+    def mark_failed(self, sale_keys, error):
+        """
+        The central database rejected these sales. Each rejection counts as
+        an attempt; a sale rejected MAX_ATTEMPTS times stops being retried
+        and waits as 'failed' for staff.
+        """
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE journal SET attempts = attempts + 1, last_error = ?, "
+                "status = CASE WHEN attempts + 1 >= ? THEN 'failed' ELSE status END "
+                "WHERE sale_key = ? AND status = 'pending'",
+                [(error, MAX_ATTEMPTS, key) for key in sale_keys]
+            )
+
+    def mark_deferred(self, sale_keys, error):
+        """The central database could not be reached; the sales stay pending without an attempt counted"""
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE journal SET last_error = ? WHERE sale_key = ?",
+                [(error, key) for key in sale_keys]
+            )
+
+    # ----- Review by staff -----
+    def issues(self):
+        """
+        Sales that need a person: synced with stock conflicts, or failed.
+        [(sale_key, sold_at, status, total, items, attempts, last_error)]
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT sale_key, sold_at, status, lines, attempts, last_error FROM journal "
+                "WHERE status IN ('conflict', 'failed') ORDER BY seq"
+            ).fetchall()
+        issues = []
+        for sale_key, sold_at, status, lines, attempts, last_error in rows:
+            lines = json.loads(lines)
+            items = ", ".join(f"{line['name']} x{line['quantity']}" for line in lines)
+            total = round(sum(line["amount"] for line in lines), 2)
+            if status == "conflict":
+                last_error = ", ".join(f"{name}: sold {requested}, {available} were in stock"
+                                       for _, name, requested, available in json.loads(last_error))
+            issues.append((sale_key, datetime.fromisoformat(sold_at), status, total, items, attempts, last_error))
+        return issues
+
+    def counts(self):
+        """{status: number of sales} for every status present"""
+        with self._lock:
+            return dict(self._conn.execute("SELECT status, COUNT(*) FROM journal GROUP BY status").fetchall())
+
+    def retry(self, sale_keys):
+        """Queue failed sales again with a fresh set of attempts"""
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE journal SET status = 'pending', attempts = 0 WHERE sale_key = ? AND status = 'failed'",
+                [(key,) for key in sale_keys]
+            )
+        self.recorded.set()
+
+    def mark_reviewed(self, sale_keys):
+        """Staff have dealt with these conflicts or failures; they leave the issues list"""
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE journal SET status = 'reviewed' WHERE sale_key = ? AND status IN ('conflict', 'failed')",
+                [(key,) for key in sale_keys]
+            )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class SalesSyncWorker(threading.Thread):
+    """
+    Replays pending journal sales to the central database in batches. A
+    batch goes in as one transaction; if it fails while the database is
+    reachable, its sales are replayed one per transaction so a single bad
+    sale (an item or cashier deleted since) cannot hold back the rest.
+    """
+
+    def __init__(self, journal, db, interval=SYNC_INTERVAL, batch_size=SYNC_BATCH):
+        super().__init__(name="sales-sync", daemon=True)
+        self.journal = journal
+        self.db = db
+        self.interval = interval
+        self.batch_size = batch_size
+        self._stopped = threading.Event()
+        db.reserve()   # syncs on its own connection
+
+    def run(self):
+        while not self._stopped.is_set():
+            try:
+                # Keep going while full batches come back; back off once caught up or failing
+                while not self._stopped.is_set() and self.sync_once() == self.batch_size:
+                    pass
+            except Exception:
+                traceback.print_exc()
+            self.journal.recorded.wait(self.interval)
+            self.journal.recorded.clear()
+
+    def sync_once(self):
+        """Forward one batch of pending sales; returns how many left the pending queue"""
+        batch = self.journal.pending(self.batch_size)
+        if not batch:
+            return 0
+
+        try:
+            with self.db.transaction() as cursor:
+                results = [(sale[0], self.apply(cursor, sale)) for sale in batch]
+        except Exception as e:
+            if not self.reachable():
+                # Central DB unreachable; everything stays pending
+                self.journal.mark_deferred([sale[0] for sale in batch], str(e))
+                print("Sales sync failed:", e)
+                return 0
+            return self.sync_each(batch)
+
+        self.journal.mark_synced(results)
+        return len(batch)
+
+    def sync_each(self, batch):
+        """Replay sales one transaction each, counting a rejection against that sale only"""
+        done = 0
+        for i, sale in enumerate(batch):
+            sale_key = sale[0]
+            try:
+                with self.db.transaction() as cursor:
+                    conflicts = self.apply(cursor, sale)
+            except Exception as e:
+                if not self.reachable():
+                    self.journal.mark_deferred([later[0] for later in batch[i:]], str(e))
+                    print("Sales sync failed:", e)
+                    break
+                self.journal.mark_failed([sale_key], str(e))
+                print(f"Sale {sale_key} rejected:", e)
+                continue
+            self.journal.mark_synced([(sale_key, conflicts)])
+            done += 1
+        return done
+
+    @staticmethod
+    def apply(cursor, sale):
+        sale_key, sold_at, source, lines, system_user_id = sale
+        return apply_journaled_sale(cursor, sale_key, lines, sold_at, source, system_user_id)
+
+    def reachable(self):
+        try:
+            self.db.fetchone("SELECT 1")
+            return True
+        except Exception:
+            return False
+
+    def stop(self):
+        self._stopped.set()
+        self.journal.recorded.set()
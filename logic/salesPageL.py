@@ -1,16 +1,24 @@
-from PySide6.QtWidgets import QTableWidgetItem, QHeaderView, QMessageBox, QTableWidget
-from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QHeaderView, QMessageBox, QTableView
+from logic.queryExecutor import QueryExecutor
+from logic.ledgerDelta import LedgerDelta
+from widgits.table_models import RowTableModel, Column, money
 
 class SalesPage:
+    QUERY_KEY = "sales"
+    TABLES = ("Income",)
+    PAGE_SIZE = 200   # income records per fetch; more load as the table is scrolled
+    COLUMNS = "income_id, source, amount, income_date"
+
     def __init__(self, ui, db):
         self.ui = ui
         self.db = db
+        self.executor = QueryExecutor.for_db(db)
 
         # Set placeholder for search input
         self.ui.lineEdit.setPlaceholderText("Search by Income ID")
 
         # Get the table widget correctly
-        self.table = self.ui.sales.findChild(QTableWidget, "tableWidget")
+        self.table = self.ui.sales.findChild(QTableView, "tableWidget")
         if self.table is None:
             QMessageBox.critical(None, "Error", "Sales table not found!")
             return
@@ -22,45 +30,63 @@ class SalesPage:
         self.ui.pushButton_7.clicked.connect(self.search_income_by_id)
 
     def setup_table(self):
-        headers = ["Income ID", "Source", "Amount", "Date & Time"]
-        self.table.setColumnCount(len(headers))
-        self.table.setHorizontalHeaderLabels(headers)
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.table.setSelectionMode(QTableWidget.SingleSelection)
+        self.model = RowTableModel([
+            Column("Income ID", 0),
+            Column("Source", 1),
+            Column("Amount", 2, money),
+            Column("Date & Time", 3),
+        ], fetch_page=self.load_next_page, parent=self.table)
+        self.table.setModel(self.model)
+        self.delta = LedgerDelta(self.db, self.model, "Income", "income_id", self.COLUMNS, "Income",
+                                 cache=self.executor.cache)
+        self.table.setSelectionBehavior(QTableView.SelectRows)
+        self.table.setSelectionMode(QTableView.SingleSelection)
         self.table.setAlternatingRowColors(True)
 
         header = self.table.horizontalHeader()
-        for i in range(len(headers)):
+        for i in range(self.model.columnCount()):
             header.setSectionResizeMode(i, QHeaderView.Stretch)
 
     def load_income(self):
-        """Load all income records from the database without summing"""
-        try:
-            query = """
-            SELECT income_id, source, amount, income_date
-            FROM Income
-            ORDER BY income_id DESC
-            """
-            self.db.cursor.execute(query)
-            incomes = self.db.cursor.fetchall()
-            self.populate_table(incomes)
-        except Exception as e:
-            QMessageBox.critical(None, "Error", f"Failed to load income records: {str(e)}")
+        """Load the newest page of income records in the background"""
+        self.load_page()
+
+    def load_next_page(self):
+        """Called by the model when the table is scrolled to the last loaded row"""
+        if self.executor.is_pending(self.QUERY_KEY):
+            return   # a page or reload is already on its way
+        self.load_page(before_id=self.model.row(len(self.model) - 1)[0])
+
+    def load_page(self, before_id=None):
+        """
+        Keyset pagination: each page seeks to income_id < before_id on the
+        primary key, so a page costs the same however large Income grows
+        and however far down the admin has scrolled.
+        """
+        where, params = ("WHERE income_id < ?", (before_id,)) if before_id is not None else ("", ())
+        query = f"""
+        SELECT TOP {self.PAGE_SIZE} {self.COLUMNS}
+        FROM Income
+        {where}
+        ORDER BY income_id DESC
+        """
+        first = before_id is None
+        if first:
+            self.delta.start_load()
+        self.executor.submit(
+            self.QUERY_KEY, query, params,
+            on_result=self.populate_table if first else self.append_page,
+            on_error=lambda e: QMessageBox.critical(None, "Error", f"Failed to load income records: {e}"),
+            busy_widget=self.table if first else None   # keep the table scrollable while a page loads
+        )
 
     def populate_table(self, incomes):
-        """Fill the QTableWidget with raw income records"""
-        self.table.setRowCount(0)
-        for row_num, income in enumerate(incomes):
-            self.table.insertRow(row_num)
-            income_id, source, amount, income_date = income
-
-            # Show amount as currency
-            row_values = [income_id, source, f"${amount:.2f}", str(income_date)]
-            for col_num, value in enumerate(row_values):
-                item = QTableWidgetItem(str(value))
-                item.setTextAlignment(Qt.AlignCenter)
-                item.setFlags(item.flags() & ~Qt.ItemIsEditable)  # make cells read-only
-                self.table.setItem(row_num, col_num, item)
+        """Show raw income records; cells are formatted by the model as they are drawn"""
+        self.model.set_rows(incomes, has_more=len(incomes) == self.PAGE_SIZE)
+        self.delta.loaded()
+
+    def append_page(self, incomes):
+        self.model.append_rows(incomes, has_more=len(incomes) == self.PAGE_SIZE)
 
     def search_income_by_id(self):
         """Search for a specific income record by its ID"""
@@ -73,23 +99,43 @@ class SalesPage:
             QMessageBox.warning(None, "Invalid Input", "Please enter a valid numeric Income ID.")
             return
 
-        try:
-            query = """
-            SELECT income_id, source, amount, income_date 
-            FROM Income 
-            WHERE income_id = ?
-            """
-            self.db.cursor.execute(query, (int(income_id),))
-            incomes = self.db.cursor.fetchall()
-
-            if incomes:
-                self.populate_table(incomes)
-            else:
-                QMessageBox.information(None, "Not Found", f"No income record found with ID {income_id}.")
-                self.table.setRowCount(0)
-        except Exception as e:
-            QMessageBox.critical(None, "Error", f"Failed to search income record: {str(e)}")
+        query = f"""
+        SELECT {self.COLUMNS}
+        FROM Income
+        WHERE income_id = ?
+        """
+        self.executor.submit(
+            self.QUERY_KEY, query, (int(income_id),),
+            on_result=lambda incomes: self.show_search_results(incomes, income_id),
+            on_error=lambda e: QMessageBox.critical(None, "Error", f"Failed to search income record: {e}"),
+            busy_widget=self.table
+        )
+
+    def show_search_results(self, incomes, income_id):
+        self.delta.stop()   # the next refresh reloads the full listing
+        if incomes:
+            self.model.set_rows(incomes)
+        else:
+            QMessageBox.information(None, "Not Found", f"No income record found with ID {income_id}.")
+            self.model.clear()
 
     def refresh(self):
-        """Reload all income records, like SessionsPage refresh"""
-        self.load_income()
+        """Fetch only income recorded since the last load; reload if records were deleted"""
+        if self.delta.is_current():
+            return   # nothing written to the table since the last look
+        fetch = self.delta.fetch_call()
+        if fetch is None:
+            self.load_income()
+            return
+        self.executor.submit_call(
+            self.QUERY_KEY, fetch,
+            on_result=self.apply_delta,
+            on_error=lambda e: QMessageBox.critical(None, "Error", f"Failed to load income records: {e}")
+        )
+
+    def apply_delta(self, incomes):
+        if incomes is None:
+            self.load_income()
+        else:
+            self.model.prepend_rows(incomes)
+            self.delta.loaded()
@@ -0,0 +1,68 @@
+from PySide6.QtWidgets import QDialog, QMessageBox, QTableView, QHeaderView
+from widgits.ui_salesSync import Ui_Dialog
+from widgits.table_models import RowTableModel, Column, money
+
+
+class SalesSyncDialog(QDialog):
+    """
+    Journaled sales that need staff: synced with stock conflicts, or
+    rejected by the central database until they were marked failed.
+    Failed sales can be queued again once the cause is fixed.
+    """
+
+    COLUMNS = [
+        Column("Sold At", 1, lambda sold_at: f"{sold_at:%Y-%m-%d %H:%M}"),
+        Column("Status", 2, lambda status: status.title()),
+        Column("Items", 4),
+        Column("Total", 3, money),
+        Column("Attempts", 5),
+        Column("Details", 6),
+    ]
+
+    def __init__(self, parent=None, journal=None):
+        super().__init__(parent)
+        self.ui = Ui_Dialog()
+        self.ui.setupUi(self)
+        self.journal = journal
+
+        self.table = self.ui.tableView
+        self.model = RowTableModel(self.COLUMNS, parent=self.table)
+        self.table.setModel(self.model)
+        self.table.setSelectionBehavior(QTableView.SelectRows)
+        self.table.setAlternatingRowColors(True)
+        header = self.table.horizontalHeader()
+        for i in range(self.model.columnCount()):
+            header.setSectionResizeMode(i, QHeaderView.Stretch)
+
+        # Connect buttons
+        self.ui.pushButton_5.clicked.connect(self.retry_selected)     # Retry
+        self.ui.pushButton_6.clicked.connect(self.review_selected)    # Mark Reviewed
+        self.ui.pushButton_4.clicked.connect(self.reject)             # Close
+
+        self.load_issues()
+
+    def load_issues(self):
+        # The journal is a local file, so this never waits on the network
+        self.model.set_rows(self.journal.issues())
+        pending = self.journal.counts().get("pending", 0)
+        self.ui.label_2.setText(f"Sales waiting to sync: {pending}")
+
+    def selected(self):
+        return [self.model.row(index.row()) for index in self.table.selectionModel().selectedRows()]
+
+    def retry_selected(self):
+        rows = self.selected()
+        failed = [row[0] for row in rows if row[2] == "failed"]
+        if not failed:
+            QMessageBox.warning(self, "Retry", "Select one or more failed sales to retry")
+            return
+        self.journal.retry(failed)
+        self.load_issues()
+
+    def review_selected(self):
+        rows = self.selected()
+        if not rows:
+            QMessageBox.warning(self, "Mark Reviewed", "Select the sales you have dealt with")
+            return
+        self.journal.mark_reviewed([row[0] for row in rows])
+        self.load_issues()
@@ -1,16 +1,21 @@
-from PySide6.QtWidgets import QTableWidget, QTableWidgetItem, QMessageBox, QHeaderView
-from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QTableView, QMessageBox, QHeaderView
+from logic.queryExecutor import QueryExecutor
+from widgits.table_models import RowTableModel, Column, ymd, time_12h
 
 class SessionsPage:
+    QUERY_KEY = "sessions"
+    TABLES = ("WorkoutSessions", "UserWorkoutSessions", "Trainers", "Users")
+
     def __init__(self, ui, db):
         self.ui = ui
         self.db = db
+        self.executor = QueryExecutor.for_db(db)
 
         # Placeholder for search input
         self.ui.lineEdit_4.setPlaceholderText("Search by Session ID")
 
         # Find the table in the sessions page
-        self.table = self.ui.session.findChild(QTableWidget, "tableWidget_4")  # Replace with your table widget
+        self.table = self.ui.session.findChild(QTableView, "tableWidget_4")  # Replace with your table widget
         self.setup_table()
         self.load_sessions()
 
@@ -18,78 +23,61 @@ class SessionsPage:
         self.ui.pushButton_18.clicked.connect(self.search_session_by_id)  # Replace with your search button
 
     def setup_table(self):
-        headers = ["Session ID", "Title", "Trainer", "Date", "Start Time", "End Time", "Users", "Fee"]
-        self.table.setColumnCount(len(headers))
-        self.table.setHorizontalHeaderLabels(headers)
-
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.table.setSelectionMode(QTableWidget.SingleSelection)
+        self.model = RowTableModel([
+            Column("Session ID", 0),
+            Column("Title", 1),
+            Column("Trainer", (2, 3), lambda name, trainer_id: f"{name} (ID: {trainer_id})"),
+            Column("Date", 4, ymd),
+            Column("Start Time", 5, time_12h),
+            Column("End Time", 6, time_12h),
+            Column("Users", 7, lambda users: ", ".join(f"{name} (ID: {user_id})" for user_id, name in users)),
+            Column("Fee", 8, lambda fee: f"${fee:.2f}" if fee else "$0.00"),
+        ], parent=self.table)
+        self.table.setModel(self.model)
+
+        self.table.setSelectionBehavior(QTableView.SelectRows)
+        self.table.setSelectionMode(QTableView.SingleSelection)
         self.table.setAlternatingRowColors(True)
 
         header = self.table.horizontalHeader()
-        for i in range(len(headers)):
+        for i in range(self.model.columnCount()):
             header.setSectionResizeMode(i, QHeaderView.Stretch)
 
     def load_sessions(self):
-        """Load all sessions with trainer and enrolled users"""
-        try:
-            # Query to get session info, trainer info, fee, and enrolled users
-            query = """
-            SELECT ws.session_id, ws.title, t.trainer_id, t.name, ws.session_date, ws.start_time, ws.end_time, ws.entry_fee,
-                   u.user_id, u.name
-            FROM WorkoutSessions ws
-            JOIN Trainers t ON ws.trainer_id = t.trainer_id
-            LEFT JOIN UserWorkoutSessions uws ON ws.session_id = uws.session_id
-            LEFT JOIN Users u ON uws.user_id = u.user_id
-            ORDER BY ws.session_id DESC
-            """
-            self.db.cursor.execute(query)
-            sessions = self.db.cursor.fetchall()
-            self.populate_table(sessions)
-        except Exception as e:
-            QMessageBox.critical(None, "Error", f"Failed to load sessions: {str(e)}")
+        """Load all sessions with trainer and enrolled users in the background"""
+        # Query to get session info, trainer info, fee, and enrolled users
+        query = """
+        SELECT ws.session_id, ws.title, t.trainer_id, t.name, ws.session_date, ws.start_time, ws.end_time, ws.entry_fee,
+               u.user_id, u.name
+        FROM WorkoutSessions ws
+        JOIN Trainers t ON ws.trainer_id = t.trainer_id
+        LEFT JOIN UserWorkoutSessions uws ON ws.session_id = uws.session_id
+        LEFT JOIN Users u ON uws.user_id = u.user_id
+        ORDER BY ws.session_id DESC
+        """
+        self.executor.submit(
+            self.QUERY_KEY, query,
+            on_result=self.populate_table,
+            on_error=lambda e: QMessageBox.critical(None, "Error", f"Failed to load sessions: {e}"),
+            busy_widget=self.table
+        )
 
     def populate_table(self, sessions):
         """Fill the table with session data"""
-        self.table.setRowCount(0)
-        session_dict = {}
+        session_rows = {}
 
-        # Group users per session
+        # Group users per session; text is formatted by the model when drawn
         for session in sessions:
             session_id, title, trainer_id, trainer_name, session_date, start_time, end_time, fee, user_id, user_name = session
 
-            if session_id not in session_dict:
-                session_dict[session_id] = {
-                    "title": title,
-                    "trainer": f"{trainer_name} (ID: {trainer_id})",
-                    "date": session_date.strftime("%Y-%m-%d"),
-                    "start_time": start_time.strftime("%I:%M %p"),
-                    "end_time": end_time.strftime("%I:%M %p"),
-                    "fee": f"${fee:.2f}" if fee else "$0.00",
-                    "users": []
-                }
+            if session_id not in session_rows:
+                session_rows[session_id] = (
+                    session_id, title, trainer_name, trainer_id, session_date, start_time, end_time, [], fee
+                )
             if user_id:
-                session_dict[session_id]["users"].append(f"{user_name} (ID: {user_id})")
-
-        # Populate table
-        for row_num, (sid, data) in enumerate(session_dict.items()):
-            self.table.insertRow(row_num)
-            row_data = [
-                sid,
-                data["title"],
-                data["trainer"],
-                data["date"],
-                data["start_time"],
-                data["end_time"],
-                ", ".join(data["users"]),
-                data["fee"]
-            ]
-
-            for col_num, value in enumerate(row_data):
-                item = QTableWidgetItem(str(value) if value else "")
-                item.setTextAlignment(Qt.AlignCenter)
-                item.setFlags(item.flags() & ~Qt.ItemIsEditable)
-                self.table.setItem(row_num, col_num, item)
+                session_rows[session_id][7].append((user_id, user_name))
+
+        self.model.set_rows(list(session_rows.values()))
 
     def refresh(self):
         """Reload all sessions"""
@@ -107,23 +95,25 @@ class SessionsPage:
             QMessageBox.warning(None, "Invalid Input", "Please enter a valid numeric Session ID.")
             return
 
-        try:
-            query = """
-            SELECT ws.session_id, ws.title, t.trainer_id, t.name, ws.session_date, ws.start_time, ws.end_time, ws.entry_fee,
-                   u.user_id, u.name
-            FROM WorkoutSessions ws
-            JOIN Trainers t ON ws.trainer_id = t.trainer_id
-            LEFT JOIN UserWorkoutSessions uws ON ws.session_id = uws.session_id
-            LEFT JOIN Users u ON uws.user_id = u.user_id
-            WHERE ws.session_id = ?
-            """
-            self.db.cursor.execute(query, (int(session_id),))
-            sessions = self.db.cursor.fetchall()
-
-            if sessions:
-                self.populate_table(sessions)
-            else:
-                QMessageBox.information(None, "Not Found", f"No session found with ID {session_id}.")
-                self.table.setRowCount(0)
-        except Exception as e:
-            QMessageBox.critical(None, "Error", f"Failed to search sessions: {str(e)}")
+        query = """
+        SELECT ws.session_id, ws.title, t.trainer_id, t.name, ws.session_date, ws.start_time, ws.end_time, ws.entry_fee,
+               u.user_id, u.name
+        FROM WorkoutSessions ws
+        JOIN Trainers t ON ws.trainer_id = t.trainer_id
+        LEFT JOIN UserWorkoutSessions uws ON ws.session_id = uws.session_id
+        LEFT JOIN Users u ON uws.user_id = u.user_id
+        WHERE ws.session_id = ?
+        """
+        self.executor.submit(
+            self.QUERY_KEY, query, (int(session_id),),
+            on_result=lambda sessions: self.show_search_results(sessions, session_id),
+            on_error=lambda e: QMessageBox.critical(None, "Error", f"Failed to search sessions: {e}"),
+            busy_widget=self.table
+        )
+
+    def show_search_results(self, sessions, session_id):
+        if sessions:
+            self.populate_table(sessions)
+        else:
+            QMessageBox.information(None, "Not Found", f"No session found with ID {session_id}.")
+            self.model.clear()
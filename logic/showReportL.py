@@ -65,8 +65,7 @@ class ReportViewerDialog(QDialog):
             JOIN Employees e ON r.employee_id = e.employee_id
             WHERE r.report_id = ?
             """
-            self.db.cursor.execute(query, (self.report_id,))
-            report = self.db.cursor.fetchone()
+            report = self.db.fetchone(query, (self.report_id,))
 
             if not report:
                 msg = styled_message_box("Not Found", f"No report found with ID {self.report_id}", QMessageBox.Warning)
@@ -100,8 +99,7 @@ class ReportViewerDialog(QDialog):
 
         if reply == QMessageBox.StandardButton.Yes:
             try:
-                self.db.cursor.execute("DELETE FROM Reports WHERE report_id = ?", (self.report_id,))
-                self.db.connection.commit()
+                self.db.execute("DELETE FROM Reports WHERE report_id = ?", (self.report_id,))
 
                 msg = styled_message_box("Deleted", "Report deleted successfully", QMessageBox.Information)
                 msg.exec()
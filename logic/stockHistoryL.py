@@ -0,0 +1,46 @@
+from PySide6.QtWidgets import QDialog, QMessageBox, QTableView, QHeaderView
+from widgits.ui_stockHistory import Ui_Dialog
+from widgits.table_models import RowTableModel, Column
+from logic.queryExecutor import QueryExecutor
+from logic.stockLedger import stock_history
+
+
+class StockHistoryDialog(QDialog):
+    """An item's latest stock movements with the stock left after each"""
+    QUERY_KEY = "stock_history"
+
+    COLUMNS = [
+        Column("When", 0, lambda moved_at: f"{moved_at:%Y-%m-%d %H:%M}"),
+        Column("Kind", 1, lambda kind: kind.title()),
+        Column("Change", 2, lambda quantity: f"{quantity:+d}"),
+        Column("Stock After", 3),
+        Column("Sale ID", 4),
+    ]
+
+    def __init__(self, parent=None, db=None, supply_id=None, item_name=""):
+        super().__init__(parent)
+        self.ui = Ui_Dialog()
+        self.ui.setupUi(self)
+        self.db = db
+        self.supply_id = supply_id
+        self.executor = QueryExecutor.for_db(db)
+
+        self.ui.label_2.setText(f"{item_name} (ID {supply_id})")
+
+        self.table = self.ui.tableView
+        self.model = RowTableModel(self.COLUMNS, parent=self.table)
+        self.table.setModel(self.model)
+        self.table.setSelectionBehavior(QTableView.SelectRows)
+        self.table.setAlternatingRowColors(True)
+        header = self.table.horizontalHeader()
+        for i in range(self.model.columnCount()):
+            header.setSectionResizeMode(i, QHeaderView.Stretch)
+
+        self.ui.pushButton_4.clicked.connect(self.reject)   # Close
+
+        self.executor.submit_call(
+            self.QUERY_KEY, lambda: stock_history(self.db, self.supply_id),
+            on_result=self.model.set_rows,
+            on_error=lambda e: QMessageBox.critical(self, "Error", f"Failed to load stock history: {e}"),
+            busy_widget=self.table
+        )
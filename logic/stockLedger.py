@@ -0,0 +1,156 @@
+import threading
+import traceback
+from datetime import timedelta
+
+# StockMovements.kind
+SALE = "sale"
+RESTOCK = "restock"
+ADJUSTMENT = "adjustment"
+
+SNAPSHOT_INTERVAL = 600               # seconds between folds of the ledger into Supplies.quantity
+SNAPSHOT_LAG = timedelta(minutes=1)   # movements younger than this wait for the next fold
+HISTORY_LIMIT = 200                   # movements shown per item
+
+# Current stock of the Supplies row aliased s: the snapshot in s.quantity
+# plus every movement after the last one folded into it. The sum is a seek
+# on IX_StockMovements_Supply, which holds every column it reads.
+STOCK = """(s.quantity + COALESCE((
+    SELECT SUM(m.quantity) FROM StockMovements m
+    WHERE m.supply_id = s.supply_id AND m.movement_id > s.stock_movement_id
+), 0))"""
+
+
+def add_movements(cursor, rows):
+    """
+    Append StockMovements [(supply_id, quantity, kind, sale_id)] inside the
+    caller's transaction; quantity is signed (negative for stock going out).
+    Callers that must not oversell read stock_levels(lock=True) first.
+    """
+    if not rows:
+        return
+    # Stamped by the server when written, not with the sale time or a
+    # terminal's clock: the catalog watermark and the snapshot fold compare
+    # moved_at across terminals
+    cursor.executemany(
+        "INSERT INTO StockMovements (supply_id, moved_at, kind, quantity, sale_id) VALUES (?, GETDATE(), ?, ?, ?)",
+        [(supply_id, kind, quantity, sale_id) for supply_id, quantity, kind, sale_id in rows]
+    )
+
+
+def stock_levels(cursor, supply_ids, lock=False):
+    """
+    {supply_id: current stock} for the given items. With lock=True the
+    Supplies rows stay locked until the caller's transaction ends, so no
+    other writer taking the same lock can move their stock in between
+    the check and the movements written after it.
+    """
+    supply_ids = sorted(set(supply_ids))   # one lock order for every writer
+    if not supply_ids:
+        return {}
+    placeholders = ", ".join("?" for _ in supply_ids)
+    hints = " WITH (UPDLOCK, HOLDLOCK)" if lock else ""
+    cursor.execute(
+        f"SELECT s.supply_id, {STOCK} FROM Supplies s{hints} WHERE s.supply_id IN ({placeholders})",
+        supply_ids
+    )
+    return dict(cursor.fetchall())
+
+
+def take_snapshot(db, lag=SNAPSHOT_LAG, every=timedelta(seconds=SNAPSHOT_INTERVAL)):
+    """
+    Fold movements into Supplies.quantity so STOCK only has recent ones to
+    add up. Movements written within `lag` of the newest one are left for
+    a later fold, so one whose transaction is still open can never be
+    skipped. Both times come from the server's clock. Returns how many
+    items were folded.
+
+    Every terminal runs a SnapshotWorker. The stock_snapshot app lock lets
+    one fold at a time, and a fold is skipped while the last one, by any
+    terminal, covered movements up to less than `every` before this one
+    would, so the fleet folds about once per interval.
+    """
+    with db.transaction() as cursor:
+        if not db.backend.try_app_lock(cursor, "stock_snapshot"):
+            return 0
+        cursor.execute("""
+        SELECT m.moved_at FROM StockMovements m
+        WHERE m.movement_id = (SELECT MAX(stock_movement_id) FROM Supplies)
+        """)
+        row = cursor.fetchone()
+        folded_at = row[0] if row else None
+        cursor.execute("SELECT TOP 1 moved_at FROM StockMovements ORDER BY moved_at DESC")
+        row = cursor.fetchone()
+        if row is None:
+            return 0
+        cutoff = row[0] - lag
+        if folded_at is not None and cutoff - folded_at < every:
+            return 0
+        cursor.execute(
+            "SELECT TOP 1 movement_id FROM StockMovements WHERE moved_at < ? ORDER BY moved_at DESC, movement_id DESC",
+            (cutoff,)
+        )
+        row = cursor.fetchone()
+        if row is None:
+            return 0
+        upto = row[0]
+        cursor.execute("""
+        UPDATE Supplies
+        SET quantity = quantity + COALESCE((
+                SELECT SUM(m.quantity) FROM StockMovements m
+                WHERE m.supply_id = Supplies.supply_id
+                  AND m.movement_id > Supplies.stock_movement_id AND m.movement_id <= ?
+            ), 0),
+            stock_movement_id = ?
+        WHERE EXISTS (
+            SELECT 1 FROM StockMovements m
+            WHERE m.supply_id = Supplies.supply_id
+              AND m.movement_id > Supplies.stock_movement_id AND m.movement_id <= ?
+        )
+        """, (upto, upto, upto))
+        return cursor.rowcount
+
+
+def stock_history(db, supply_id, limit=HISTORY_LIMIT):
+    """
+    The item's latest movements, newest first, as (moved_at, kind, quantity,
+    stock after, sale_id). Stock after each one is worked back from the
+    current level.
+    """
+    with db.cursor() as cursor:
+        stock = stock_levels(cursor, [supply_id]).get(supply_id)
+        if stock is None:
+            return []
+        cursor.execute(f"""
+        SELECT TOP {int(limit)} moved_at, kind, quantity, sale_id
+        FROM StockMovements
+        WHERE supply_id = ?
+        ORDER BY movement_id DESC
+        """, (supply_id,))
+        movements = cursor.fetchall()
+
+    rows = []
+    for moved_at, kind, quantity, sale_id in movements:
+        rows.append((moved_at, kind, quantity, stock, sale_id))
+        stock -= quantity
+    return rows
+
+
+class SnapshotWorker(threading.Thread):
+    """Folds the stock ledger into Supplies every SNAPSHOT_INTERVAL"""
+
+    def __init__(self, db, interval=SNAPSHOT_INTERVAL):
+        super().__init__(name="stock-snapshot", daemon=True)
+        self.db = db
+        self.interval = interval
+        self._stopped = threading.Event()
+        db.reserve()   # folds on its own connection
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                take_snapshot(self.db, every=timedelta(seconds=self.interval))
+            except Exception:
+                traceback.print_exc()
+
+    def stop(self):
+        self._stopped.set()
@@ -1,16 +1,21 @@
-from PySide6.QtWidgets import QWidget, QTableWidget, QTableWidgetItem, QMessageBox, QHeaderView
-from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QWidget, QTableView, QMessageBox, QHeaderView
+from logic.queryExecutor import QueryExecutor
+from widgits.table_models import RowTableModel, Column
 
 class SuppliersPage:
+    QUERY_KEY = "suppliers"
+    TABLES = ("Suppliers",)
+
     def __init__(self, ui, db):
         self.ui = ui
         self.db = db
+        self.executor = QueryExecutor.for_db(db)
 
         # Set placeholder text for lineEdit_3
         self.ui.lineEdit_3.setPlaceholderText("Search by Supplier ID")
 
         # Find the table widget in the suppliers page
-        self.table = self.ui.suppliers.findChild(QTableWidget, "tableWidget_3")
+        self.table = self.ui.suppliers.findChild(QTableView, "tableWidget_3")
         self.setup_table()
         self.load_suppliers()
 
@@ -18,42 +23,39 @@ class SuppliersPage:
         self.ui.pushButton_12.clicked.connect(self.search_supplier_by_id)
 
     def setup_table(self):
-        headers = ["ID", "Name", "Email", "Phone"]
-        self.table.setColumnCount(len(headers))
-        self.table.setHorizontalHeaderLabels(headers)
+        self.model = RowTableModel([
+            Column("ID", 0),
+            Column("Name", 1),
+            Column("Email", 2),
+            Column("Phone", 3),
+        ], parent=self.table)
+        self.table.setModel(self.model)
 
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.table.setSelectionMode(QTableWidget.SingleSelection)
+        self.table.setSelectionBehavior(QTableView.SelectRows)
+        self.table.setSelectionMode(QTableView.SingleSelection)
         self.table.setAlternatingRowColors(True)
 
         header = self.table.horizontalHeader()
-        for i in range(len(headers)):
+        for i in range(self.model.columnCount()):
             header.setSectionResizeMode(i, QHeaderView.Stretch)
 
     def load_suppliers(self):
-        """Load all suppliers"""
-        try:
-            query = """
-            SELECT supplier_id, name, email, phone
-            FROM Suppliers
-            ORDER BY supplier_id DESC
-            """
-            self.db.cursor.execute(query)
-            suppliers = self.db.cursor.fetchall()
-            self.populate_table(suppliers)
-        except Exception as e:
-            QMessageBox.critical(None, "Error", f"Failed to load suppliers: {str(e)}")
+        """Load all suppliers in the background"""
+        query = """
+        SELECT supplier_id, name, email, phone
+        FROM Suppliers
+        ORDER BY supplier_id DESC
+        """
+        self.executor.submit(
+            self.QUERY_KEY, query,
+            on_result=self.populate_table,
+            on_error=lambda e: QMessageBox.critical(None, "Error", f"Failed to load suppliers: {e}"),
+            busy_widget=self.table
+        )
 
     def populate_table(self, suppliers):
         """Fill the table with given supplier data"""
-        self.table.setRowCount(0)
-        for row_num, supplier in enumerate(suppliers):
-            self.table.insertRow(row_num)
-            for col_num, value in enumerate(supplier):
-                item = QTableWidgetItem(str(value) if value is not None else "")
-                item.setTextAlignment(Qt.AlignCenter)
-                item.setFlags(item.flags() & ~Qt.ItemIsEditable)  # Read-only
-                self.table.setItem(row_num, col_num, item)
+        self.model.set_rows(suppliers)
 
     def refresh(self):
         """Reload all suppliers"""
@@ -71,15 +73,17 @@ class SuppliersPage:
             QMessageBox.warning(None, "Invalid Input", "Please enter a valid numeric supplier ID.")
             return
 
-        try:
-            query = "SELECT supplier_id, name, email, phone FROM Suppliers WHERE supplier_id = ?"
-            self.db.cursor.execute(query, (int(supplier_id),))
-            supplier = self.db.cursor.fetchall()
-
-            if supplier:
-                self.populate_table(supplier)
-            else:
-                QMessageBox.information(None, "Not Found", f"No supplier found with ID {supplier_id}.")
-                self.table.setRowCount(0)
-        except Exception as e:
-            QMessageBox.critical(None, "Error", f"Failed to search supplier: {str(e)}")
+        query = "SELECT supplier_id, name, email, phone FROM Suppliers WHERE supplier_id = ?"
+        self.executor.submit(
+            self.QUERY_KEY, query, (int(supplier_id),),
+            on_result=lambda supplier: self.show_search_results(supplier, supplier_id),
+            on_error=lambda e: QMessageBox.critical(None, "Error", f"Failed to search supplier: {e}"),
+            busy_widget=self.table
+        )
+
+    def show_search_results(self, supplier, supplier_id):
+        if supplier:
+            self.populate_table(supplier)
+        else:
+            QMessageBox.information(None, "Not Found", f"No supplier found with ID {supplier_id}.")
+            self.model.clear()
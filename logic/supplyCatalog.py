@@ -0,0 +1,135 @@
+import re
+from bisect import bisect_left, insort
+from datetime import timedelta
+
+from logic.stockLedger import STOCK
+
+_TOKEN = re.compile(r"\w+")
+
+
+def tokenize(text):
+    return _TOKEN.findall(text.lower())
+
+
+class SupplyCatalog:
+    """
+    In-memory copy of Supplies for the sale point, with a token prefix index
+    over item_name so searches never leave the terminal.
+
+    Rows are (supply_id, item_name, price, stock), the shape the items
+    table already displays; stock is the current level (snapshot plus
+    movements). fetch_changes() does the database work and is safe to run
+    on a worker thread; apply() updates the catalog and must run on the GUI
+    thread, which is also the only thread that reads it.
+    """
+
+    COLUMNS = f"s.supply_id, s.item_name, s.price, {STOCK}, s.modified_at"
+
+    # Re-read rows modified this long before the watermark, to catch writes
+    # whose transaction committed after a later timestamp was already seen
+    OVERLAP = timedelta(seconds=5)
+
+    def __init__(self, db):
+        self.db = db
+        self.items = {}         # supply_id -> row
+        self._postings = {}     # token -> set of supply_ids
+        self._tokens = []       # sorted keys of _postings, for prefix lookups
+        self.watermark = None   # newest modified_at seen
+        self.moved_mark = None  # newest StockMovements.moved_at seen
+
+    # ----- Loading (worker thread) -----
+    def fetch_changes(self):
+        """
+        Return (full, rows, moved_at): everything on first use, otherwise the
+        items whose Supplies row was modified or whose stock moved since the
+        watermarks. moved_at is the newest stock movement at the time.
+        """
+        with self.db.cursor() as cursor:
+            # Read before the rows, so a movement landing in between is caught next time
+            cursor.execute("SELECT TOP 1 moved_at FROM StockMovements ORDER BY moved_at DESC")
+            row = cursor.fetchone()
+            moved_at = row[0] if row else None
+            if self.watermark is None:
+                cursor.execute(f"SELECT {self.COLUMNS} FROM Supplies s")
+                return True, cursor.fetchall(), moved_at
+            cursor.execute(f"""
+            SELECT {self.COLUMNS} FROM Supplies s
+            WHERE s.modified_at >= ?
+               OR s.supply_id IN (SELECT supply_id FROM StockMovements WHERE moved_at >= ?)
+            """, (self.watermark - self.OVERLAP, (self.moved_mark or self.watermark) - self.OVERLAP))
+            return False, cursor.fetchall(), moved_at
+
+    # ----- Updating (GUI thread) -----
+    def apply(self, changes):
+        """Merge rows from fetch_changes(); returns the supply_ids that changed"""
+        full, rows, moved_at = changes
+        if full:
+            self.items, self._postings, self._tokens = {}, {}, []
+
+        changed = []
+        for supply_id, name, price, stock, modified_at in rows:
+            row = (supply_id, name, price, stock)
+            if self.items.get(supply_id) != row:
+                self._put(row)
+                changed.append(supply_id)
+            if modified_at is not None and (self.watermark is None or modified_at > self.watermark):
+                self.watermark = modified_at
+        if moved_at is not None and (self.moved_mark is None or moved_at > self.moved_mark):
+            self.moved_mark = moved_at
+        return changed
+
+    def set_stock(self, supply_id, quantity):
+        """Patch a stock count locally with a value a write on this terminal returned"""
+        row = self.items.get(supply_id)
+        if row is not None:
+            self.items[supply_id] = row[:3] + (quantity,)
+
+    def _put(self, row):
+        supply_id = row[0]
+        old = self.items.get(supply_id)
+        if old is not None and old[1] != row[1]:
+            self._unindex(supply_id, old[1])
+        if old is None or old[1] != row[1]:
+            self._index(supply_id, row[1])
+        self.items[supply_id] = row
+
+    def _index(self, supply_id, name):
+        for token in set(tokenize(name)):
+            if token not in self._postings:
+                self._postings[token] = set()
+                insort(self._tokens, token)
+            self._postings[token].add(supply_id)
+
+    def _unindex(self, supply_id, name):
+        for token in set(tokenize(name)):
+            ids = self._postings.get(token)
+            if ids is None:
+                continue
+            ids.discard(supply_id)
+            if not ids:
+                del self._postings[token]
+                del self._tokens[bisect_left(self._tokens, token)]
+
+    # ----- Reading (GUI thread) -----
+    def get(self, supply_id):
+        return self.items.get(supply_id)
+
+    def _prefix_matches(self, prefix):
+        ids = set()
+        i = bisect_left(self._tokens, prefix)
+        while i < len(self._tokens) and self._tokens[i].startswith(prefix):
+            ids |= self._postings[self._tokens[i]]
+            i += 1
+        return ids
+
+    def search(self, text=""):
+        """Rows whose name has a word starting with every word of text, ordered by name"""
+        ids = None
+        for prefix in tokenize(text):
+            matches = self._prefix_matches(prefix)
+            ids = matches if ids is None else ids & matches
+            if not ids:
+                return []
+
+        rows = self.items.values() if ids is None else (self.items[i] for i in ids)
+        return sorted(rows, key=lambda row: row[1].lower())
@@ -2,6 +2,8 @@ from PySide6.QtWidgets import QDialog, QMessageBox
 from widgits.ui_toolsRS import Ui_Dialog  # Replace with your actual UI file
 from PySide6.QtCore import QTime, QDate
 from datetime import datetime
+from logic.bookkeeping import add_income
+from schema import IncomeSource
 
 class AddToolReservationDialog(QDialog):
     HOUR_COST = 5  # $5 per hour
@@ -30,8 +32,7 @@ class AddToolReservationDialog(QDialog):
         """Load all tool names into the combo box"""
         try:
             query = "SELECT tool_id, name FROM Tools"
-            self.db.cursor.execute(query)
-            tools = self.db.cursor.fetchall()
+            tools = self.db.fetchall(query)
             self.ui.comboBox.clear()
             for tool_id, name in tools:
                 self.ui.comboBox.addItem(name, tool_id)
@@ -71,8 +72,7 @@ class AddToolReservationDialog(QDialog):
         user_id = int(user_id_text)
 
         # Check user exists
-        self.db.cursor.execute("SELECT COUNT(*) FROM Users WHERE user_id = ?", (user_id,))
-        if self.db.cursor.fetchone()[0] == 0:
+        if self.db.fetchone("SELECT COUNT(*) FROM Users WHERE user_id = ?", (user_id,))[0] == 0:
             QMessageBox.warning(self, "Validation Error", "User does not exist")
             self.ui.lineEdit.setFocus()
             return None
@@ -123,38 +123,33 @@ class AddToolReservationDialog(QDialog):
                  OR (start_time >= ? AND end_time <= ?) -- fully inside
               )
             """
-            self.db.cursor.execute(overlap_query, (
+            overlaps = self.db.fetchone(overlap_query, (
                 data['tool_id'],
                 data['reservation_date'],
                 data['end_time'], data['start_time'],
                 data['end_time'], data['start_time'],
                 data['start_time'], data['end_time']
-            ))
-            if self.db.cursor.fetchone()[0] > 0:
+            ))[0]
+            if overlaps > 0:
                 QMessageBox.warning(self, "Conflict", "This tool is already reserved during the selected time.")
                 return
 
-            # Insert reservation
-            insert_query = """
-            INSERT INTO ToolReservations (user_id, tool_id, reservation_date, start_time, end_time)
-            VALUES (?, ?, ?, ?, ?)
-            """
-            self.db.cursor.execute(insert_query, (
-                data['user_id'],
-                data['tool_id'],
-                data['reservation_date'],
-                data['start_time'],
-                data['end_time']
-            ))
-            self.db.connection.commit()
-
-            # Log income
-            income_query = """
-                INSERT INTO Income (source, amount, income_date)
-                VALUES (?, ?, ?)
-            """
-            self.db.cursor.execute(income_query, ("toolRS", data['total_cost'], datetime.now()))
-            self.db.connection.commit()
+            with self.db.transaction() as cursor:
+                # Insert reservation
+                insert_query = """
+                INSERT INTO ToolReservations (user_id, tool_id, reservation_date, start_time, end_time)
+                VALUES (?, ?, ?, ?, ?)
+                """
+                cursor.execute(insert_query, (
+                    data['user_id'],
+                    data['tool_id'],
+                    data['reservation_date'],
+                    data['start_time'],
+                    data['end_time']
+                ))
+
+                # Log income
+                add_income(cursor, IncomeSource.TOOL_RESERVATION, data['total_cost'], datetime.now())
 
             QMessageBox.information(self, "Success", f"Reservation added! Total cost: ${data['total_cost']:.2f}")
             self.accept()
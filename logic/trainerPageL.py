@@ -1,16 +1,21 @@
-from PySide6.QtWidgets import QWidget, QTableWidget, QTableWidgetItem, QPushButton, QMessageBox, QHeaderView
-from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QWidget, QTableView, QPushButton, QMessageBox, QHeaderView
+from logic.queryExecutor import QueryExecutor
+from widgits.table_models import RowTableModel, Column
 
 class TrainersPage:
+    QUERY_KEY = "trainers"
+    TABLES = ("Trainers",)
+
     def __init__(self, ui, db):
         self.ui = ui
         self.db = db
+        self.executor = QueryExecutor.for_db(db)
 
         # Placeholder for search input
         self.ui.lineEdit_2.setPlaceholderText("Search by Trainer ID")
 
         # Find the table in the trainers page
-        self.table = self.ui.trainers.findChild(QTableWidget, "tableWidget_2")
+        self.table = self.ui.trainers.findChild(QTableView, "tableWidget_2")
   # Adjust to your table name
         self.setup_table()
         self.load_trainers()
@@ -19,44 +24,40 @@ class TrainersPage:
         self.ui.pushButton_9.clicked.connect(self.search_trainer_by_id)  # Adjust to your search button
 
     def setup_table(self):
-        headers = ["ID", "Name", "Gender", "Phone", "Specialization"]
-        self.table.setColumnCount(len(headers))
-        self.table.setHorizontalHeaderLabels(headers)
+        self.model = RowTableModel([
+            Column("ID", 0),
+            Column("Name", 1),
+            Column("Gender", 2),
+            Column("Phone", 3),
+            Column("Specialization", 4),
+        ], parent=self.table)
+        self.table.setModel(self.model)
 
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.table.setSelectionMode(QTableWidget.SingleSelection)
+        self.table.setSelectionBehavior(QTableView.SelectRows)
+        self.table.setSelectionMode(QTableView.SingleSelection)
         self.table.setAlternatingRowColors(True)
 
         header = self.table.horizontalHeader()
-        for i in range(len(headers)):
+        for i in range(self.model.columnCount()):
             header.setSectionResizeMode(i, QHeaderView.Stretch)
 
     def load_trainers(self):
-        """Load all trainers"""
-        try:
-            query = """
-            SELECT trainer_id, name, gender, phone, specialization
-            FROM Trainers
-            ORDER BY trainer_id DESC
-            """
-            self.db.cursor.execute(query)
-            trainers = self.db.cursor.fetchall()
-            self.populate_table(trainers)
-        except Exception as e:
-            QMessageBox.critical(None, "Error", f"Failed to load trainers: {str(e)}")
+        """Load all trainers in the background"""
+        query = """
+        SELECT trainer_id, name, gender, phone, specialization
+        FROM Trainers
+        ORDER BY trainer_id DESC
+        """
+        self.executor.submit(
+            self.QUERY_KEY, query,
+            on_result=self.populate_table,
+            on_error=lambda e: QMessageBox.critical(None, "Error", f"Failed to load trainers: {e}"),
+            busy_widget=self.table
+        )
 
     def populate_table(self, trainers):
         """Fill the table with the given data"""
-        self.table.setRowCount(0)
-        for row_num, trainer in enumerate(trainers):
-            self.table.insertRow(row_num)
-            trainer_id, name, gender, phone, specialization = trainer
-
-            for col_num, value in enumerate([trainer_id, name, gender, phone, specialization]):
-                item = QTableWidgetItem(str(value) if value is not None else "")
-                item.setTextAlignment(Qt.AlignCenter)
-                item.setFlags(item.flags() & ~Qt.ItemIsEditable)
-                self.table.setItem(row_num, col_num, item)
+        self.model.set_rows(trainers)
 
     def refresh(self):
         """Reload all trainers"""
@@ -73,19 +74,21 @@ class TrainersPage:
             QMessageBox.warning(None, "Invalid Input", "Please enter a valid numeric Trainer ID.")
             return
 
-        try:
-            query = """
-            SELECT trainer_id, name, gender, phone, specialization
-            FROM Trainers
-            WHERE trainer_id = ?
-            """
-            self.db.cursor.execute(query, (int(trainer_id),))
-            trainers = self.db.cursor.fetchall()
+        query = """
+        SELECT trainer_id, name, gender, phone, specialization
+        FROM Trainers
+        WHERE trainer_id = ?
+        """
+        self.executor.submit(
+            self.QUERY_KEY, query, (int(trainer_id),),
+            on_result=lambda trainers: self.show_search_results(trainers, trainer_id),
+            on_error=lambda e: QMessageBox.critical(None, "Error", f"Failed to search trainer: {e}"),
+            busy_widget=self.table
+        )
 
-            if trainers:
-                self.populate_table(trainers)
-            else:
-                QMessageBox.information(None, "Not Found", f"No trainer found with ID {trainer_id}.")
-                self.table.setRowCount(0)
-        except Exception as e:
-            QMessageBox.critical(None, "Error", f"Failed to search trainer: {str(e)}")
+    def show_search_results(self, trainers, trainer_id):
+        if trainers:
+            self.populate_table(trainers)
+        else:
+            QMessageBox.information(None, "Not Found", f"No trainer found with ID {trainer_id}.")
+            self.model.clear()
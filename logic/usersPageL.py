@@ -1,17 +1,22 @@
-from PySide6.QtWidgets import QTableWidget, QTableWidgetItem, QPushButton, QMessageBox, QHeaderView
-from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QTableView, QPushButton, QMessageBox, QHeaderView
+from logic.queryExecutor import QueryExecutor
+from widgits.table_models import RowTableModel, Column, text, ymd
 from datetime import date
 
 class UsersPage:
+    QUERY_KEY = "users"
+    TABLES = ("Users", "CurrentMemberships", "UserMemberships", "Memberships")
+
     def __init__(self, ui, db):
         self.ui = ui
         self.db = db
+        self.executor = QueryExecutor.for_db(db)
 
         # Placeholder for search input
         self.ui.lineEdit.setPlaceholderText("Search by User ID")
 
         # Find the table in the users page
-        self.table = self.ui.users.findChild(QTableWidget, "tableWidget")  # Replace with your actual table name
+        self.table = self.ui.users.findChild(QTableView, "tableWidget")  # Replace with your actual table name
         self.setup_table()
         self.load_users()
 
@@ -19,42 +24,42 @@ class UsersPage:
         self.ui.pushButton_7.clicked.connect(self.search_user_by_id)  # Search button
 
     def setup_table(self):
-        headers = ["ID", "Name", "Age", "Gender", "Membership Type", "Available Till", "Registration Date"]
-        self.table.setColumnCount(len(headers))
-        self.table.setHorizontalHeaderLabels(headers)
-
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.table.setSelectionMode(QTableWidget.SingleSelection)
+        self.model = RowTableModel([
+            Column("ID", 0),
+            Column("Name", 1),
+            Column("Age", 2, lambda dob: text(self.calculate_age(dob))),
+            Column("Gender", 3),
+            Column("Membership Type", 5),
+            Column("Available Till", 6, ymd),
+            Column("Registration Date", 4, ymd),
+        ], parent=self.table)
+        self.table.setModel(self.model)
+
+        self.table.setSelectionBehavior(QTableView.SelectRows)
+        self.table.setSelectionMode(QTableView.SingleSelection)
         self.table.setAlternatingRowColors(True)
 
         header = self.table.horizontalHeader()
-        for i in range(len(headers)):
+        for i in range(self.model.columnCount()):
             header.setSectionResizeMode(i, QHeaderView.Stretch)
 
     def load_users(self):
-        """Load all users and their latest membership info"""
-        try:
-            # Query to get user info along with newest membership (if exists)
-            query = """
-            SELECT u.user_id, u.name, u.date_of_birth, u.gender, u.registration_date,
-                   m.type, um.end_date
-            FROM Users u
-            LEFT JOIN (
-                SELECT um1.user_id, um1.membership_id, um1.start_date, um1.end_date
-                FROM UserMemberships um1
-                WHERE um1.end_date = (
-                    SELECT MAX(end_date) FROM UserMemberships um2
-                    WHERE um2.user_id = um1.user_id
-                )
-            ) um ON u.user_id = um.user_id
-            LEFT JOIN Memberships m ON um.membership_id = m.membership_id
-            ORDER BY u.user_id DESC
-            """
-            self.db.cursor.execute(query)
-            users = self.db.cursor.fetchall()
-            self.populate_table(users)
-        except Exception as e:
-            QMessageBox.critical(None, "Error", f"Failed to load users: {str(e)}")
+        """Load all users and their latest membership info in the background"""
+        # One CurrentMemberships row per user holds the membership ending last (if any)
+        query = """
+        SELECT u.user_id, u.name, u.date_of_birth, u.gender, u.registration_date,
+               m.type, um.end_date
+        FROM Users u
+        LEFT JOIN CurrentMemberships um ON u.user_id = um.user_id
+        LEFT JOIN Memberships m ON um.membership_id = m.membership_id
+        ORDER BY u.user_id DESC
+        """
+        self.executor.submit(
+            self.QUERY_KEY, query,
+            on_result=self.populate_table,
+            on_error=lambda e: QMessageBox.critical(None, "Error", f"Failed to load users: {e}"),
+            busy_widget=self.table
+        )
 
     def calculate_age(self, dob):
         """Calculate age in years from date of birth"""
@@ -66,22 +71,7 @@ class UsersPage:
 
     def populate_table(self, users):
         """Fill the table with the given data"""
-        self.table.setRowCount(0)
-        for row_num, user in enumerate(users):
-            self.table.insertRow(row_num)
-            user_id, name, dob, gender, reg_date, membership_type, available_till = user
-
-            age = self.calculate_age(dob) if dob else ""
-            membership_type = membership_type if membership_type else ""
-            available_till_str = available_till.strftime("%Y-%m-%d") if available_till else ""
-
-            row_data = [user_id, name, age, gender, membership_type, available_till_str, reg_date.strftime("%Y-%m-%d")]
-
-            for col_num, value in enumerate(row_data):
-                item = QTableWidgetItem(str(value) if value is not None else "")
-                item.setTextAlignment(Qt.AlignCenter)
-                item.setFlags(item.flags() & ~Qt.ItemIsEditable)
-                self.table.setItem(row_num, col_num, item)
+        self.model.set_rows(users)
 
     def refresh(self):
         """Reload all users"""
@@ -98,29 +88,24 @@ class UsersPage:
             QMessageBox.warning(None, "Invalid Input", "Please enter a valid numeric User ID.")
             return
 
-        try:
-            query = """
-            SELECT u.user_id, u.name, u.date_of_birth, u.gender, u.registration_date,
-                   m.type, um.end_date
-            FROM Users u
-            LEFT JOIN (
-                SELECT um1.user_id, um1.membership_id, um1.start_date, um1.end_date
-                FROM UserMemberships um1
-                WHERE um1.end_date = (
-                    SELECT MAX(end_date) FROM UserMemberships um2
-                    WHERE um2.user_id = um1.user_id
-                )
-            ) um ON u.user_id = um.user_id
-            LEFT JOIN Memberships m ON um.membership_id = m.membership_id
-            WHERE u.user_id = ?
-            """
-            self.db.cursor.execute(query, (int(user_id),))
-            users = self.db.cursor.fetchall()
-
-            if users:
-                self.populate_table(users)
-            else:
-                QMessageBox.information(None, "Not Found", f"No user found with ID {user_id}.")
-                self.table.setRowCount(0)
-        except Exception as e:
-            QMessageBox.critical(None, "Error", f"Failed to search user: {str(e)}")
+        query = """
+        SELECT u.user_id, u.name, u.date_of_birth, u.gender, u.registration_date,
+               m.type, um.end_date
+        FROM Users u
+        LEFT JOIN CurrentMemberships um ON u.user_id = um.user_id
+        LEFT JOIN Memberships m ON um.membership_id = m.membership_id
+        WHERE u.user_id = ?
+        """
+        self.executor.submit(
+            self.QUERY_KEY, query, (int(user_id),),
+            on_result=lambda users: self.show_search_results(users, user_id),
+            on_error=lambda e: QMessageBox.critical(None, "Error", f"Failed to search user: {e}"),
+            busy_widget=self.table
+        )
+
+    def show_search_results(self, users, user_id):
+        if users:
+            self.populate_table(users)
+        else:
+            QMessageBox.information(None, "Not Found", f"No user found with ID {user_id}.")
+            self.model.clear()
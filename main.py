@@ -24,14 +24,16 @@ secret_key = config.get("APP", "SECRET_KEY")
 
 from PySide6.QtWidgets import QApplication, QStackedWidget, QMainWindow, QMessageBox , QLabel 
 from PySide6.QtGui import QPixmap, Qt
+from PySide6.QtCore import QTimer
 
 from logic.LoginL import LoginWindow
-from logic.expensesPageL import ExpensesPage
 from widgits.ui_adminMain import Ui_MainWindow1 as Ui_Admin
 from widgits.ui_helpDeskMain import Ui_MainWindow as Ui_HelpDesk
 from widgits.ui_cashierMain import Ui_MainWindow as Ui_CashierMain
 
 from db import DatabaseConnection
+from logic.queryExecutor import QueryExecutor
+from logic.pageRegistry import PageRegistry
 from PySide6.QtGui import QIcon
 
 BASE_PATH = os.path.dirname(os.path.abspath(__file__))
@@ -42,11 +44,35 @@ app.setApplicationName("Gym System")
 stack = QStackedWidget()
 
 # ---------- Database Connection ----------
+# Login and the sale point's first catalog load read the central database,
+# so a terminal must reach it to start. Only a till that is already running
+# keeps selling through an outage, by journaling (see logic.salesJournal).
 
 db = DatabaseConnection()
-if not db.connection or not db.cursor:
-    QMessageBox.critical(None, "Error", "Failed to connect to database!")
-    sys.exit(1)
+while not db.is_connected():
+    # A network blip at startup shouldn't kill the till; let the user retry
+    reply = QMessageBox.critical(
+        None, "Error", "Failed to connect to database!",
+        QMessageBox.StandardButton.Retry | QMessageBox.StandardButton.Close
+    )
+    if reply != QMessageBox.StandardButton.Retry:
+        sys.exit(1)
+    db.connect()
+
+# ---------- Sales journal ----------
+# Sales the database cannot take when they are rung up are journaled locally and forwarded in the background
+from logic.salesJournal import SalesJournal, SalesSyncWorker, SYNC_INTERVAL
+sales_journal = SalesJournal()
+sales_sync = SalesSyncWorker(sales_journal, db)
+sales_sync.start()
+app.aboutToQuit.connect(sales_sync.stop)
+
+# Stock levels are a snapshot plus ledger movements; the snapshot is brought forward
+# periodically by whichever terminal's worker gets there first
+from logic.stockLedger import SnapshotWorker
+stock_snapshots = SnapshotWorker(db)
+stock_snapshots.start()
+app.aboutToQuit.connect(stock_snapshots.stop)
 
 
 
@@ -78,94 +104,66 @@ QPushButton {
 }
 """
 
-# ---------- Pages ----------
-admin_page = QMainWindow()
-admin_ui = Ui_Admin()
-admin_ui.setupUi(admin_page)
-
-helpdesk_page = QMainWindow()
-helpdesk_ui = Ui_HelpDesk()
-helpdesk_ui.setupUi(helpdesk_page)
-
-cashier_page = QMainWindow()
-cashier_ui = Ui_CashierMain()
-cashier_ui.setupUi(cashier_page)
-
-ADMIN_NAV = [
-    admin_ui.pushButton_2,  # Sales
-    admin_ui.pushButton_3,  # Employee
-    admin_ui.pushButton_10, # Expenses
-    admin_ui.pushButton_5,  # Reports
-    admin_ui.pushButton_6,  # HelpDesk
-    admin_ui.pushButton_4,  # Cashier
-]
-HELPDESK_NAV = [
-    helpdesk_ui.pushButton_3,  # Users
-    helpdesk_ui.pushButton_5,  # Trainers
-    helpdesk_ui.pushButton_11, # Session
-    helpdesk_ui.pushButton_6   # Tools
-]
-CASHIER_NAV = [
-    cashier_ui.pushButton_7,  # Main (Cashier work)
-    cashier_ui.pushButton_3,  # Goods
-    cashier_ui.pushButton_5,  # Suppliers
-]
-
-login_page = LoginWindow(
-    db=db,
-    stack=stack,
-    admin_page=admin_page,
-    cashier_page=cashier_page,
-    helpdesk_page=helpdesk_page,
-    admin_ui=admin_ui,
-    cashier_ui=cashier_ui,
-    helpdesk_ui=helpdesk_ui,
-    ADMIN_NAV=ADMIN_NAV,
-    CASHIER_NAV=CASHIER_NAV,
-    HELPDESK_NAV=HELPDESK_NAV,
-    NORMAL_STYLE=NORMAL_STYLE,
-    ACTIVE_STYLE=ACTIVE_STYLE
-)
+# ---------- Role windows ----------
+# Windows each role can reach; only these are built, after login
+ROLE_WINDOWS = {
+    "admin": ["admin", "helpdesk", "cashier"],
+    "cashier": ["cashier"],
+    "helpdesk": ["helpdesk"],
+}
 
-#Instance
+admin_page = admin_ui = None
+helpdesk_page = helpdesk_ui = None
+cashier_page = cashier_ui = None
 
-from logic.employeePageL import EmployeesPage
-employees_page = EmployeesPage(admin_ui, db, current_system_user_id=None)
+ADMIN_NAV = []
+HELPDESK_NAV = []
+CASHIER_NAV = []
 
-from logic.goodsPageL import GoodsPage
-goods_page = GoodsPage(cashier_ui, db)       
+login_page = LoginWindow(db=db)
 
-from logic.salePointL import SalePointPage
-sale_point_page = SalePointPage(cashier_ui, db)
+#Instance
 
-from logic.suppliersPageL import SuppliersPage
-suppliers_page = SuppliersPage(cashier_ui, db)
+# Page loads run in the background; navigating away drops the old page's pending load
+query_executor = QueryExecutor.for_db(db)
 
-from logic.addSameGoodL import AddSameGoodDialog
-add_same_good_dialog = AddSameGoodDialog(db=db)
+# Committed writes are announced on the change bus; pages on screen reload from it
+from logic.changeBus import ChangeBus
+change_bus = ChangeBus()
+db.add_write_listener(change_bus.publish)
 
+# Writes from other terminals are picked up by polling table watermarks
+from logic.changePoller import ChangePoller
+change_poller = ChangePoller(db, change_bus.watched, [query_executor.cache.invalidate, change_bus.publish])
+db.add_write_listener(change_poller.local_write)
+change_poller.start()
+app.aboutToQuit.connect(change_poller.stop)
 
+# Pages are built (and run their first query) when first shown, not at startup
+from logic.employeePageL import EmployeesPage
+from logic.goodsPageL import GoodsPage
+from logic.salePointL import SalePointPage
+from logic.suppliersPageL import SuppliersPage
 from logic.expensesPageL import ExpensesPage
-expenses_page = ExpensesPage(admin_ui, db)  
-
 from logic.reportsPageL import ReportsPage
-reports_page = ReportsPage(admin_ui, db)
-
 from logic.salesPageL import SalesPage
-sales_page = SalesPage(admin_ui, db)
-
-
 from logic.trainerPageL import TrainersPage
-trainers_page = TrainersPage(helpdesk_ui, db)
-
 from logic.usersPageL import UsersPage
-users_page = UsersPage(helpdesk_ui, db)
-
 from logic.toolsPageL import ToolsPage
-tools_page = ToolsPage(helpdesk_ui, db)
-
-from logic.sessionPageL import SessionsPage  
-sessions_page = SessionsPage(helpdesk_ui, db)
+from logic.sessionPageL import SessionsPage
+
+pages = PageRegistry(bus=change_bus)
+pages.register("employees", lambda: EmployeesPage(admin_ui, db, current_system_user_id=current_system_user_id))
+pages.register("expenses", lambda: ExpensesPage(admin_ui, db))
+pages.register("reports", lambda: ReportsPage(admin_ui, db))
+pages.register("sales", lambda: SalesPage(admin_ui, db))
+pages.register("goods", lambda: GoodsPage(cashier_ui, db))
+pages.register("sale_point", lambda: SalePointPage(cashier_ui, db, sales_journal, current_system_user_id=current_system_user_id))
+pages.register("suppliers", lambda: SuppliersPage(cashier_ui, db))
+pages.register("trainers", lambda: TrainersPage(helpdesk_ui, db))
+pages.register("users", lambda: UsersPage(helpdesk_ui, db))
+pages.register("tools", lambda: ToolsPage(helpdesk_ui, db))
+pages.register("sessions", lambda: SessionsPage(helpdesk_ui, db))
 
 current_system_user_id = None
 current_employee_id = None
@@ -176,15 +174,26 @@ def on_login_success(success):
         current_system_user_id = login_page.get_logged_system_user_id()
         current_employee_id = login_page.get_logged_employee_id()
 
-        employees_page.current_system_user_id = current_system_user_id
-        employees_page.refresh()  
+        role = login_page.get_logged_role()
+        if role not in ROLE_WINDOWS:
+            QMessageBox.warning(login_page, "Login Failed", f"No window is available for role '{role}'.")
+            return
+        build_role_windows(role)
+
+        # Role-based navigation
+        if role == "admin":
+            stack.setCurrentWidget(admin_page)
+            go_admin_sales()
+        elif role == "cashier":
+            stack.setCurrentWidget(cashier_page)
+            go_cashier_main()
+        elif role == "helpdesk":
+            stack.setCurrentWidget(helpdesk_page)
+            go_helpdesk_users()
 
 login_page.login_success.connect(on_login_success)
 
 stack.addWidget(login_page)
-stack.addWidget(admin_page)
-stack.addWidget(helpdesk_page)
-stack.addWidget(cashier_page)
 
 # ---------- Nav groups ----------
 def set_active_admin(active_btn=None):
@@ -206,9 +215,15 @@ def set_active_cashier(active_btn=None):
         active_btn.setStyleSheet(ACTIVE_STYLE)
 
 # ---------- Navigation ----------
+def show_page(name=None):
+    """Cancel loads for pages the user left, then build or reload the one being shown"""
+    query_executor.cancel_all(keep=name)
+    if name is not None:
+        pages.show(name)
+
 def logout():
     # Create a custom message box
-    msg_box = QMessageBox(admin_page)
+    msg_box = QMessageBox(stack.currentWidget())
     msg_box.setWindowTitle("Logout")
     msg_box.setText("Are you sure you want to logout?")
     msg_box.setStandardButtons(QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
@@ -231,9 +246,7 @@ def logout():
 
     if reply == QMessageBox.StandardButton.Yes:
         stack.setCurrentWidget(login_page)
-        set_active_admin(None)
-        set_active_helpdesk(None)
-        set_active_cashier(None)
+        teardown_role_windows()
 
 def open_helpdesk():
     stack.setCurrentWidget(helpdesk_page)
@@ -241,6 +254,7 @@ def open_helpdesk():
     set_active_admin(admin_ui.pushButton_6)
     set_active_helpdesk(helpdesk_ui.pushButton_3)
     set_active_cashier(None)
+    show_page("users")
 
 def open_cashier():
     stack.setCurrentWidget(cashier_page)
@@ -248,6 +262,7 @@ def open_cashier():
     set_active_admin(admin_ui.pushButton_4)
     set_active_cashier(cashier_ui.pushButton_7)  # Main cashier work button
     set_active_helpdesk(None)
+    show_page("sale_point")
 
 def go_admin_sales():
     admin_ui.stackedWidget.setCurrentWidget(admin_ui.sales)
@@ -255,7 +270,7 @@ def go_admin_sales():
     set_active_helpdesk(None)
     set_active_cashier(None)
     # This will reload all income records properly
-    sales_page.refresh()
+    show_page("sales")
 
 
 
@@ -264,7 +279,7 @@ def go_admin_employee():
     set_active_admin(admin_ui.pushButton_3)
     set_active_helpdesk(None)
     set_active_cashier(None)
-    employees_page.refresh()  
+    show_page("employees")
 
 
 def go_admin_expenses():
@@ -272,7 +287,7 @@ def go_admin_expenses():
     set_active_admin(admin_ui.pushButton_10)
     set_active_helpdesk(None)
     set_active_cashier(None)
-    expenses_page.refresh() 
+    show_page("expenses")
 
 def go_admin_reports():
     admin_ui.stackedWidget.setCurrentWidget(admin_ui.reports)
@@ -280,7 +295,7 @@ def go_admin_reports():
     set_active_helpdesk(None)
     set_active_cashier(None)
     # Refresh the reports table
-    reports_page.refresh()
+    show_page("reports")
 
 
 def go_admin_from_helpdesk():
@@ -289,7 +304,7 @@ def go_admin_from_helpdesk():
     set_active_admin(admin_ui.pushButton_2)
     set_active_helpdesk(None)
     set_active_cashier(None)
-    sales_page.refresh()
+    show_page("sales")
 
 def go_admin_from_cashier():
     stack.setCurrentWidget(admin_page)
@@ -297,74 +312,74 @@ def go_admin_from_cashier():
     set_active_admin(admin_ui.pushButton_2)
     set_active_helpdesk(None)
     set_active_cashier(None)
-    sales_page.refresh()
+    show_page("sales")
 
 def go_cashier_main():
     cashier_ui.stackedWidget.setCurrentWidget(cashier_ui.cashierWork)
     set_active_cashier(cashier_ui.pushButton_7)
+    show_page("sale_point")
 
 def go_cashier_goods():
     cashier_ui.stackedWidget.setCurrentWidget(cashier_ui.goods)
     set_active_cashier(cashier_ui.pushButton_3)
-    goods_page.refresh()  # Refresh the goods table when switching to the page
+    show_page("goods")  # Refresh the goods table when switching to the page
 
 def go_cashier_suppliers():
     cashier_ui.stackedWidget.setCurrentWidget(cashier_ui.suppliers)
     set_active_cashier(cashier_ui.pushButton_5)
-    suppliers_page.refresh()
+    show_page("suppliers")
 
 def go_helpdesk_users():
     helpdesk_ui.stackedWidget.setCurrentWidget(helpdesk_ui.users)
     set_active_helpdesk(helpdesk_ui.pushButton_3)
+    show_page("users")
 
 def go_helpdesk_trainers():
     helpdesk_ui.stackedWidget.setCurrentWidget(helpdesk_ui.trainers)
     set_active_helpdesk(helpdesk_ui.pushButton_5)
+    show_page("trainers")
 
 def go_helpdesk_session():
     helpdesk_ui.stackedWidget.setCurrentWidget(helpdesk_ui.session)
     set_active_helpdesk(helpdesk_ui.pushButton_11)
+    show_page("sessions")
 
 def go_helpdesk_tools():
     helpdesk_ui.stackedWidget.setCurrentWidget(helpdesk_ui.toolRs)
     set_active_helpdesk(helpdesk_ui.pushButton_6)
+    show_page("tools")
 
 # ---------- Dialog Functions ----------
+# Pages showing what a dialog wrote reload through the change bus
 def show_add_supplier_dialog():
     from logic.addSupplierL import AddSupplierDialog
     dialog = AddSupplierDialog(cashier_page, db)
-    if dialog.exec():  
-        suppliers_page.refresh()
+    dialog.exec()
 
 def show_add_good_dialog():
     from logic.addGoodL import AddGoodDialog
     dialog = AddGoodDialog(cashier_page, db)
-    if dialog.exec():
-        goods_page.refresh()  
+    dialog.exec()
 
 def open_add_same_good():
     from logic.addSameGoodL import AddSameGoodDialog
     dialog = AddSameGoodDialog(None, db)  
-    if dialog.exec():
-        goods_page.refresh() 
+    dialog.exec()
 
 def show_add_expense_dialog():
     from logic.addExpensesL import AddExpensesDialog
     dialog = AddExpensesDialog(cashier_page, db)
-    if dialog.exec():
-        expenses_page.refresh()  
+    dialog.exec()
 
 def show_add_employee_dialog():
     from logic.addEmployeeL import AddEmployeeDialog
     dialog = AddEmployeeDialog(admin_page, db)
-    if dialog.exec():  
-        employees_page.refresh()  
+    dialog.exec()
 
 def show_add_system_user_dialog():
     from logic.addSystemUserL import AddSystemUserDialog
     dialog = AddSystemUserDialog(admin_page, db) 
-    if dialog.exec():
-        employees_page.refresh()
+    dialog.exec()
 
 def show_add_tool_dialog():
     from logic.addToolL import AddToolDialog
@@ -374,39 +389,72 @@ def show_add_tool_dialog():
 def show_add_trainer_dialog():
     from logic.addTrainerL import AddTrainerDialog
     dialog = AddTrainerDialog(admin_page, db)
-    if dialog.exec():  
-        trainers_page.refresh()  
+    dialog.exec()
 
 def show_sales_report_dialog():
     from logic.getSalesL import SalesSummaryDialog
     dialog = SalesSummaryDialog(admin_page, db)
     dialog.exec()
 
+def show_dashboard_dialog():
+    from logic.dashboardL import FinanceDashboardDialog
+    dialog = FinanceDashboardDialog(admin_page, db)
+    dialog.exec()
+
+def show_item_sales_dialog():
+    from logic.itemSalesL import ItemSalesDialog
+    dialog = ItemSalesDialog(admin_page, db)
+    dialog.exec()
+
+def show_sales_sync_dialog():
+    from logic.salesSyncL import SalesSyncDialog
+    dialog = SalesSyncDialog(cashier_page, sales_journal)
+    dialog.exec()
+    update_sales_sync_button()
+
+def update_sales_sync_button():
+    """Show on the cashier window how many journaled sales need staff"""
+    counts = sales_journal.counts()
+    issues = counts.get("conflict", 0) + counts.get("failed", 0)
+    cashier_ui.pushButton_15.setText(f"Sales Sync ({issues})" if issues else "Sales Sync")
+
 def show_add_report_dialog():
     from logic.addReportL import AddReportDialog
     dialog = AddReportDialog(helpdesk_page, db, current_employee_id)  
-    if dialog.exec():  
-        reports_page.refresh()  
+    dialog.exec()
 
 def show_add_tool_reservation_dialog():
     from logic.toolsRsL import AddToolReservationDialog
     dialog = AddToolReservationDialog(helpdesk_page, db) 
-    if dialog.exec():  
-        tools_page.refresh()  
+    dialog.exec()
 
 # --- Show Add User Dialog ---
 def show_add_user_dialog():
     from logic.addUserL import AddUserDialog
     dialog = AddUserDialog(helpdesk_page, db)
-    if dialog.exec():  
-        users_page.refresh() 
+    dialog.exec()
 
 def show_buy_membership_dialog():
     from logic.buyMembershipsL import BuyMembershipDialog
     dialog = BuyMembershipDialog(helpdesk_page, db)
-    if dialog.exec():  
-        users_page.refresh()  
+    dialog.exec()
         
+# Member status and the entry log are set up on the first check-in of the session
+member_status = checkin_writer = None
+
+def show_check_in_dialog():
+    global member_status, checkin_writer
+    from logic.checkIn import MemberStatusCache, CheckInWriter
+    from logic.checkInL import CheckInDialog
+    if member_status is None:
+        member_status = MemberStatusCache(db)
+        change_bus.subscribe(MemberStatusCache.TABLES, member_status.refresh)
+        checkin_writer = CheckInWriter(db)
+        checkin_writer.start()
+        app.aboutToQuit.connect(checkin_writer.stop)
+    dialog = CheckInDialog(helpdesk_page, member_status, checkin_writer)
+    dialog.exec()
+
 def show_add_report_dialog(current_employee_id): 
     from logic.addReportL import AddReportDialog
     dialog = AddReportDialog(helpdesk_page, db, current_employee_id)
@@ -415,87 +463,162 @@ def show_add_report_dialog(current_employee_id):
 def show_add_tool_dialog():
     from logic.addToolL import AddToolDialog  # Adjust to your actual dialog
     dialog = AddToolDialog(helpdesk_page, db)
-    if dialog.exec():  # Only refresh if user clicked "Done"
-        tools_page.refresh()  # Refresh the table to show new/updated tool
+    dialog.exec()
 
 def show_add_session_dialog():
     from logic.addSessionL import AddSessionDialog
     dialog = AddSessionDialog(helpdesk_page, db)
-    if dialog.exec():  # Only refresh if a session was added
-        sessions_page.refresh()
+    dialog.exec()
 
 def show_join_session_dialog():
     from logic.enterSessionL import JoinSessionDialog
     dialog = JoinSessionDialog(helpdesk_page, db)
-    if dialog.exec():  # Only refresh if a user joined a session
-        sessions_page.refresh()
-
-# ---------- Connect Buttons ----------
-# Admin Page
-# Navigation
-admin_ui.pushButton_2.clicked.connect(go_admin_sales)     # Sales
-admin_ui.pushButton_3.clicked.connect(go_admin_employee)  # Employee
-admin_ui.pushButton_10.clicked.connect(go_admin_expenses) # Expenses
-admin_ui.pushButton_5.clicked.connect(go_admin_reports)   # Reports
-admin_ui.pushButton_6.clicked.connect(open_helpdesk)      # Help Desk
-admin_ui.pushButton_4.clicked.connect(open_cashier)       # Cashier
-admin_ui.pushButton.clicked.connect(logout)               # Logout
-admin_ui.pushButton_14.clicked.connect(show_add_expense_dialog) #add expandes
-admin_ui.pushButton_16.clicked.connect(show_add_employee_dialog) #add employee
-admin_ui.pushButton_17.clicked.connect(show_add_system_user_dialog) #add system user
-admin_ui.pushButton_8.clicked.connect(show_sales_report_dialog) #add employee
-
-show_sales_report_dialog
-
-# HelpDesk Page
-# Navigation
-helpdesk_ui.pushButton_3.clicked.connect(go_helpdesk_users)      # Users
-helpdesk_ui.pushButton_5.clicked.connect(go_helpdesk_trainers)   # Trainers
-helpdesk_ui.pushButton_11.clicked.connect(go_helpdesk_session)   # Session
-helpdesk_ui.pushButton_4.clicked.connect(go_admin_from_helpdesk) # Main/Admin
-helpdesk_ui.pushButton.clicked.connect(logout)                    # Logout
-helpdesk_ui.pushButton_13.clicked.connect(show_add_tool_dialog) # add tool
-helpdesk_ui.pushButton_14.clicked.connect(show_add_tool_reservation_dialog) # add toolrs 
-helpdesk_ui.pushButton_6.clicked.connect(go_helpdesk_tools)      # Tools
-helpdesk_ui.pushButton_8.clicked.connect(show_add_user_dialog)      # add user
-helpdesk_ui.pushButton_12.clicked.connect(show_buy_membership_dialog)      # buy membershipe
-
-# Button connection for adding report (HelpDesk)
-helpdesk_ui.pushButton_2.clicked.connect(
-    lambda: show_add_report_dialog(current_employee_id)
-)
-helpdesk_ui.pushButton_16.clicked.connect(show_add_session_dialog)      # add user
-
-helpdesk_ui.pushButton_17.clicked.connect(show_join_session_dialog) # enter session
-
-
-
-# Cashier Page
-cashier_ui.pushButton.clicked.connect(logout)                       # Logout
-cashier_ui.pushButton_4.clicked.connect(go_admin_from_cashier)     # Admin main
-cashier_ui.pushButton_3.clicked.connect(go_cashier_goods)          # Goods
-cashier_ui.pushButton_5.clicked.connect(go_cashier_suppliers)      # Suppliers
-cashier_ui.pushButton_7.clicked.connect(go_cashier_main)           # Main (Cashier work)
-cashier_ui.pushButton_10.clicked.connect(show_add_good_dialog)     # Add new good
-cashier_ui.pushButton_11.clicked.connect(show_add_supplier_dialog) # Add new supplier
-cashier_ui.pushButton_2.clicked.connect(
-    lambda: show_add_report_dialog(current_employee_id)
-)
-cashier_ui.pushButton_8.clicked.connect(open_add_same_good)#  add same good
+    dialog.exec()
 
 
 def show_add_supplier_dialog():
     from logic.addSupplierL import AddSupplierDialog
     dialog = AddSupplierDialog(cashier_page, db)
-    if dialog.exec():
-        suppliers_page.refresh() 
-
-# ---------- Initialize Nav groups ----------
-
-# Initialize all buttons with normal style
+    dialog.exec()
 
-for btn in ADMIN_NAV + HELPDESK_NAV + CASHIER_NAV:
-    btn.setStyleSheet(NORMAL_STYLE)
+# ---------- Role windows ----------
+def build_admin_window():
+    global admin_page, admin_ui, ADMIN_NAV
+    admin_page = QMainWindow()
+    admin_ui = Ui_Admin()
+    admin_ui.setupUi(admin_page)
+
+    ADMIN_NAV = [
+        admin_ui.pushButton_2,  # Sales
+        admin_ui.pushButton_3,  # Employee
+        admin_ui.pushButton_10, # Expenses
+        admin_ui.pushButton_5,  # Reports
+        admin_ui.pushButton_6,  # HelpDesk
+        admin_ui.pushButton_4,  # Cashier
+    ]
+
+    # Navigation
+    admin_ui.pushButton_2.clicked.connect(go_admin_sales)     # Sales
+    admin_ui.pushButton_3.clicked.connect(go_admin_employee)  # Employee
+    admin_ui.pushButton_10.clicked.connect(go_admin_expenses) # Expenses
+    admin_ui.pushButton_5.clicked.connect(go_admin_reports)   # Reports
+    admin_ui.pushButton_6.clicked.connect(open_helpdesk)      # Help Desk
+    admin_ui.pushButton_4.clicked.connect(open_cashier)       # Cashier
+    admin_ui.pushButton.clicked.connect(logout)               # Logout
+    admin_ui.pushButton_14.clicked.connect(show_add_expense_dialog) #add expandes
+    admin_ui.pushButton_16.clicked.connect(show_add_employee_dialog) #add employee
+    admin_ui.pushButton_17.clicked.connect(show_add_system_user_dialog) #add system user
+    admin_ui.pushButton_8.clicked.connect(show_sales_report_dialog) #sales report
+    admin_ui.pushButton_18.clicked.connect(show_dashboard_dialog) #dashboard
+    admin_ui.pushButton_19.clicked.connect(show_item_sales_dialog) #item sales
+
+    stack.addWidget(admin_page)
+
+def build_helpdesk_window(can_reach_admin):
+    global helpdesk_page, helpdesk_ui, HELPDESK_NAV
+    helpdesk_page = QMainWindow()
+    helpdesk_ui = Ui_HelpDesk()
+    helpdesk_ui.setupUi(helpdesk_page)
+
+    HELPDESK_NAV = [
+        helpdesk_ui.pushButton_3,  # Users
+        helpdesk_ui.pushButton_5,  # Trainers
+        helpdesk_ui.pushButton_11, # Session
+        helpdesk_ui.pushButton_6   # Tools
+    ]
+
+    # Navigation
+    helpdesk_ui.pushButton_3.clicked.connect(go_helpdesk_users)      # Users
+    helpdesk_ui.pushButton_5.clicked.connect(go_helpdesk_trainers)   # Trainers
+    helpdesk_ui.pushButton_11.clicked.connect(go_helpdesk_session)   # Session
+    helpdesk_ui.pushButton_4.clicked.connect(go_admin_from_helpdesk) # Main/Admin
+    helpdesk_ui.pushButton.clicked.connect(logout)                    # Logout
+    helpdesk_ui.pushButton_13.clicked.connect(show_add_tool_dialog) # add tool
+    helpdesk_ui.pushButton_14.clicked.connect(show_add_tool_reservation_dialog) # add toolrs 
+    helpdesk_ui.pushButton_6.clicked.connect(go_helpdesk_tools)      # Tools
+    helpdesk_ui.pushButton_8.clicked.connect(show_add_user_dialog)      # add user
+    helpdesk_ui.pushButton_12.clicked.connect(show_buy_membership_dialog)      # buy membershipe
+    helpdesk_ui.pushButton_19.clicked.connect(show_check_in_dialog)      # check in
+
+    # Button connection for adding report (HelpDesk)
+    helpdesk_ui.pushButton_2.clicked.connect(
+        lambda: show_add_report_dialog(current_employee_id)
+    )
+    helpdesk_ui.pushButton_16.clicked.connect(show_add_session_dialog)      # add user
+
+    helpdesk_ui.pushButton_17.clicked.connect(show_join_session_dialog) # enter session
+
+    if not can_reach_admin:
+        helpdesk_ui.pushButton_4.hide()
+
+    stack.addWidget(helpdesk_page)
+
+def build_cashier_window(can_reach_admin):
+    global cashier_page, cashier_ui, CASHIER_NAV
+    cashier_page = QMainWindow()
+    cashier_ui = Ui_CashierMain()
+    cashier_ui.setupUi(cashier_page)
+
+    CASHIER_NAV = [
+        cashier_ui.pushButton_7,  # Main (Cashier work)
+        cashier_ui.pushButton_3,  # Goods
+        cashier_ui.pushButton_5,  # Suppliers
+    ]
+
+    cashier_ui.pushButton.clicked.connect(logout)                       # Logout
+    cashier_ui.pushButton_4.clicked.connect(go_admin_from_cashier)     # Admin main
+    cashier_ui.pushButton_3.clicked.connect(go_cashier_goods)          # Goods
+    cashier_ui.pushButton_5.clicked.connect(go_cashier_suppliers)      # Suppliers
+    cashier_ui.pushButton_7.clicked.connect(go_cashier_main)           # Main (Cashier work)
+    cashier_ui.pushButton_10.clicked.connect(show_add_good_dialog)     # Add new good
+    cashier_ui.pushButton_11.clicked.connect(show_add_supplier_dialog) # Add new supplier
+    cashier_ui.pushButton_2.clicked.connect(
+        lambda: show_add_report_dialog(current_employee_id)
+    )
+    cashier_ui.pushButton_8.clicked.connect(open_add_same_good)#  add same good
+    cashier_ui.pushButton_15.clicked.connect(show_sales_sync_dialog)  # Sales sync issues
+
+    # The journal is local, so checking it for issues is cheap enough to poll
+    sync_status_timer = QTimer(cashier_page)
+    sync_status_timer.timeout.connect(update_sales_sync_button)
+    sync_status_timer.start(SYNC_INTERVAL * 1000)
+    update_sales_sync_button()
+
+    if not can_reach_admin:
+        cashier_ui.pushButton_4.hide()
+
+    stack.addWidget(cashier_page)
+
+def build_role_windows(role):
+    """Build only the windows this role can reach"""
+    windows = ROLE_WINDOWS[role]
+    if "admin" in windows:
+        build_admin_window()
+    if "helpdesk" in windows:
+        build_helpdesk_window(can_reach_admin="admin" in windows)
+    if "cashier" in windows:
+        build_cashier_window(can_reach_admin="admin" in windows)
+
+    # Initialize all buttons with normal style
+    for btn in ADMIN_NAV + HELPDESK_NAV + CASHIER_NAV:
+        btn.setStyleSheet(NORMAL_STYLE)
+
+def teardown_role_windows():
+    """Destroy the logged-out role's windows and the pages built on them"""
+    global admin_page, admin_ui, helpdesk_page, helpdesk_ui, cashier_page, cashier_ui
+    global ADMIN_NAV, HELPDESK_NAV, CASHIER_NAV
+    show_page(None)   # drop pending loads before their widgets go away
+    pages.discard()
+
+    for window in (admin_page, helpdesk_page, cashier_page):
+        if window is not None:
+            stack.removeWidget(window)
+            window.deleteLater()
+
+    admin_page = admin_ui = None
+    helpdesk_page = helpdesk_ui = None
+    cashier_page = cashier_ui = None
+    ADMIN_NAV, HELPDESK_NAV, CASHIER_NAV = [], [], []
 
 # ---------- Show App ----------
 stack.showMaximized()  # This will make the window take up the full screen
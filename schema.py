@@ -0,0 +1,313 @@
+"""
+GYM database schema shared by every backend.
+
+Column types are written as {placeholders} and filled in by the backend
+(see Backend.TYPES), so the same definitions create the SQL Server and the
+SQLite database.
+"""
+from enum import IntEnum
+
+
+class IncomeSource(IntEnum):
+    """Where an Income row's money came from; the codes of the IncomeSources table"""
+    MEMBERSHIP = 1
+    SUPPLIES = 2
+    SESSION = 3
+    TOOL_RESERVATION = 4
+    OTHER = 5   # rows written before codes whose source matched none of the above
+
+    @property
+    def label(self):
+        """The name stored in IncomeSources.name and Income.source"""
+        return INCOME_SOURCE_NAMES[self]
+
+    @classmethod
+    def coerce(cls, source):
+        """An IncomeSource from itself, its code or its name in any case"""
+        if isinstance(source, str):
+            for member, name in INCOME_SOURCE_NAMES.items():
+                if name.lower() == source.strip().lower():
+                    return member
+            raise ValueError(f"Unknown income source '{source}'")
+        return cls(source)
+
+
+# The spellings Income.source has always used, so existing rows keep matching
+INCOME_SOURCE_NAMES = {
+    IncomeSource.MEMBERSHIP: "membership",
+    IncomeSource.SUPPLIES: "supplies",
+    IncomeSource.SESSION: "joinedSession",
+    IncomeSource.TOOL_RESERVATION: "toolRS",
+    IncomeSource.OTHER: "other",
+}
+
+# Tables in creation order (referenced tables first)
+TABLES = {
+    "Employees": [
+        "employee_id {pk}",
+        "name {name} NOT NULL",
+        "phone {short}",
+        "salary {money}",
+    ],
+    "SystemUsers": [
+        "system_user_id {pk}",
+        "employee_id {int} REFERENCES Employees(employee_id)",
+        "role {short} NOT NULL",
+        "username {name} NOT NULL UNIQUE",
+        "hashed_password {text} NOT NULL",
+        "created_at {datetime} DEFAULT {now}",
+    ],
+    "SystemUserLogins": [
+        "login_id {pk}",
+        "system_user_id {int} REFERENCES SystemUsers(system_user_id)",
+        "login_time {datetime} DEFAULT {now}",
+    ],
+    "Users": [
+        "user_id {pk}",
+        "name {name} NOT NULL",
+        "date_of_birth {date}",
+        "gender {short}",
+        "registration_date {datetime} DEFAULT {now}",
+    ],
+    "Memberships": [
+        "membership_id {pk}",
+        "type {short} NOT NULL",
+        "duration_days {int} NOT NULL",
+        "price {money} NOT NULL",
+    ],
+    "UserMemberships": [
+        "user_membership_id {pk}",
+        "user_id {int} NOT NULL REFERENCES Users(user_id)",
+        "membership_id {int} NOT NULL REFERENCES Memberships(membership_id)",
+        "start_date {date} NOT NULL",
+        "end_date {date} NOT NULL",
+    ],
+    "IncomeSources": [
+        "source_code {int} NOT NULL PRIMARY KEY",
+        "name {short} NOT NULL UNIQUE",
+    ],
+    "Income": [
+        "income_id {pk}",
+        "source {short} NOT NULL",
+        "amount {money} NOT NULL",
+        "income_date {datetime} NOT NULL DEFAULT {now}",
+    ],
+    "Expenses": [
+        "expense_id {pk}",
+        "description {text}",
+        "amount {money} NOT NULL",
+        "expense_date {date} NOT NULL",
+    ],
+    "SalaryPayments": [
+        "payment_id {pk}",
+        "employee_id {int} NOT NULL REFERENCES Employees(employee_id)",
+        "amount {money} NOT NULL",
+        "payment_date {date} NOT NULL",
+    ],
+    "Suppliers": [
+        "supplier_id {pk}",
+        "name {name} NOT NULL UNIQUE",
+        "email {name}",
+        "phone {short}",
+    ],
+    # quantity is a snapshot of the stock as of StockMovements row
+    # stock_movement_id; logic.stockLedger.STOCK adds the movements since
+    "Supplies": [
+        "supply_id {pk}",
+        "supplier_id {int} NOT NULL REFERENCES Suppliers(supplier_id)",
+        "item_name {name} NOT NULL",
+        "quantity {int} NOT NULL DEFAULT 0",
+        "price {money} NOT NULL",
+    ],
+    "Tools": [
+        "tool_id {pk}",
+        "name {name} NOT NULL UNIQUE",
+        "tag_name {name}",
+        "purchase_date {date}",
+        "cost {money}",
+    ],
+    "ToolReservations": [
+        "reservation_id {pk}",
+        "user_id {int} NOT NULL REFERENCES Users(user_id)",
+        "tool_id {int} NOT NULL REFERENCES Tools(tool_id)",
+        "reservation_date {date} NOT NULL",
+        "start_time {time} NOT NULL",
+        "end_time {time} NOT NULL",
+    ],
+    "Trainers": [
+        "trainer_id {pk}",
+        "name {name} NOT NULL",
+        "gender {short}",
+        "phone {short}",
+        "specialization {name}",
+    ],
+    "WorkoutSessions": [
+        "session_id {pk}",
+        "trainer_id {int} NOT NULL REFERENCES Trainers(trainer_id)",
+        "title {name} NOT NULL",
+        "session_date {date} NOT NULL",
+        "start_time {time} NOT NULL",
+        "end_time {time} NOT NULL",
+        "entry_fee {money} DEFAULT 0",
+    ],
+    "UserWorkoutSessions": [
+        "user_id {int} NOT NULL REFERENCES Users(user_id)",
+        "session_id {int} NOT NULL REFERENCES WorkoutSessions(session_id)",
+        "CONSTRAINT UC_User_Session UNIQUE (user_id, session_id)",
+    ],
+    "Sales": [
+        "sale_id {pk}",
+        "sale_key {short} NOT NULL UNIQUE",   # idempotency key from the till's sales journal
+        "sale_date {datetime} NOT NULL",
+        "total {money} NOT NULL",
+    ],
+    # One row per item sold; sale_date is copied from Sales so per-item
+    # history and date-range aggregates are served by indexes on this table alone
+    "SaleLines": [
+        "sale_line_id {pk}",
+        "sale_id {int} NOT NULL REFERENCES Sales(sale_id)",
+        "supply_id {int} NOT NULL REFERENCES Supplies(supply_id)",
+        "sale_date {datetime} NOT NULL",
+        "quantity {int} NOT NULL",
+        "unit_price {money} NOT NULL",
+        "discount {money} NOT NULL DEFAULT 0",   # percent
+        "amount {money} NOT NULL",
+    ],
+    # Append-only stock ledger: one signed row per sale line, restock or
+    # adjustment (e.g. a synced offline sale the stock could not cover)
+    "StockMovements": [
+        "movement_id {pk}",
+        "supply_id {int} NOT NULL REFERENCES Supplies(supply_id)",
+        "moved_at {datetime} NOT NULL",
+        "kind {short} NOT NULL",
+        "quantity {int} NOT NULL",
+        "sale_id {int} REFERENCES Sales(sale_id)",
+    ],
+    # Each user's membership that ends last, kept by logic.memberships.add_membership
+    # so the users list joins one row per user instead of searching UserMemberships
+    "CurrentMemberships": [
+        "user_id {int} NOT NULL PRIMARY KEY REFERENCES Users(user_id)",
+        "user_membership_id {int} NOT NULL REFERENCES UserMemberships(user_membership_id)",
+        "membership_id {int} NOT NULL REFERENCES Memberships(membership_id)",
+        "end_date {date} NOT NULL",
+    ],
+    "CheckIns": [
+        "checkin_id {pk}",
+        "user_id {int} NOT NULL REFERENCES Users(user_id)",
+        "checkin_time {datetime} NOT NULL",
+        "granted {int} NOT NULL",   # 0 when turned away (no active membership)
+    ],
+    # Income per day and IncomeSource code, plus the day's Expenses under
+    # logic.bookkeeping.EXPENSES; kept by logic.bookkeeping alongside every insert
+    "DailyRollups": [
+        "day {date} NOT NULL",
+        "source_code {int} NOT NULL",
+        "amount {money} NOT NULL",
+        "entries {int} NOT NULL",
+        "PRIMARY KEY (day, source_code)",
+    ],
+    # One row per table a committed transaction deleted from, written by
+    # DatabaseConnection so other terminals' change pollers notice deletes
+    "Deletions": [
+        "deletion_id {pk}",
+        "table_name {short} NOT NULL",   # lower case
+        "deleted_at {datetime} NOT NULL DEFAULT {now}",
+    ],
+    # MIGRATIONS already applied to this database
+    "SchemaMigrations": [
+        "name {short} NOT NULL PRIMARY KEY",
+        "applied_at {datetime} NOT NULL DEFAULT {now}",
+    ],
+    "Reports": [
+        "report_id {pk}",
+        "employee_id {int} NOT NULL REFERENCES Employees(employee_id)",
+        "title {name} NOT NULL",
+        "content {text}",
+        "report_date {date}",
+        "report_time {time}",
+    ],
+}
+
+# Columns added after a table first shipped: (table, column definition).
+# Databases created before the column existed get it via ALTER TABLE.
+COLUMNS = [
+    ("SystemUsers", "username_key {name}"),   # lower-cased username for login lookups
+    ("Supplies", "modified_at {datetime}"),   # change watermark for the sale point catalog
+    ("Income", "source_code {int} REFERENCES IncomeSources(source_code)"),   # IncomeSource of the row
+    ("Sales", "system_user_id {int} REFERENCES SystemUsers(system_user_id)"),   # cashier who rang it up
+    ("Supplies", "stock_movement_id {int} NOT NULL DEFAULT 0"),   # last movement folded into quantity
+    ("UserWorkoutSessions", "modified_at {datetime}"),   # change watermark for the sessions page
+]
+
+# Statements that fill in added columns for rows written before they existed.
+# They run on every start, so each must only touch rows still missing a value.
+BACKFILLS = [
+    "UPDATE SystemUsers SET username_key = LOWER(LTRIM(RTRIM(username))) WHERE username_key IS NULL",
+    "UPDATE Supplies SET modified_at = GETDATE() WHERE modified_at IS NULL",
+    *(
+        f"INSERT INTO IncomeSources (source_code, name) SELECT {source.value}, '{source.label}' "
+        f"WHERE NOT EXISTS (SELECT 1 FROM IncomeSources WHERE source_code = {source.value})"
+        for source in IncomeSource
+    ),
+]
+
+# One-off data migrations: (name, statement), run in order once per database
+# after BACKFILLS and recorded in SchemaMigrations, so a start never rescans
+# a large table for rows that were dealt with long ago.
+MIGRATIONS = [
+    # Code the Income rows written before source_code; any spelling of a known
+    # source gets its code, anything else is coded OTHER
+    ("income_source_codes", """UPDATE Income SET source_code = CASE LOWER(LTRIM(RTRIM(source)))
+        {}
+        ELSE {} END
+    WHERE source_code IS NULL""".format(
+        "\n        ".join(f"WHEN '{name.lower()}' THEN {source.value}" for source, name in INCOME_SOURCE_NAMES.items()
+                    if source != IncomeSource.OTHER),
+        IncomeSource.OTHER.value,
+    )),
+    # Build DailyRollups from the existing ledgers (0 is logic.bookkeeping.EXPENSES)
+    ("daily_rollups", """INSERT INTO DailyRollups (day, source_code, amount, entries)
+    SELECT CONVERT(date, income_date), source_code, SUM(amount), COUNT(*)
+    FROM Income
+    WHERE source_code IS NOT NULL
+    GROUP BY CONVERT(date, income_date), source_code
+    UNION ALL
+    SELECT CONVERT(date, expense_date), 0, SUM(amount), COUNT(*)
+    FROM Expenses
+    GROUP BY CONVERT(date, expense_date)"""),
+    # Fill CurrentMemberships for users whose memberships predate it (latest end_date, newest on ties)
+    ("current_memberships", """INSERT INTO CurrentMemberships (user_id, user_membership_id, membership_id, end_date)
+    SELECT um.user_id, um.user_membership_id, um.membership_id, um.end_date
+    FROM UserMemberships um
+    WHERE NOT EXISTS (SELECT 1 FROM CurrentMemberships cm WHERE cm.user_id = um.user_id)
+      AND um.user_membership_id = (
+          SELECT MAX(um2.user_membership_id) FROM UserMemberships um2
+          WHERE um2.user_id = um.user_id AND um2.end_date = (
+              SELECT MAX(um3.end_date) FROM UserMemberships um3 WHERE um3.user_id = um.user_id
+          )
+      )"""),
+]
+
+# (index name, table, columns, unique)
+INDEXES = [
+    ("IX_UserMemberships_User", "UserMemberships", ["user_id", "end_date"], False),
+    ("IX_Income_Date", "Income", ["income_date"], False),
+    ("IX_Income_SourceDate", "Income", ["source_code", "income_date"], False),
+    ("IX_Expenses_Date", "Expenses", ["expense_date"], False),
+    ("IX_Supplies_ItemName", "Supplies", ["item_name"], False),
+    ("IX_ToolReservations_Tool", "ToolReservations", ["tool_id", "reservation_date"], False),
+    ("UX_SystemUsers_UsernameKey", "SystemUsers", ["username_key"], True),
+    ("IX_Supplies_Modified", "Supplies", ["modified_at"], False),
+    ("IX_UserWorkoutSessions_Modified", "UserWorkoutSessions", ["modified_at"], False),
+    ("IX_SalaryPayments_Date", "SalaryPayments", ["payment_date"], False),
+    ("IX_CheckIns_Time", "CheckIns", ["checkin_time"], False),
+    ("IX_SaleLines_SupplyDate", "SaleLines", ["supply_id", "sale_date"], False),
+    # Covers the item sales report: a date range seek that never visits the table
+    ("IX_SaleLines_DateSupply", "SaleLines", ["sale_date", "supply_id", "quantity", "amount"], False),
+    ("IX_Sales_Date", "Sales", ["sale_date"], False),
+    ("IX_CheckIns_User", "CheckIns", ["user_id", "checkin_time"], False),
+    ("IX_Deletions_Table", "Deletions", ["table_name", "deletion_id"], False),
+    # Covers the movements summed on top of an item's snapshot
+    ("IX_StockMovements_Supply", "StockMovements", ["supply_id", "movement_id", "quantity"], False),
+    ("IX_StockMovements_Time", "StockMovements", ["moved_at", "supply_id"], False),
+]
@@ -0,0 +1,61 @@
+from PySide6.QtCore import Qt, QEvent, QPersistentModelIndex, Signal
+from PySide6.QtWidgets import QStyledItemDelegate, QStyleOptionButton, QStyle, QApplication
+
+
+class ButtonDelegate(QStyledItemDelegate):
+    """
+    Paints a push button in every cell of a column and reports clicks by row.
+
+    The cell's text is the button label; a cell with no text gets no button.
+    Nothing is created per row, so a column of buttons costs only painting,
+    unlike one QPushButton cell widget per row.
+    """
+    clicked = Signal(int)   # row
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._pressed = QPersistentModelIndex()
+
+    def _label(self, index):
+        return index.data(Qt.DisplayRole) or ""
+
+    def paint(self, painter, option, index):
+        label = self._label(index)
+        if not label:
+            super().paint(painter, option, index)
+            return
+
+        button = QStyleOptionButton()
+        button.rect = option.rect.adjusted(2, 2, -2, -2)
+        button.text = label
+        button.state = QStyle.State_Enabled
+        if index == self._pressed:
+            button.state |= QStyle.State_Sunken
+        else:
+            button.state |= QStyle.State_Raised
+
+        style = option.widget.style() if option.widget else QApplication.style()
+        style.drawControl(QStyle.CE_PushButton, button, painter, option.widget)
+
+    def editorEvent(self, event, model, option, index):
+        if not self._label(index):
+            return False
+
+        if event.type() == QEvent.MouseButtonPress and event.button() == Qt.LeftButton:
+            self._pressed = QPersistentModelIndex(index)
+            self._repaint(option)
+            return True
+
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            was_pressed = index == self._pressed
+            self._pressed = QPersistentModelIndex()
+            self._repaint(option)
+            if was_pressed and option.rect.contains(event.position().toPoint()):
+                self.clicked.emit(index.row())
+            return True
+
+        return False
+
+    def _repaint(self, option):
+        if option.widget is not None:
+            option.widget.viewport().update(option.rect)
@@ -0,0 +1,168 @@
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PySide6.QtGui import QBrush
+
+
+def text(value):
+    return "" if value is None else str(value)
+
+
+def money(value):
+    return "" if value is None else f"${value:.2f}"
+
+
+def ymd(value):
+    return value.strftime("%Y-%m-%d") if value else ""
+
+
+def time_12h(value):
+    return value.strftime("%I:%M %p") if value else ""
+
+
+class Column:
+    """
+    One displayed column: the row fields it reads and how they become text.
+    field is an index into the row, or a tuple of indexes whose values are
+    all passed to fmt (an empty tuple makes a constant column, e.g. a button
+    label).
+    """
+
+    def __init__(self, header, field, fmt=text, editable=False, default=None):
+        self.header = header
+        self.fields = field if isinstance(field, tuple) else (field,)
+        self.fmt = fmt
+        self.editable = editable
+        self.default = default   # starting text of an editable column
+
+    def format(self, values):
+        return self.fmt(*values)
+
+
+class RowTableModel(QAbstractTableModel):
+    """
+    Read-only table of query rows, shared by the list pages.
+
+    Rows are stored once, transposed into one list per field, and a cell's
+    text is only built in data() when the view paints it. Loading a result
+    set is a single reset instead of one QTableWidgetItem per cell, so cost
+    and memory follow the number of rows rather than rows x columns of Qt
+    objects, and only the visible rows are ever formatted.
+
+    A paged result passes fetch_page: the view calls it through fetchMore()
+    when scrolled to the bottom (possibly again before the page arrives),
+    and whoever loads the page hands the rows to append_rows().
+    """
+
+    def __init__(self, columns, foreground=None, fetch_page=None, parent=None):
+        super().__init__(parent)
+        self.columns = columns
+        self.foreground = QBrush(foreground) if foreground is not None else None
+        self.fetch_page = fetch_page
+        self._fields = []   # one list per row field, all of length _count
+        self._count = 0
+        self._edits = {}    # column -> list of per-row text, for editable columns
+        self._has_more = False
+
+    # ----- Rows -----
+    def set_rows(self, rows, has_more=False):
+        """Replace the rows; has_more says whether fetch_page can add another page"""
+        self.beginResetModel()
+        self._fields = [list(field) for field in zip(*rows)]
+        self._count = len(self._fields[0]) if self._fields else 0
+        self._edits = {
+            col: [column.default] * self._count
+            for col, column in enumerate(self.columns) if column.editable
+        }
+        self._has_more = has_more
+        self.endResetModel()
+
+    def append_rows(self, rows, has_more=False):
+        """Add the next page of rows after the ones shown"""
+        if not self._count:
+            self.set_rows(rows, has_more)
+            return
+        if rows:
+            self.beginInsertRows(QModelIndex(), self._count, self._count + len(rows) - 1)
+            for field, values in zip(self._fields, zip(*rows)):
+                field.extend(values)
+            self._count += len(rows)
+            for col, edits in self._edits.items():
+                edits.extend([self.columns[col].default] * len(rows))
+            self.endInsertRows()
+        self._has_more = has_more
+
+    def prepend_rows(self, rows):
+        """Add rows above the ones shown (records newer than the top row)"""
+        if not rows:
+            return
+        if not self._count:
+            self.set_rows(rows, self._has_more)
+            return
+        self.beginInsertRows(QModelIndex(), 0, len(rows) - 1)
+        for field, values in zip(self._fields, zip(*rows)):
+            field[0:0] = values
+        self._count += len(rows)
+        for col, edits in self._edits.items():
+            edits[0:0] = [self.columns[col].default] * len(rows)
+        self.endInsertRows()
+
+    def clear(self):
+        self.set_rows([])
+
+    def row(self, row):
+        """The raw row as it came from the query"""
+        return tuple(field[row] for field in self._fields)
+
+    def value(self, row, col):
+        """The text shown (or typed, for editable columns) in a cell"""
+        edits = self._edits.get(col)
+        if edits is not None:
+            return edits[row]
+        column = self.columns[col]
+        return column.format(self._fields[f][row] for f in column.fields)
+
+    def __len__(self):
+        return self._count
+
+    # ----- Model interface -----
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._count
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.columns[section].header
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return self.value(index.row(), index.column())
+        if role == Qt.TextAlignmentRole:
+            return Qt.AlignCenter
+        if role == Qt.ForegroundRole:
+            return self.foreground
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._has_more and self.fetch_page is not None
+
+    def fetchMore(self, parent=QModelIndex()):
+        if self.canFetchMore(parent):
+            self.fetch_page()
+
+    def flags(self, index):
+        flags = Qt.ItemIsSelectable | Qt.ItemIsEnabled
+        if self.columns[index.column()].editable:
+            flags |= Qt.ItemIsEditable
+        return flags
+
+    def setData(self, index, value, role=Qt.EditRole):
+        edits = self._edits.get(index.column())
+        if role != Qt.EditRole or edits is None:
+            return False
+        edits[index.row()] = str(value)
+        self.dataChanged.emit(index, index)
+        return True